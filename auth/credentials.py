@@ -0,0 +1,174 @@
+import base64
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, NamedTuple, Optional, Tuple
+import bcrypt
+from ..config import AUTH_CONFIG
+from ..patterns.singleton import DatabaseManager
+from .rbac import User, UserRole
+
+_BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    rounds = rounds or AUTH_CONFIG['bcrypt_rounds']
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('ascii')
+
+def is_hashed(stored: str) -> bool:
+    return stored.startswith(_BCRYPT_PREFIXES)
+
+def needs_rehash(stored: str, rounds: Optional[int] = None) -> bool:
+    """True for hashes made with a lower work factor than configured"""
+    rounds = rounds or AUTH_CONFIG['bcrypt_rounds']
+    return int(stored.split('$')[2]) < rounds
+
+def check_password(password: str, stored: str) -> bool:
+    if not stored or not is_hashed(stored):
+        return False
+    return bcrypt.checkpw(password.encode('utf-8'), stored.encode('ascii'))
+
+class Session(NamedTuple):
+    token: str
+    user: User
+    expires_at: float
+
+class Authenticator:
+    """Verifies logins against bcrypt hashes in rbac_auth and issues sessions.
+
+    bcrypt is deliberately slow, so authenticate_async() runs it on a small worker
+    pool and hands back a Future the UI can poll. Every login reads the
+    user's row, so deleted users, role changes and password resets made
+    elsewhere apply at once. A successful login caches an HMAC of the
+    password (keyed with a per-process secret) next to the hash it matched,
+    until the session TTL ends; while the stored hash is unchanged,
+    re-entering the same password, e.g. after logout, skips bcrypt.
+    Sessions are HMAC-signed tokens kept
+    in memory; resume() turns a live token back into its User without a
+    database round trip and revoke() ends it.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    QUERY = "SELECT password, role, reference_id FROM rbac_auth WHERE username = %s"
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super(Authenticator, cls).__new__(cls)
+                    cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self.db = DatabaseManager.get_instance()
+        secret = AUTH_CONFIG['session_secret']
+        self._secret = secret.encode('utf-8') if secret else secrets.token_bytes(32)
+        self.session_ttl = AUTH_CONFIG['session_ttl']
+        self._executor = ThreadPoolExecutor(max_workers=AUTH_CONFIG['verify_workers'],
+                                            thread_name_prefix="password-verify")
+        self._dummy_hash: Optional[str] = None
+        self._lock = threading.Lock()
+        # username -> (password HMAC, stored hash it was checked against, expires_at)
+        self._credentials: Dict[str, Tuple[bytes, str, float]] = {}
+        self._sessions: Dict[str, Session] = {}
+        self.hash_checks = 0
+        self.cache_hits = 0
+
+    def _password_digest(self, username: str, password: str) -> bytes:
+        message = f"{username}\0{password}".encode('utf-8')
+        return hmac.new(self._secret, message, hashlib.sha256).digest()
+
+    def authenticate(self, username: str, password: str) -> Optional[Session]:
+        """Check a username and password (blocking) and open a session.
+
+        Raises ValueError if the user's stored role is not a UserRole.
+        """
+        rows = self.db.execute_query(self.QUERY, (username,))
+        row = rows[0] if rows else None
+        digest = self._password_digest(username, password)
+        with self._lock:
+            cached = self._credentials.get(username)
+        if (row is not None and cached and cached[2] > time.time()
+                and cached[1] == row['password'] and hmac.compare_digest(cached[0], digest)):
+            with self._lock:
+                self.cache_hits += 1
+            return self._open_session(username, UserRole(row['role']), row['reference_id'])
+
+        # Unknown usernames are checked against a dummy hash so they take as long
+        stored = row['password'] if row else self._get_dummy_hash()
+        with self._lock:
+            self.hash_checks += 1
+        if not check_password(password, stored) or row is None:
+            return None
+
+        if needs_rehash(stored):
+            stored = hash_password(password)
+            self.db.execute_query("UPDATE rbac_auth SET password = %s WHERE username = %s",
+                                  (stored, username))
+        role = UserRole(row['role'])
+        with self._lock:
+            self._credentials[username] = (digest, stored, time.time() + self.session_ttl)
+        return self._open_session(username, role, row['reference_id'])
+
+    def _get_dummy_hash(self) -> str:
+        if self._dummy_hash is None:
+            self._dummy_hash = hash_password(secrets.token_hex(16))
+        return self._dummy_hash
+
+    def authenticate_async(self, username: str, password: str) -> 'Future[Optional[Session]]':
+        """authenticate() on the verification pool, for callers that must not block"""
+        return self._executor.submit(self.authenticate, username, password)
+
+    def _sign(self, payload: str) -> str:
+        signature = hmac.new(self._secret, payload.encode('utf-8'), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(signature).decode('ascii').rstrip('=')
+
+    def _open_session(self, username: str, role: UserRole,
+                      reference_id: Optional[str]) -> Session:
+        expires_at = time.time() + self.session_ttl
+        payload = f"{secrets.token_urlsafe(16)}.{int(expires_at)}"
+        session = Session(f"{payload}.{self._sign(payload)}",
+                          User.for_login(username, role, reference_id), expires_at)
+        with self._lock:
+            if len(self._sessions) >= 1024:
+                now = time.time()
+                self._sessions = {token: live for token, live in self._sessions.items()
+                                  if live.expires_at > now}
+            self._sessions[session.token] = session
+        return session
+
+    def resume(self, token: str) -> Optional[User]:
+        """The user of a live session token, or None if unknown, forged or expired"""
+        payload, _, signature = token.rpartition('.')
+        if not payload or not hmac.compare_digest(self._sign(payload).encode('utf-8'),
+                                                  signature.encode('utf-8')):
+            return None
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is not None and session.expires_at <= time.time():
+                del self._sessions[token]
+                session = None
+        return session.user if session else None
+
+    def revoke(self, token: str):
+        with self._lock:
+            self._sessions.pop(token, None)
+
+    def set_password(self, username: str, password: str) -> bool:
+        """Store a new hash and forget the cached credential"""
+        result = self.db.execute_query("UPDATE rbac_auth SET password = %s WHERE username = %s",
+                                       (hash_password(password), username))
+        with self._lock:
+            self._credentials.pop(username, None)
+        return bool(result and result[0]['affected_rows'])
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hash_checks': self.hash_checks,
+                'cache_hits': self.cache_hits,
+                'sessions': len(self._sessions)
+            }
@@ -1,5 +1,8 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
-from typing import List, Set, Optional
+from typing import Dict, Iterable, Iterator, List, Set, Optional
 from functools import wraps
 
 class UserRole(Enum):
@@ -31,6 +34,9 @@ class Permission(Enum):
     UPDATE_DOCTOR = "update_doctor"
     DELETE_DOCTOR = "delete_doctor"
 
+    # Report permissions
+    VIEW_ORGANIZATION_REPORTS = "view_organization_reports"
+
 # Define role-based permissions
 ROLE_PERMISSIONS = {
     UserRole.PATIENT: {
@@ -52,75 +58,171 @@ ROLE_PERMISSIONS = {
     }
 }
 
+# Each permission owns one bit, so a role's permission set compiles to an int
+PERMISSION_BITS: Dict[Permission, int] = {
+    permission: 1 << index for index, permission in enumerate(Permission)
+}
+
+def compile_mask(permissions: Iterable[Permission]) -> int:
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    return mask
+
+class CompiledRoles:
+    """Immutable role -> permission mask table; replaced as a whole on reload"""
+    __slots__ = ('masks',)
+
+    def __init__(self, role_permissions: Dict[UserRole, Iterable[Permission]]):
+        self.masks: Dict[UserRole, int] = {
+            role: compile_mask(permissions) for role, permissions in role_permissions.items()
+        }
+
+_compiled_roles = CompiledRoles(ROLE_PERMISSIONS)
+
+def install_role_permissions(role_permissions: Dict[UserRole, Iterable[Permission]]) -> bool:
+    """Compile and swap in new role definitions; False if nothing changed.
+
+    Roles left out keep their ROLE_PERMISSIONS defaults; a role given no
+    permissions has none. Signed-in users
+    pick the new masks up on their next permission check.
+    """
+    global _compiled_roles
+    merged = dict(ROLE_PERMISSIONS)
+    merged.update(role_permissions)
+    compiled = CompiledRoles(merged)
+    if compiled.masks == _compiled_roles.masks:
+        return False
+    _compiled_roles = compiled
+    return True
+
+_USER_ID_PREFIXES = {
+    UserRole.ADMIN: "ADM",
+    UserRole.DOCTOR: "DOC",
+    UserRole.PATIENT: "PAT",
+}
+
 class User:
     def __init__(self, user_id: str, username: str, role: UserRole, reference_id: Optional[str] = None):
         self.user_id = user_id
         self.username = username
         self.role = role
         self.reference_id = reference_id  # patient_id or doctor_id depending on role
-        self._permissions = ROLE_PERMISSIONS[role]
+        # Mask cached from the role table it was compiled in
+        self._roles: Optional[CompiledRoles] = None
+        self._mask = 0
+
+    @classmethod
+    def for_login(cls, username: str, role: UserRole,
+                  reference_id: Optional[str] = None) -> 'User':
+        """User for a login name, with an ID generated from its role"""
+        return cls(f"{_USER_ID_PREFIXES[role]}_{username}", username, role, reference_id)
     
+    def permission_mask(self) -> int:
+        roles = _compiled_roles
+        if self._roles is not roles:
+            self._mask = roles.masks.get(self.role, 0)
+            self._roles = roles
+        return self._mask
+
     def has_permission(self, permission: Permission) -> bool:
-        return permission in self._permissions
+        return bool(self.permission_mask() & PERMISSION_BITS[permission])
     
-    def can_access_record(self, record_id: str) -> bool:
-        """Check if user can access a specific record"""
-        if self.role == UserRole.STAFF_ADMIN:
+    def can_access_record(self, record: dict) -> bool:
+        """Check a fetched appointment or medical record row against the user.
+
+        Listings are already limited in SQL by auth.row_scope; this is for
+        rows that arrive by other means (e.g. an ID typed into a form).
+        """
+        if self.role == UserRole.ADMIN:
             return True
         elif self.role == UserRole.DOCTOR:
-            # TODO: Check if doctor is assigned to this record
-            return True
+            return self.reference_id is not None and record.get('doctor_id') == self.reference_id
         elif self.role == UserRole.PATIENT:
-            # TODO: Check if record belongs to the patient
-            return True
+            return self.reference_id is not None and record.get('patient_id') == self.reference_id
         return False
 
+# The user of the request being served; unset outside as_user()
+_request_user: ContextVar[Optional[User]] = ContextVar('request_user', default=None)
+
 class AuthenticationManager:
+    """Tracks which user the service layer is acting for.
+
+    The desktop app logs one user in for the whole process with
+    set_current_user(). A server instead wraps each request in as_user(),
+    which binds the user to the running thread or asyncio task through a
+    context variable, so concurrent requests never see each other's user;
+    inside as_user() the request user takes precedence over the session.
+    Worker threads start with an empty context, so hand them work through
+    ``contextvars.copy_context().run`` to keep the user.
+    """
     _instance = None
-    
+    _lock = threading.Lock()
+
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(AuthenticationManager, cls).__new__(cls)
-            cls._instance._initialize()
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(AuthenticationManager, cls).__new__(cls)
+                    instance._initialize()
+                    cls._instance = instance
         return cls._instance
-    
+
     def _initialize(self):
-        self.current_user: Optional[User] = None
-    
+        self._session_user: Optional[User] = None
+
+    @property
+    def current_user(self) -> Optional[User]:
+        return self.get_current_user()
+
+    @current_user.setter
+    def current_user(self, user: Optional[User]):
+        self._session_user = user
+
     def set_current_user(self, username: str, role: UserRole, reference_id: Optional[str] = None):
-        """Set the current authenticated user"""
-        # Generate a user ID based on role
-        if role == UserRole.ADMIN:
-            user_id = f"ADM_{username}"
-        elif role == UserRole.DOCTOR:
-            user_id = f"DOC_{username}"
-        elif role == UserRole.PATIENT:
-            user_id = f"PAT_{username}"
-            
-        self.current_user = User(user_id, username, role, reference_id)
-        
+        """Set the authenticated user for the whole process (desktop session)"""
+        self._session_user = User.for_login(username, role, reference_id)
+
     def logout(self):
-        """Log out the current user"""
-        self.current_user = None
-    
+        """Log out the session user"""
+        self._session_user = None
+
     def get_current_user(self) -> Optional[User]:
-        """Get the currently authenticated user"""
-        return self.current_user
+        """The request user inside as_user(), otherwise the session user"""
+        user = _request_user.get()
+        return user if user is not None else self._session_user
+
+@contextmanager
+def as_user(user: User) -> Iterator[User]:
+    """Act as ``user`` in the current thread or task until the block exits"""
+    token = _request_user.set(user)
+    try:
+        yield user
+    finally:
+        _request_user.reset(token)
 
 def require_permission(permission: Permission):
-    """Decorator to check if user has required permission"""
+    """Decorator to check if user has required permission.
+
+    The permission bit and the lookups are resolved when the function is
+    decorated, so a call only reads the user and tests one bit against
+    the mask cached on it.
+    """
+    bit = PERMISSION_BITS[permission]
+    denied = f"User does not have permission: {permission.value}"
+    request_user = _request_user.get
+    auth_manager = AuthenticationManager()
+
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            auth_manager = AuthenticationManager()
-            user = auth_manager.get_current_user()
-            
-            if not user:
+            user = request_user() or auth_manager._session_user
+            if user is None:
                 raise PermissionError("User not authenticated")
-            
-            if not user.has_permission(permission):
-                raise PermissionError(f"User does not have permission: {permission.value}")
-            
+            if user._roles is not _compiled_roles:
+                user.permission_mask()
+            if not user._mask & bit:
+                raise PermissionError(denied)
             return func(*args, **kwargs)
         return wrapper
     return decorator
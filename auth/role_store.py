@@ -0,0 +1,88 @@
+import threading
+from typing import Dict, Optional, Set
+from mysql.connector import Error
+from ..config import RBAC_CONFIG
+from ..patterns.singleton import DatabaseManager
+from .rbac import Permission, UserRole, install_role_permissions
+
+class RoleDefinitionLoader:
+    """Keeps the compiled permission masks in step with rbac_role_permissions.
+
+    The table is authoritative for the roles it manages: MANAGED_ROLES,
+    which migration 006 seeds, and any other role it has rows for. A managed
+    role with no rows holds no permissions. Roles it does not manage (Admin)
+    keep ROLE_PERMISSIONS, and so does every role until the table has been
+    read. A background thread re-reads the table every ``reload_interval``
+    seconds and only swaps in new masks when something changed.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    QUERY = "SELECT role, permission FROM rbac_role_permissions"
+    MANAGED_ROLES = (UserRole.PATIENT, UserRole.DOCTOR)
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super(RoleDefinitionLoader, cls).__new__(cls)
+                    cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self.db = DatabaseManager.get_instance()
+        self.reload_interval = RBAC_CONFIG['reload_interval']
+        self.reloads = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        """Load the definitions now and keep reloading them; False if already running"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="role-reloader",
+                                            daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        with self._lock:
+            thread = self._thread
+        if thread:
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            try:
+                self.reload()
+            except Error as e:
+                print(f"Error reloading role permissions: {e}")
+            if self._stop.wait(self.reload_interval):
+                break
+
+    def reload(self) -> bool:
+        """Read the table and install it; True if any role's permissions changed.
+
+        Raises Error, leaving the current masks in place, if the table
+        can't be read.
+        """
+        rows = self.db.execute_query(self.QUERY)
+        definitions: Dict[UserRole, Set[Permission]] = {
+            role: set() for role in self.MANAGED_ROLES}
+        for row in rows:
+            try:
+                role = UserRole(row['role'])
+                permission = Permission(row['permission'])
+            except ValueError:
+                print(f"Ignoring unknown role permission: {row['role']}/{row['permission']}")
+                continue
+            definitions.setdefault(role, set()).add(permission)
+
+        if not install_role_permissions(definitions):
+            return False
+        self.reloads += 1
+        return True
@@ -0,0 +1,58 @@
+"""Row-level access rules, expressed as SQL predicates.
+
+Patients may only read their own rows and doctors the rows of their own
+appointments, records and patients; admins are unrestricted. Services add
+``row_scope(table, alias)`` to their WHERE clauses so the database only
+reads the user's rows, through the (patient_id, ...) and (doctor_id, ...)
+indexes, instead of returning whole tables to be filtered in Python.
+
+Scoped reads need a user bound to the current context; without one they
+raise PermissionError rather than fall back to an unscoped query.
+"""
+from typing import Dict, List, Optional, Tuple
+from .rbac import AuthenticationManager, User, UserRole
+
+# table -> role -> predicate; every %s is bound to the user's reference_id
+ROW_SCOPES: Dict[str, Dict[UserRole, str]] = {
+    'appointments': {
+        UserRole.PATIENT: "{alias}.patient_id = %s",
+        UserRole.DOCTOR: "{alias}.doctor_id = %s",
+    },
+    'medical_records': {
+        UserRole.PATIENT: "{alias}.patient_id = %s",
+        UserRole.DOCTOR: "{alias}.doctor_id = %s",
+    },
+    'patients': {
+        UserRole.PATIENT: "{alias}.patient_id = %s",
+        UserRole.DOCTOR: """{alias}.patient_id IN (
+            SELECT patient_id FROM appointments WHERE doctor_id = %s
+            UNION SELECT patient_id FROM medical_records WHERE doctor_id = %s)""",
+    },
+}
+
+def _authenticated_user() -> User:
+    user = AuthenticationManager().get_current_user()
+    if not user:
+        raise PermissionError("User not authenticated")
+    return user
+
+def is_unrestricted(user: Optional[User] = None) -> bool:
+    """True when ``user`` (default: the current user) sees every row"""
+    user = user or _authenticated_user()
+    return user.role == UserRole.ADMIN
+
+def row_scope(table: str, alias: Optional[str] = None,
+              user: Optional[User] = None) -> Tuple[str, List]:
+    """WHERE predicate and params limiting ``table`` to the user's rows.
+
+    ``alias`` is how the query refers to the table (defaults to its name).
+    Roles without a rule for ``table`` see every row; a scoped user
+    without a reference_id sees none.
+    """
+    user = user or _authenticated_user()
+    rule = ROW_SCOPES.get(table, {}).get(user.role)
+    if user.role == UserRole.ADMIN or rule is None:
+        return "1=1", []
+    if not user.reference_id:
+        return "1=0", []
+    return rule.format(alias=alias or table), [user.reference_id] * rule.count("%s")
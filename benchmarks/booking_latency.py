@@ -0,0 +1,82 @@
+"""Booking latency with email/SMS delivered inline vs written to the outbox.
+
+Run with ``python -m hospital_management_system.benchmarks.booking_latency``
+against the database in DB_CONFIG. Each booking runs in a transaction that
+is rolled back, so nothing is left behind. The inline side attaches
+stand-ins for the email and SMS senders that take ``--delivery-ms`` each,
+as every booking paid before notifications went through the outbox; the
+outbox side is AppointmentService as shipped, where the booking only
+inserts the outbox rows and OutboxDrainer delivers them later.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+from ..auth.rbac import User, UserRole, as_user
+from ..patterns.observer import AppointmentSystem, Observer
+from ..patterns.singleton import DatabaseManager
+from ..services.appointment_service import AppointmentService
+
+class _SlowChannel(Observer):
+    """Stands in for a remote email/SMS gateway taking ``latency`` seconds per send"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def update(self, event_type: str, data: dict):
+        time.sleep(self.latency)
+
+def _inline_service(latency: float) -> AppointmentService:
+    service = AppointmentService()
+    service.channels = [_SlowChannel(latency), _SlowChannel(latency)]
+    service.notification_system = AppointmentSystem()
+    for channel in service.channels:
+        service.notification_system.attach(channel)
+    return service
+
+def _book(service: AppointmentService, patient_id: str, doctor_id: str,
+          bookings: int) -> List[float]:
+    db = DatabaseManager.get_instance()
+    when = datetime.now() + timedelta(days=30)
+    timings = []
+    for i in range(bookings):
+        started = time.perf_counter()
+        with db.transaction():
+            service.create_appointment(patient_id, doctor_id, when + timedelta(minutes=i),
+                                       "General Medicine")
+            db.set_rollback_only()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def _report(label: str, timings: List[float]):
+    timings = sorted(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{label:<28}{statistics.mean(timings):>9.2f} ms mean"
+          f"{statistics.median(timings):>9.2f} ms p50{p99:>9.2f} ms p99")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure create_appointment latency")
+    parser.add_argument('--patient', help="patient_id to book for (default: first patient)")
+    parser.add_argument('--doctor', help="doctor_id to book with (default: first doctor)")
+    parser.add_argument('--bookings', type=int, default=200)
+    parser.add_argument('--delivery-ms', type=float, default=150.0,
+                        help="time one email or SMS send takes on the inline side")
+    args = parser.parse_args()
+
+    db = DatabaseManager.get_instance()
+    patient_id = args.patient or db.execute_query(
+        "SELECT patient_id FROM patients ORDER BY patient_id LIMIT 1")[0]['patient_id']
+    doctor_id = args.doctor or db.execute_query(
+        "SELECT doctor_id FROM doctors ORDER BY doctor_id LIMIT 1")[0]['doctor_id']
+
+    with as_user(User.for_login("benchmark", UserRole.ADMIN)):
+        outbox = AppointmentService()
+        _book(outbox, patient_id, doctor_id, 5)  # warm the caches and the ID block
+        _report("outbox", _book(outbox, patient_id, doctor_id, args.bookings))
+        inline = _inline_service(args.delivery_ms / 1000)
+        _report(f"inline ({args.delivery_ms:g} ms/send)",
+                _book(inline, patient_id, doctor_id, args.bookings))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Parity checks and timings for ColumnarOrganization (needs numpy).
+
+Run with ``python -m hospital_management_system.benchmarks.columnar_rollups``.
+Every rollup is compared with the object tree before anything is timed.
+"""
+import time
+from collections import defaultdict
+from ..patterns.composite import HospitalComposite, Department, Staff
+from ..patterns.columnar_composite import ColumnarOrganization
+from .composite_tree import build_tree
+
+def _walk(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(node, HospitalComposite):
+            stack.extend(node.get_children())
+
+def _close(a: float, b: float) -> bool:
+    return abs(a - b) <= 1e-6 * max(1.0, abs(a), abs(b))
+
+def check_parity(tree: HospitalComposite, columnar: ColumnarOrganization):
+    for node in _walk(tree):
+        assert _close(columnar.get_cost(node.id), node.get_cost()), node.id
+        assert columnar.get_staff_count(node.id) == node.get_staff_count(), node.id
+
+    for subtree in [tree] + tree.get_children()[:3]:
+        expected = defaultdict(float)
+        for node in _walk(subtree):
+            if isinstance(node, Staff):
+                expected[node.role] += node.salary
+        actual = columnar.get_role_costs(subtree.id)
+        assert set(k for k, v in actual.items() if v) == set(expected)
+        assert all(_close(actual[role], total) for role, total in expected.items())
+
+    departments = {d.id: d for d in _walk(tree) if isinstance(d, Department)}
+    breakdown = columnar.get_department_breakdown()
+    assert len(breakdown) == len(departments)
+    for row in breakdown:
+        department = departments[row['department_id']]
+        assert _close(row['total_cost'], department.get_cost())
+        assert row['total_staff'] == department.get_staff_count()
+        assert row['branch_id'] == department.parent.id
+
+    rebuilt = columnar.to_tree()
+    assert rebuilt.generate_report() == tree.generate_report()
+
+def _timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:<40}{(time.perf_counter() - started) * 1000:>10.1f} ms")
+    return result
+
+if __name__ == "__main__":
+    small = build_tree(hospitals=3, departments=5, leaves=40)
+    columnar = ColumnarOrganization.from_tree(small)
+    check_parity(small, columnar)
+    leaf = small.get_child(1).get_child(2).get_child(0)
+    leaf.salary += 12345
+    columnar.set_cost(leaf.id, leaf.salary)
+    check_parity(small, columnar)
+    print("parity checks passed\n")
+
+    tree = _timed("build 500k-node object tree",
+                  lambda: build_tree(hospitals=20, departments=25, leaves=1000))
+    columnar = _timed("convert to columnar", lambda: ColumnarOrganization.from_tree(tree))
+
+    print()
+    _timed("object tree: cost + headcount (cold)",
+           lambda: (tree.get_cost(), tree.get_staff_count()))
+    _timed("columnar: all subtree totals",
+           lambda: (columnar.get_cost(), columnar.get_staff_count()))
+
+    def object_role_costs():
+        totals = defaultdict(float)
+        for node in _walk(tree):
+            if isinstance(node, Staff):
+                totals[node.role] += node.salary
+        return totals
+
+    _timed("object tree: cost per role", object_role_costs)
+    _timed("columnar: cost per role", columnar.get_role_costs)
+    _timed("object tree: department breakdown",
+           lambda: [(d.get_cost(), d.get_staff_count())
+                    for d in _walk(tree) if isinstance(d, Department)])
+    _timed("columnar: department breakdown", columnar.get_department_breakdown)
+
+    leaf = tree.get_child(5).get_child(5).get_child(0)
+    columnar.set_cost(leaf.id, leaf.salary + 1)
+    _timed("columnar: totals after a salary change", columnar.get_cost)
@@ -0,0 +1,80 @@
+"""Report timings on a 100k-node HospitalComposite tree.
+
+Run with ``python -m hospital_management_system.benchmarks.composite_tree``.
+The uncached column re-walks every subtree at every level, as
+generate_report did before subtree totals were cached.
+"""
+import random
+import time
+from ..patterns.composite import (
+    HospitalComponent, HospitalComposite, Hospital, Department, Staff, Resource
+)
+
+ROLES = ["Doctor", "Nurse", "Technician", "Administrator"]
+RESOURCE_TYPES = ["Equipment", "Room", "Vehicle"]
+
+def build_tree(hospitals: int = 10, departments: int = 20, leaves: int = 500) -> HospitalComposite:
+    """Chain -> hospitals -> departments -> staff/resources"""
+    rng = random.Random(42)
+    chain = HospitalComposite("CHAIN", "Serenity Health")
+    for h in range(hospitals):
+        hospital = Hospital(f"H{h}", f"Hospital {h}", f"City {h}")
+        for d in range(departments):
+            department = Department(f"H{h}D{d}", f"Department {d}", "General")
+            for n in range(leaves):
+                if n % 5 == 4:
+                    department.add(Resource(f"H{h}D{d}R{n}", f"Resource {n}",
+                                            rng.uniform(1000, 50000),
+                                            RESOURCE_TYPES[n % len(RESOURCE_TYPES)]))
+                else:
+                    department.add(Staff(f"H{h}D{d}S{n}", f"Staff {n}",
+                                         rng.uniform(30000, 150000), ROLES[n % len(ROLES)]))
+            hospital.add(department)
+        chain.add(hospital)
+    return chain
+
+def _uncached_cost(node: HospitalComponent) -> float:
+    if isinstance(node, HospitalComposite):
+        return sum(_uncached_cost(child) for child in node._children)
+    return node.get_cost()
+
+def _uncached_staff(node: HospitalComponent) -> int:
+    if isinstance(node, HospitalComposite):
+        return sum(_uncached_staff(child) for child in node._children)
+    return node.get_staff_count()
+
+def _uncached_report(node: HospitalComponent) -> dict:
+    if not isinstance(node, HospitalComposite):
+        return node.generate_report()
+    return {
+        'id': node.id,
+        'name': node.name,
+        'type': node.__class__.__name__,
+        'total_cost': _uncached_cost(node),
+        'total_staff': _uncached_staff(node),
+        'children': [_uncached_report(child) for child in node._children]
+    }
+
+def _timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:<40}{(time.perf_counter() - started) * 1000:>10.1f} ms")
+    return result
+
+if __name__ == "__main__":
+    chain = _timed("build 100k-node tree", build_tree)
+    leaf = chain.get_child(3).get_child(7).get_child(0)
+
+    print()
+    _timed("uncached report", lambda: _uncached_report(chain))
+    _timed("cached report, cold", chain.generate_report)
+    _timed("cached report, warm", chain.generate_report)
+    _timed("get_cost + get_staff_count, warm",
+           lambda: (chain.get_cost(), chain.get_staff_count()))
+
+    print()
+    _timed("update one salary", lambda: setattr(leaf, 'salary', leaf.salary + 1000))
+    _timed("get_cost after update", chain.get_cost)
+    _timed("uncached get_cost", lambda: _uncached_cost(chain))
+    assert abs(chain.get_cost() - _uncached_cost(chain)) < 1e-3
+    assert chain.get_staff_count() == _uncached_staff(chain)
@@ -0,0 +1,66 @@
+"""Per-call overhead of require_permission.
+
+Run with ``python -m hospital_management_system.benchmarks.permission_check``.
+The "previous" decorator is the one the compiled bitmask check replaced: it
+constructed AuthenticationManager() and looked the permission up in the
+role's enum set on every call.
+"""
+import timeit
+from functools import wraps
+from ..auth.rbac import (
+    ROLE_PERMISSIONS, AuthenticationManager, Permission, User, UserRole,
+    as_user, install_role_permissions, require_permission
+)
+
+def previous_require_permission(permission: Permission):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            user = AuthenticationManager().get_current_user()
+            if not user:
+                raise PermissionError("User not authenticated")
+            if permission not in ROLE_PERMISSIONS[user.role]:
+                raise PermissionError(f"User does not have permission: {permission.value}")
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class Service:
+    def plain(self):
+        return None
+
+    @previous_require_permission(Permission.VIEW_APPOINTMENTS)
+    def previous(self):
+        return None
+
+    @require_permission(Permission.VIEW_APPOINTMENTS)
+    def compiled(self):
+        return None
+
+def _per_call(func, number: int = 1_000_000) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+
+if __name__ == "__main__":
+    service = Service()
+    AuthenticationManager().set_current_user("bench", UserRole.DOCTOR, "DOC0001")
+
+    baseline = _per_call(service.plain)
+    print(f"{'undecorated call':<36}{baseline:>8.0f} ns")
+    for label, func in [("previous decorator (session user)", service.previous),
+                        ("compiled mask (session user)", service.compiled)]:
+        cost = _per_call(func)
+        print(f"{label:<36}{cost:>8.0f} ns  (+{cost - baseline:.0f} ns)")
+    with as_user(User.for_login("request", UserRole.DOCTOR, "DOC0001")):
+        cost = _per_call(service.compiled)
+        print(f"{'compiled mask (as_user)':<36}{cost:>8.0f} ns  (+{cost - baseline:.0f} ns)")
+
+    # Hot reload: revoke the permission and check the signed-in user sees it
+    install_role_permissions({UserRole.DOCTOR: {Permission.VIEW_PATIENTS}})
+    try:
+        service.compiled()
+        raise AssertionError("revoked permission still granted")
+    except PermissionError:
+        pass
+    install_role_permissions({})
+    assert service.compiled() is None
+    print("\nreloaded masks apply to the signed-in user on their next call")
@@ -0,0 +1,57 @@
+"""Peak memory and time of streamed vs materialised organisation reports.
+
+Run with ``python -m hospital_management_system.benchmarks.report_stream``.
+Both sides read the same warm subtree totals, so the difference is the
+nested dict and the JSON string that generate_report() + json.dump hold.
+"""
+import csv
+import io
+import json
+import os
+import time
+import tracemalloc
+from ..patterns.composite_report import iter_json, write_csv, write_json
+from .composite_tree import build_tree
+
+def _measured(label: str, func):
+    """Time an untraced run, then trace a second one for its peak allocation"""
+    started = time.perf_counter()
+    func()
+    elapsed = (time.perf_counter() - started) * 1000
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<36}{elapsed:>10.1f} ms{peak / 1024 / 1024:>10.1f} MiB peak")
+    return result
+
+def check_output(tree):
+    assert json.loads(''.join(iter_json(tree))) == tree.generate_report()
+
+    shallow = json.loads(''.join(iter_json(tree, max_depth=1)))
+    assert all('children' not in branch for branch in shallow['children'])
+    assert shallow['total_cost'] == tree.get_cost()
+
+    picked = [tree.get_child(0).id, tree.get_child(2).id]
+    filtered = json.loads(''.join(iter_json(tree, branch_ids=picked)))
+    assert [branch['id'] for branch in filtered['children']] == picked
+    assert filtered['total_staff'] == sum(tree.get_child(i).get_staff_count() for i in (0, 2))
+
+    out = io.StringIO()
+    rows = write_csv(tree, out, max_depth=2)
+    parsed = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert len(parsed) == rows == 1 + len(tree.get_children()) * 6
+    assert max(int(row['depth']) for row in parsed) == 2
+
+if __name__ == "__main__":
+    check_output(build_tree(hospitals=3, departments=5, leaves=20))
+    print("output checks passed\n")
+
+    tree = build_tree()
+    tree.get_cost(), tree.get_staff_count()  # warm the subtree totals
+
+    with open(os.devnull, 'w') as devnull:
+        _measured("generate_report + json.dump", lambda: json.dump(tree.generate_report(), devnull))
+        _measured("write_json", lambda: write_json(tree, devnull))
+        _measured("write_json, max_depth=2", lambda: write_json(tree, devnull, max_depth=2))
+        _measured("write_csv", lambda: write_csv(tree, devnull))
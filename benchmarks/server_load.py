@@ -0,0 +1,101 @@
+"""Closed-loop load test for the HTTP/JSON API on localhost.
+
+Start the server first (``python -m hospital_management_system.server``), then:
+
+    python -m hospital_management_system.benchmarks.server_load \\
+        --username admin --password secret --path /appointments?page_size=20
+
+Each of ``--concurrency`` clients keeps one keep-alive connection open and
+sends its next request as soon as the previous answer arrives. The report
+gives throughput and latency percentiles over ``--duration`` seconds.
+Without credentials only unauthenticated paths such as /health work.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str,
+                   path: str, token: Optional[str] = None, body: Optional[dict] = None,
+                   host: str = 'localhost') -> Tuple[int, bytes]:
+    data = json.dumps(body).encode('utf-8') if body is not None else b''
+    head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(data)}\r\n"
+    if token:
+        head += f"Authorization: Bearer {token}\r\n"
+    writer.write(head.encode('latin-1') + b"\r\n" + data)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+async def _login(host: str, port: int, username: str, password: str) -> str:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        status, body = await _request(reader, writer, 'POST', '/login', body={
+            'username': username, 'password': password})
+    finally:
+        writer.close()
+    if status != 200:
+        raise SystemExit(f"Login failed ({status}): {body.decode()}")
+    return json.loads(body)['token']
+
+async def _client(host: str, port: int, path: str, token: Optional[str], deadline: float,
+                  latencies: List[float], statuses: Counter):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            status, _ = await _request(reader, writer, 'GET', path, token)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+    finally:
+        writer.close()
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def run(host: str, port: int, path: str, concurrency: int, duration: float,
+              username: Optional[str] = None, password: Optional[str] = None):
+    token = await _login(host, port, username, password) if username else None
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, path, token, started + duration, latencies, statuses)
+        for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    print(f"GET {path}: {concurrency} connections, {elapsed:.1f} s")
+    print(f"  requests   {len(ordered)}  ({dict(statuses)})")
+    print(f"  throughput {len(ordered) / elapsed:,.0f} req/s")
+    for label, fraction in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99)):
+        print(f"  {label}        {_percentile(ordered, fraction) * 1000:.2f} ms")
+    print(f"  max        {ordered[-1] * 1000:.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HTTP/JSON API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--path', default='/health')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--username')
+    parser.add_argument('--password')
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port, args.path, args.concurrency, args.duration,
+                    args.username, args.password))
+
+if __name__ == "__main__":
+    main()
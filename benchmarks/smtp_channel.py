@@ -0,0 +1,159 @@
+"""Throughput of SMTPEmailNotifier against an in-process SMTP stand-in.
+
+Run with ``python -m hospital_management_system.benchmarks.smtp_channel``.
+The stand-in accepts mail on localhost, adds a fixed delay per message to
+mimic a remote relay and can answer every Nth message with a transient 451
+to exercise the retry path; tests/test_email_channel.py also scripts the
+replies per recipient. Messages/second is reported for several pool
+sizes and for a connect-per-message baseline.
+"""
+import smtplib
+import socketserver
+import threading
+import time
+from collections import Counter
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+from ..services.email_channel import SMTPConnectionPool, SMTPEmailNotifier
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        server = self.server
+        server.opened()
+        recipient = None
+        self._reply("220 localhost stand-in ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip()
+            verb = command[:4].upper()
+            if verb == "EHLO":
+                self._reply("250-localhost")
+                self._reply("250 8BITMIME")
+            elif verb == "HELO" or verb == "RSET" or verb == "NOOP":
+                self._reply("250 OK")
+            elif verb == "MAIL":
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                recipient = command.partition(":")[2].strip().strip("<>")
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                time.sleep(server.latency)
+                reply = server.reply_for(recipient)
+                if reply is not None:
+                    self._reply(reply)
+                    if reply.startswith("421"):
+                        return  # the server closes the session
+                elif server.should_fail():
+                    self._reply("451 Try again later")
+                else:
+                    server.count(recipient)
+                    self._reply("250 Queued")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency: float = 0.002, fail_every: int = 0,
+                 replies: Optional[Dict[str, List[str]]] = None):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.latency = latency
+        self.fail_every = fail_every
+        # recipient -> replies to its next DATA commands, used up in order
+        self.replies = {recipient: list(queue) for recipient, queue in (replies or {}).items()}
+        self.received = 0
+        self.received_by: Counter = Counter()
+        self.sessions = 0
+        self._seen = 0
+        self._lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            self._seen += 1
+            return bool(self.fail_every) and self._seen % self.fail_every == 0
+
+    def reply_for(self, recipient: Optional[str]) -> Optional[str]:
+        with self._lock:
+            queue = self.replies.get(recipient)
+            return queue.pop(0) if queue else None
+
+    def opened(self):
+        with self._lock:
+            self.sessions += 1
+
+    def count(self, recipient: Optional[str] = None):
+        with self._lock:
+            self.received += 1
+            self.received_by[recipient] += 1
+
+def _events(count: int):
+    return [
+        ("APPOINTMENT_SCHEDULED", {
+            "email": f"patient{i}@example.com",
+            "date_time": "2024-01-01 09:00",
+            "doctor_name": "Perera"
+        })
+        for i in range(count)
+    ]
+
+def bench_pool(server: SMTPStandIn, pool_size: int, count: int) -> float:
+    notifier = SMTPEmailNotifier(
+        SMTPConnectionPool("127.0.0.1", server.port, pool_size=pool_size),
+        retry_delay=0.01
+    )
+    events = _events(count)
+    started = time.perf_counter()
+    try:
+        notifier.update_batch(events)
+    finally:
+        elapsed = time.perf_counter() - started
+        stats = notifier.get_stats()
+        notifier.close()
+    print(f"pool_size={pool_size:<3} {count / elapsed:>9.0f} msg/s  "
+          f"(sent {stats['sent']}, retries {stats['retries']}, connects {stats['connects']})")
+    return elapsed
+
+def bench_connect_per_message(server: SMTPStandIn, count: int) -> float:
+    started = time.perf_counter()
+    for _, data in _events(count):
+        message = EmailMessage()
+        message['From'] = "noreply@serenityhealth.lk"
+        message['To'] = data['email']
+        message['Subject'] = "Hospital Management System - APPOINTMENT_SCHEDULED"
+        message.set_content("Your appointment has been scheduled")
+        with smtplib.SMTP("127.0.0.1", server.port) as smtp:
+            smtp.send_message(message)
+    elapsed = time.perf_counter() - started
+    print(f"{'connect per message':<14} {count / elapsed:>5.0f} msg/s")
+    return elapsed
+
+if __name__ == "__main__":
+    count = 1000
+    server = SMTPStandIn(latency=0.002)
+    print(f"{count} messages, 2 ms relay latency per message")
+    bench_connect_per_message(server, count)
+    for pool_size in (1, 2, 4, 8, 16):
+        bench_pool(server, pool_size, count)
+    server.shutdown()
+
+    server = SMTPStandIn(latency=0.002, fail_every=10)
+    print("\nSame run with every 10th message answered 451")
+    bench_pool(server, 4, count)
+    server.shutdown()
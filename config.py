@@ -1,6 +1,82 @@
+import os
+
+# Runtime files live beside the package, whatever the working directory
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+
 DB_CONFIG = {
     'host': 'localhost',
     'user': 'root',
     'password': 'Root@123',
     'database': 'serenity_hospital_db'
 }
+
+DB_POOL_CONFIG = {
+    'pool_size': 5,          # maximum number of open connections
+    'validate_after': 30.0,  # seconds idle before a connection is pinged on checkout
+    'checkout_timeout': 10.0 # seconds to wait for a free connection
+}
+
+ID_ALLOCATOR_CONFIG = {
+    'block_size': 20  # IDs reserved per round trip to the id_sequences table
+}
+
+CACHE_CONFIG = {
+    'max_size': 1000,  # entries per cached entity type
+    'ttl': 300.0       # seconds before a cached entity is re-read
+}
+
+OUTBOX_CONFIG = {
+    'channels': ('email', 'sms'),  # one outbox row is written per channel
+    'batch_size': 100,             # recipients claimed per drain pass, with all their due rows
+    'lease_seconds': 60,           # claimed rows become due again after this
+    'poll_interval': 2.0,          # seconds between passes when the outbox is idle
+    'max_attempts': 5,             # deliveries tried before a row is marked failed
+    'retry_delay': 30,             # seconds before the first retry, doubled each time
+    'coalesce_window': 15,         # seconds a recipient's oldest row waits so a burst merges
+    'channel_workers': 2,          # delivery threads per channel
+    'max_pending_batches': 4       # claimed batches queued per channel before claiming pauses;
+                                   # keep their delivery time well under lease_seconds
+}
+
+SMTP_CONFIG = {
+    'enabled': False,              # False keeps the console EmailNotifier
+    'host': 'localhost',
+    'port': 25,
+    'username': None,
+    'password': None,
+    'use_tls': False,              # STARTTLS after connecting
+    'sender': 'noreply@serenityhealth.lk',
+    'pool_size': 4,                # persistent SMTP sessions sending in parallel
+    'timeout': 10.0,               # socket timeout in seconds
+    'max_retries': 3,              # retries of a message after a transient failure
+    'retry_delay': 1.0             # seconds before the first retry, doubled each time
+}
+
+EVENT_LOG_CONFIG = {
+    'path': os.path.join(LOG_DIR, 'events.jsonl'),  # current file; rotated ones sit alongside, gzipped
+    'ring_size': 65536,             # events buffered in memory between writes
+    'flush_interval': 0.5,          # seconds between batched writes (one fsync each)
+    'max_bytes': 10 * 1024 * 1024,  # rotate once the file reaches this size
+    'rotate_interval': 24 * 3600,   # ... or once it is this many seconds old
+    'backups': 30                   # rotated files kept
+}
+
+RBAC_CONFIG = {
+    'reload_interval': 30.0  # seconds between re-reads of rbac_role_permissions
+}
+
+AUTH_CONFIG = {
+    'bcrypt_rounds': 12,       # work factor; stored hashes below it are upgraded at login
+    'verify_workers': 2,       # threads running bcrypt so the UI never blocks on it
+    'session_ttl': 8 * 3600,   # seconds a session token (and its cached credential) lasts
+    'session_secret': None     # HMAC key for tokens; None generates one per process
+}
+
+SERVER_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8080,
+    'workers': None,          # threads running service calls; None = DB pool size
+    'max_pending': 256,       # requests queued for a worker before answering 503
+    'max_body': 1024 * 1024,  # largest request body accepted, in bytes
+    'keepalive_timeout': 15.0 # seconds an idle keep-alive connection stays open
+}
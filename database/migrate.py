@@ -0,0 +1,174 @@
+import importlib.util
+import mysql.connector
+from mysql.connector import Error
+import os
+from datetime import datetime, timedelta
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+
+# Representative service queries and the index each one should resolve with
+INDEX_CHECKS = [
+    (
+        "doctor schedule",
+        "SELECT * FROM appointments WHERE doctor_id = %s "
+        "AND appointment_date >= %s AND appointment_date < %s",
+        ('DOC0001', datetime(2024, 1, 1), datetime(2024, 1, 2)),
+        'appointments',
+        'idx_appointments_doctor_date'
+    ),
+    (
+        "patient appointments",
+        "SELECT * FROM appointments WHERE patient_id = %s ORDER BY appointment_date DESC",
+        ('PAT0001',),
+        'appointments',
+        'idx_appointments_patient_date'
+    ),
+    (
+        "appointments by status",
+        "SELECT * FROM appointments WHERE status = %s "
+        "AND appointment_date >= %s AND appointment_date < %s",
+        ('scheduled', datetime(2024, 1, 1), datetime(2024, 1, 8)),
+        'appointments',
+        'idx_appointments_status_date'
+    ),
+    (
+        "appointments by day",
+        "SELECT * FROM appointments WHERE appointment_date >= %s AND appointment_date < %s",
+        (datetime(2024, 1, 1), datetime(2024, 1, 1) + timedelta(days=1)),
+        'appointments',
+        'idx_appointments_date'
+    ),
+    (
+        "patient records",
+        "SELECT * FROM medical_records WHERE patient_id = %s ORDER BY visit_date DESC",
+        ('PAT0001',),
+        'medical_records',
+        'idx_medical_records_patient_visit'
+    ),
+    (
+        "doctor records",
+        "SELECT * FROM medical_records WHERE doctor_id = %s ORDER BY visit_date DESC",
+        ('DOC0001',),
+        'medical_records',
+        'idx_medical_records_doctor_visit'
+    )
+]
+
+def get_migrations():
+    """Return (version, path) pairs for every migration file, oldest first.
+
+    ``.sql`` files are run statement by statement; ``.py`` files are for
+    data changes SQL can't express and must define ``migrate(connection)``.
+    """
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        if filename.endswith(('.sql', '.py')):
+            version = filename.split('_', 1)[0]
+            migrations.append((version, os.path.join(MIGRATIONS_DIR, filename)))
+    return migrations
+
+def _run_sql_migration(path, cursor):
+    with open(path, 'r') as file:
+        sql_commands = file.read().split(';')
+
+    for command in sql_commands:
+        # Drop comment-only lines so they don't count as a statement
+        command = '\n'.join(
+            line for line in command.splitlines()
+            if not line.strip().startswith('--')
+        ).strip()
+        if command:
+            cursor.execute(command)
+
+def _run_python_migration(path, connection):
+    spec = importlib.util.spec_from_file_location(
+        f"migration_{os.path.basename(path)[:-3]}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.migrate(connection)
+
+def apply_migrations(connection):
+    """Apply every migration not yet recorded in schema_migrations"""
+    cursor = connection.cursor()
+    applied = []
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(20) PRIMARY KEY,
+                applied_at DATETIME NOT NULL
+            )
+        """)
+        cursor.execute("SELECT version FROM schema_migrations")
+        done = {row[0] for row in cursor.fetchall()}
+
+        for version, path in get_migrations():
+            if version in done:
+                continue
+
+            if path.endswith('.py'):
+                _run_python_migration(path, connection)
+            else:
+                _run_sql_migration(path, cursor)
+
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, applied_at) VALUES (%s, %s)",
+                (version, datetime.now())
+            )
+            connection.commit()
+            applied.append(version)
+            print(f"Applied migration {os.path.basename(path)}")
+    finally:
+        cursor.close()
+    return applied
+
+def verify_indexes(connection):
+    """EXPLAIN each representative query and report the index MySQL picks.
+
+    Returns a list of (name, expected_index, chosen_index, possible_keys).
+    On near-empty tables the optimizer may prefer a full scan, so check
+    possible_keys as well as the chosen key there; tests/test_index_usage.py
+    asserts the chosen keys against a seeded database.
+    """
+    cursor = connection.cursor(dictionary=True)
+    results = []
+    try:
+        for name, query, params, table, expected in INDEX_CHECKS:
+            cursor.execute(f"EXPLAIN {query}", params)
+            plan = [row for row in cursor.fetchall() if row.get('table') == table]
+            key = plan[0].get('key') if plan else None
+            possible = plan[0].get('possible_keys') if plan else None
+            results.append((name, expected, key, possible))
+    finally:
+        cursor.close()
+    return results
+
+def run_migrations():
+    connection = None
+
+    try:
+        connection = mysql.connector.connect(
+            host="localhost",
+            user="root",
+            password="Root@123",
+            database="serenity_hospital_db"
+        )
+
+        applied = apply_migrations(connection)
+        if not applied:
+            print("Database schema is up to date")
+
+        for name, expected, key, possible in verify_indexes(connection):
+            status = "OK" if key == expected else "CHECK"
+            print(f"[{status}] {name}: uses {key or 'no index'} "
+                  f"(expected {expected}; candidates {possible or 'none'})")
+
+    except Error as e:
+        print(f"Error: {e}")
+
+    finally:
+        if connection and connection.is_connected():
+            connection.close()
+            print("Connection closed")
+
+if __name__ == "__main__":
+    run_migrations()
@@ -0,0 +1,22 @@
+-- Composite indexes for the date-range filters used by the services.
+-- Each index leads with the equality column and ends with the date so a
+-- half-open range (>= start AND < end) can be resolved from the index.
+
+-- Doctor schedule: WHERE doctor_id = ? AND appointment_date in [start, end)
+CREATE INDEX idx_appointments_doctor_date ON appointments (doctor_id, appointment_date);
+
+-- Patient history: WHERE patient_id = ? ORDER BY appointment_date
+CREATE INDEX idx_appointments_patient_date ON appointments (patient_id, appointment_date);
+
+-- Status filter on the appointment list
+CREATE INDEX idx_appointments_status_date ON appointments (status, appointment_date);
+
+-- Unfiltered date range and keyset pages ordered by (appointment_date, appointment_id)
+CREATE INDEX idx_appointments_date ON appointments (appointment_date, appointment_id);
+
+-- Medical records per patient / per doctor, newest visit first
+CREATE INDEX idx_medical_records_patient_visit ON medical_records (patient_id, visit_date);
+CREATE INDEX idx_medical_records_doctor_visit ON medical_records (doctor_id, visit_date);
+
+-- Keyset pages ordered by (visit_date, record_id)
+CREATE INDEX idx_medical_records_visit ON medical_records (visit_date, record_id);
@@ -0,0 +1,16 @@
+-- FULLTEXT indexes backing services/search.py. A MATCH() column list must
+-- equal an index's column list exactly, hence the separate name-only index
+-- on patients used when joining appointments and records.
+
+-- Patient search box: name, phone and email
+ALTER TABLE patients ADD FULLTEXT INDEX ft_patients_search (name, contact_number, email);
+
+-- Patient name filter on appointments and medical records
+ALTER TABLE patients ADD FULLTEXT INDEX ft_patients_name (name);
+
+-- Doctor name (held on staff) and specialization
+ALTER TABLE staff ADD FULLTEXT INDEX ft_staff_name (name);
+ALTER TABLE doctors ADD FULLTEXT INDEX ft_doctors_specialization (specialization);
+
+-- Free-text search over clinical notes
+ALTER TABLE medical_records ADD FULLTEXT INDEX ft_medical_records_text (diagnosis, notes);
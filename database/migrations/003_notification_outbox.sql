@@ -0,0 +1,16 @@
+-- Durable notification outbox. Rows are written in the same transaction as
+-- the appointment change and delivered by services/notification_outbox.py.
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    event_type VARCHAR(50) NOT NULL,
+    channel VARCHAR(20) NOT NULL,
+    payload TEXT NOT NULL,
+    status VARCHAR(10) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'sent', 'failed')),
+    attempts INT NOT NULL DEFAULT 0,
+    lease_owner VARCHAR(100),
+    lease_until DATETIME,
+    last_error TEXT,
+    created_at DATETIME NOT NULL,
+    sent_at DATETIME,
+    INDEX idx_notification_outbox_due (status, lease_until, id)
+);
@@ -0,0 +1,5 @@
+-- Cost columns read by services/organization_service.py for org-wide
+-- cost/headcount reports. Branch lookups on departments and resources use
+-- the indexes InnoDB already keeps for their branch_id foreign keys.
+ALTER TABLE staff ADD COLUMN salary DECIMAL(12,2) NOT NULL DEFAULT 0;
+ALTER TABLE resources ADD COLUMN cost DECIMAL(12,2) NOT NULL DEFAULT 0;
@@ -0,0 +1,6 @@
+-- Links a login to the patient or doctor it belongs to. auth/row_scope.py
+-- turns it into the patient_id/doctor_id predicates that limit what
+-- patients and doctors can read. Scoped accounts left NULL see no rows
+-- until linked, e.g.:
+--   UPDATE rbac_auth SET reference_id = 'PAT0001' WHERE username = '1.1.1.1';
+ALTER TABLE rbac_auth ADD COLUMN reference_id VARCHAR(10) NULL;
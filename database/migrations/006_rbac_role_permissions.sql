@@ -0,0 +1,23 @@
+-- Role definitions read by auth/role_store.py and compiled into permission
+-- bitmasks. Editing these rows takes effect in running applications at the
+-- next reload (RBAC_CONFIG['reload_interval']). The table is authoritative
+-- for Patient and Doctor: deleting a role's last row leaves it with no
+-- permissions. Admin is left out so it keeps the defaults in auth/rbac.py
+-- and always holds every permission.
+CREATE TABLE IF NOT EXISTS rbac_role_permissions (
+    role VARCHAR(20) NOT NULL,
+    permission VARCHAR(50) NOT NULL,
+    PRIMARY KEY (role, permission)
+);
+
+INSERT INTO rbac_role_permissions (role, permission) VALUES
+('Patient', 'view_appointments'),
+('Patient', 'create_appointment'),
+('Patient', 'cancel_appointment'),
+('Patient', 'reschedule_appointment'),
+('Patient', 'view_medical_records'),
+('Doctor', 'view_appointments'),
+('Doctor', 'view_medical_records'),
+('Doctor', 'create_medical_record'),
+('Doctor', 'update_medical_record'),
+('Doctor', 'view_patients');
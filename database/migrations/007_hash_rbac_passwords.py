@@ -0,0 +1,23 @@
+"""Replace the plaintext rbac_auth passwords with bcrypt hashes.
+
+Widens the column to fit a hash (60 characters) and hashes every row
+that isn't one yet, at AUTH_CONFIG['bcrypt_rounds'].
+"""
+from hospital_management_system.auth.credentials import hash_password, is_hashed
+
+def migrate(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("ALTER TABLE rbac_auth MODIFY password VARCHAR(60) NOT NULL")
+        cursor.execute("SELECT username, password FROM rbac_auth")
+        updates = [
+            (hash_password(password), username)
+            for username, password in cursor.fetchall()
+            if not is_hashed(password)
+        ]
+        if updates:
+            cursor.executemany("UPDATE rbac_auth SET password = %s WHERE username = %s",
+                               updates)
+        print(f"Hashed {len(updates)} rbac_auth password(s)")
+    finally:
+        cursor.close()
@@ -0,0 +1,17 @@
+-- The address each outbox row goes to (email address or phone number), so
+-- OutboxDrainer can claim all of a recipient's pending rows together and
+-- CoalescingNotifier merges them into one digest. Rows without an address
+-- keep ''.
+ALTER TABLE notification_outbox ADD COLUMN recipient VARCHAR(255) NOT NULL DEFAULT '' AFTER channel;
+
+UPDATE notification_outbox
+SET recipient = COALESCE(NULLIF(JSON_UNQUOTE(JSON_EXTRACT(payload, '$.email')), 'null'), '')
+WHERE channel = 'email' AND status = 'pending';
+
+UPDATE notification_outbox
+SET recipient = COALESCE(NULLIF(JSON_UNQUOTE(JSON_EXTRACT(payload, '$.phone')), 'null'), '')
+WHERE channel = 'sms' AND status = 'pending';
+
+-- Finding recipients whose oldest pending row has waited out the window
+CREATE INDEX idx_notification_outbox_recipient
+    ON notification_outbox (status, channel, recipient, created_at);
@@ -2,11 +2,22 @@
 CREATE DATABASE IF NOT EXISTS serenity_hospital_db;
 USE serenity_hospital_db;
 
+-- Create branches table
+CREATE TABLE IF NOT EXISTS branches (
+    branch_id INT PRIMARY KEY AUTO_INCREMENT,
+    name VARCHAR(100) NOT NULL,
+    location VARCHAR(100) NOT NULL,
+    contact_number VARCHAR(20),
+    email VARCHAR(100)
+);
+
 -- Create departments table
 CREATE TABLE IF NOT EXISTS departments (
     department_id INT PRIMARY KEY AUTO_INCREMENT,
+    branch_id INT,
     name VARCHAR(100) NOT NULL,
-    description TEXT
+    description TEXT,
+    FOREIGN KEY (branch_id) REFERENCES branches(branch_id)
 );
 
 -- Create staff table
@@ -82,6 +93,40 @@ CREATE TABLE IF NOT EXISTS test_results (
     FOREIGN KEY (record_id) REFERENCES medical_records(record_id)
 );
 
+-- Create resources table
+CREATE TABLE IF NOT EXISTS resources (
+    resource_id VARCHAR(10) PRIMARY KEY,
+    branch_id INT,
+    type VARCHAR(50),
+    name VARCHAR(100),
+    status VARCHAR(20),
+    last_maintenance DATE,
+    FOREIGN KEY (branch_id) REFERENCES branches(branch_id)
+);
+
+-- Create ID sequence table used by the block ID allocator
+-- (rows are seeded from existing IDs on first use of each prefix)
+CREATE TABLE IF NOT EXISTS id_sequences (
+    prefix VARCHAR(10) PRIMARY KEY,
+    next_value BIGINT NOT NULL
+);
+
+-- Create notification outbox drained by services/notification_outbox.py
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    event_type VARCHAR(50) NOT NULL,
+    channel VARCHAR(20) NOT NULL,
+    payload TEXT NOT NULL,
+    status VARCHAR(10) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'sent', 'failed')),
+    attempts INT NOT NULL DEFAULT 0,
+    lease_owner VARCHAR(100),
+    lease_until DATETIME,
+    last_error TEXT,
+    created_at DATETIME NOT NULL,
+    sent_at DATETIME,
+    INDEX idx_notification_outbox_due (status, lease_until, id)
+);
+
 -- Create RBAC authentication table
 CREATE TABLE IF NOT EXISTS rbac_auth (
     username VARCHAR(50) PRIMARY KEY,
@@ -2,6 +2,11 @@ import mysql.connector
 from mysql.connector import Error
 import os
 
+try:
+    from .migrate import apply_migrations
+except ImportError:  # run as a script from the database directory
+    from migrate import apply_migrations
+
 def setup_database():
     connection = None
     cursor = None
@@ -34,6 +39,9 @@ def setup_database():
                         print(f"Error executing command: {e}")
             
             connection.commit()
+
+            # Bring the fresh schema up to the latest migration
+            apply_migrations(connection)
             print("Database setup completed successfully")
             
     except Error as e:
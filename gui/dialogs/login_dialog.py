@@ -1,15 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import mysql.connector
-from ...config import DB_CONFIG
-from ...auth.rbac import AuthenticationManager, UserRole
+from ...auth.credentials import Authenticator
+from ...auth.rbac import AuthenticationManager
 
 class LoginDialog:
     def __init__(self, parent):
         self.parent = parent
         self.result = False
-        # Database connection
-        self.db = mysql.connector.connect(**DB_CONFIG)
+        self.session = None
         
         # Create dialog window
         self.dialog = tk.Toplevel(parent)
@@ -74,11 +73,12 @@ class LoginDialog:
         btn_frame = ttk.Frame(main_frame)
         btn_frame.pack(fill="x", pady=(20, 0))
         
-        ttk.Button(
+        self.login_button = ttk.Button(
             btn_frame,
             text="Login",
             command=self.on_login
-        ).pack(side="right", padx=5)
+        )
+        self.login_button.pack(side="right", padx=5)
         
         ttk.Button(
             btn_frame,
@@ -117,40 +117,47 @@ class LoginDialog:
     def on_login(self):
         username = self.username_var.get()
         password = self.password_var.get()
-        
+
+        # bcrypt takes a noticeable moment; verify off the Tk thread and poll
+        self.login_button.state(["disabled"])
+        self.dialog.config(cursor="watch")
+        future = Authenticator().authenticate_async(username, password)
+        self.dialog.after(50, self._check_login, future)
+
+    def _check_login(self, future):
+        if not future.done():
+            self.dialog.after(50, self._check_login, future)
+            return
+
+        self.login_button.state(["!disabled"])
+        self.dialog.config(cursor="")
         try:
-            cursor = self.db.cursor()
-            cursor.execute(
-                "SELECT role FROM rbac_auth WHERE username = %s AND password = %s",
-                (username, password)
-            )
-            result = cursor.fetchone()
-            
-            if result:
-                role = result[0]
-                auth_manager = AuthenticationManager()
-                user_role = UserRole(role)
-                auth_manager.set_current_user(username, user_role)
-                self.result = True
-                self.dialog.destroy()
-            else:
-                messagebox.showerror(
-                    "Login Failed",
-                    "Invalid username or password"
-                )
-            cursor.close()
+            session = future.result()
         except mysql.connector.Error as err:
             messagebox.showerror(
                 "Database Error",
                 f"Could not authenticate: {err}"
             )
+            return
+        except ValueError as err:
+            # rbac_auth holds a role this version does not know
+            messagebox.showerror(
+                "Login Failed",
+                f"Account is misconfigured: {err}"
+            )
+            return
+
+        if session:
+            AuthenticationManager().current_user = session.user
+            self.session = session
+            self.result = True
+            self.dialog.destroy()
+        else:
+            messagebox.showerror(
+                "Login Failed",
+                "Invalid username or password"
+            )
     
     def on_cancel(self):
         self.result = False
-        if hasattr(self, 'db') and self.db.is_connected():
-            self.db.close()
         self.dialog.destroy()
-        
-    def __del__(self):
-        if hasattr(self, 'db') and self.db.is_connected():
-            self.db.close()
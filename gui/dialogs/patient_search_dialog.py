@@ -76,8 +76,8 @@ class PatientSearchDialog:
         for item in self.table.get_children():
             self.table.delete(item)
             
-        # Get patients from service
-        patients = self.patient_service.search_patients(search_term) if search_term else self.patient_service.get_all_patients()
+        # Get patients from the in-memory index (falls back to the DB while it builds)
+        patients = self.patient_service.quick_search(search_term or "")
         
         # Add to table
         for patient in patients:
@@ -88,6 +88,15 @@ class AppointmentListFrame(BaseFrame):
         # Bind double click event
         self.table.bind("<Double-1>", self.on_appointment_select)
 
+        # Further pages are fetched on demand
+        self.next_cursor = None
+        self.load_more_btn = ttk.Button(
+            content,
+            text="Load More",
+            command=self.load_more_appointments
+        )
+        self.load_more_btn.pack(pady=(10, 0))
+
         # Add right-click menu
         self.create_context_menu()
 
@@ -120,9 +129,24 @@ class AppointmentListFrame(BaseFrame):
         # Get date range based on filter
         start_date, end_date = self.get_date_range()
 
-        # Get appointments based on filters
-        appointments = self.filter_appointments(start_date, end_date)
+        # Get the first page of appointments based on filters
+        page = self.filter_appointments(start_date, end_date)
+        self.insert_appointments(page.items)
+        self.set_next_cursor(page.next_cursor)
+
+    def load_more_appointments(self):
+        if not self.next_cursor:
+            return
+        start_date, end_date = self.get_date_range()
+        page = self.filter_appointments(start_date, end_date, self.next_cursor)
+        self.insert_appointments(page.items)
+        self.set_next_cursor(page.next_cursor)
+
+    def set_next_cursor(self, cursor):
+        self.next_cursor = cursor
+        self.load_more_btn.configure(state="normal" if cursor else "disabled")
 
+    def insert_appointments(self, appointments):
         for apt in appointments:
             self.table.insert(
                 "",
@@ -161,14 +185,14 @@ class AppointmentListFrame(BaseFrame):
         else:  # All
             return None, None
 
-    def filter_appointments(self, start_date, end_date):
-        appointments = self.appointment_service.get_appointments(
+    def filter_appointments(self, start_date, end_date, cursor=None):
+        return self.appointment_service.get_appointments_page(
             start_date=start_date,
             end_date=end_date,
             status=None if self.status_var.get() == "All" else self.status_var.get(),
-            search_term=self.search_var.get().strip()
+            search_term=self.search_var.get().strip(),
+            cursor=cursor
         )
-        return appointments
 
     def on_filter_change(self, event=None):
         self.load_appointments()
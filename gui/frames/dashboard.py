@@ -92,12 +92,10 @@ class DashboardFrame(BaseFrame):
 
     def update_statistics(self):
         # Update patient count
-        patients = self.patient_service.get_all_patients()
-        self.patient_count_label["text"] = str(len(patients))
+        self.patient_count_label["text"] = str(self.patient_service.count_patients())
 
         # Update doctor count
-        doctors = self.doctor_service.get_all_doctors()
-        self.doctor_count_label["text"] = str(len(doctors))
+        self.doctor_count_label["text"] = str(self.doctor_service.count_doctors())
 
         # Update today's appointments
         today = datetime.now().date()
@@ -82,6 +82,15 @@ class MedicalRecordListFrame(BaseFrame):
         # Bind double click event
         self.table.bind("<Double-1>", self.on_record_select)
 
+        # Further pages are fetched on demand
+        self.next_cursor = None
+        self.load_more_btn = ttk.Button(
+            content,
+            text="Load More",
+            command=self.load_more_records
+        )
+        self.load_more_btn.pack(pady=(10, 0))
+
         # Add right-click menu
         self.create_context_menu()
 
@@ -109,9 +118,23 @@ class MedicalRecordListFrame(BaseFrame):
         # Clear existing items
         self.table.delete(*self.table.get_children())
 
-        # Get medical records based on filters
-        records = self.filter_records()
+        # Get the first page of medical records based on filters
+        page = self.filter_records()
+        self.insert_records(page.items)
+        self.set_next_cursor(page.next_cursor)
+
+    def load_more_records(self):
+        if not self.next_cursor:
+            return
+        page = self.filter_records(self.next_cursor)
+        self.insert_records(page.items)
+        self.set_next_cursor(page.next_cursor)
+
+    def set_next_cursor(self, cursor):
+        self.next_cursor = cursor
+        self.load_more_btn.configure(state="normal" if cursor else "disabled")
 
+    def insert_records(self, records):
         for record in records:
             self.table.insert(
                 "",
@@ -127,7 +150,7 @@ class MedicalRecordListFrame(BaseFrame):
                 )
             )
 
-    def filter_records(self):
+    def filter_records(self, cursor=None):
         patient_search = self.patient_search_var.get().strip()
         doctor_search = self.doctor_search_var.get().strip()
         date_range = self.date_var.get()
@@ -135,11 +158,12 @@ class MedicalRecordListFrame(BaseFrame):
         # Get date range based on filter
         start_date, end_date = self.get_date_range(date_range)
 
-        return self.medical_record_service.search_records(
+        return self.medical_record_service.search_records_page(
             patient_search=patient_search,
             doctor_search=doctor_search,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            cursor=cursor
         )
 
     def get_date_range(self, date_range):
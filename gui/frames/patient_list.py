@@ -61,16 +61,40 @@ class PatientListFrame(BaseFrame):
         # Bind double click event
         self.table.bind("<Double-1>", self.on_patient_select)
 
+        # Further pages are fetched on demand
+        self.next_cursor = None
+        self.load_more_btn = ttk.Button(
+            content,
+            text="Load More",
+            command=self.load_more_patients
+        )
+        self.load_more_btn.pack(pady=(10, 0))
+
     def on_show(self):
+        self.patient_service.build_search_index()
         self.load_patients()
 
     def load_patients(self):
         # Clear existing items
         self.table.delete(*self.table.get_children())
 
-        # Get all patients
-        patients = self.patient_service.get_all_patients()
-        
+        # Get the first page of patients
+        page = self.patient_service.get_patients_page()
+        self.insert_patients(page.items)
+        self.set_next_cursor(page.next_cursor)
+
+    def load_more_patients(self):
+        if not self.next_cursor:
+            return
+        page = self.patient_service.get_patients_page(cursor=self.next_cursor)
+        self.insert_patients(page.items)
+        self.set_next_cursor(page.next_cursor)
+
+    def set_next_cursor(self, cursor):
+        self.next_cursor = cursor
+        self.load_more_btn.configure(state="normal" if cursor else "disabled")
+
+    def insert_patients(self, patients):
         for patient in patients:
             age = self.calculate_age(patient.date_of_birth)
             self.table.insert(
@@ -89,28 +113,16 @@ class PatientListFrame(BaseFrame):
 
     def on_search_change(self, *args):
         search_term = self.search_var.get().strip()
-        if search_term:
-            patients = self.patient_service.search_patients(search_term)
-        else:
-            patients = self.patient_service.get_all_patients()
+        if not search_term:
+            self.load_patients()
+            return
+
+        patients = self.patient_service.quick_search(search_term, limit=100)
 
         # Clear and reload table
         self.table.delete(*self.table.get_children())
-        for patient in patients:
-            age = self.calculate_age(patient.date_of_birth)
-            self.table.insert(
-                "",
-                "end",
-                values=(
-                    patient.patient_id,
-                    patient.name,
-                    age,
-                    patient.gender,
-                    patient.contact_number,
-                    patient.email,
-                    patient.blood_group
-                )
-            )
+        self.insert_patients(patients)
+        self.set_next_cursor(None)
 
     def add_patient(self):
         self.controller.show_frame("PatientDetails")
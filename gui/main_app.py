@@ -5,6 +5,9 @@ import tkinter.font as tkfont
 from hospital_management_system.gui.frames import *
 from hospital_management_system.gui.dialogs.login_dialog import LoginDialog
 from hospital_management_system.auth.rbac import AuthenticationManager, UserRole, Permission
+from hospital_management_system.services.notification_outbox import OutboxDrainer
+from hospital_management_system.auth.role_store import RoleDefinitionLoader
+from hospital_management_system.auth.credentials import Authenticator
 
 class MainApplication(tk.Tk):
     def __init__(self):
@@ -18,12 +21,22 @@ class MainApplication(tk.Tk):
         
         # Initialize authentication
         self.auth_manager = AuthenticationManager()
+        self.session = None
         
         # Show login dialog
         if not self.show_login():
             self.destroy()
             return
-            
+
+        # Deliver queued email/SMS notifications in the background
+        OutboxDrainer().start()
+        # Pick up role permission changes made in the database
+        RoleDefinitionLoader().start()
+
+        self._build_ui()
+
+    def _build_ui(self):
+        """Create the header and frames for the logged-in user's role"""
         # Configure grid
         self.grid_rowconfigure(1, weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -120,6 +133,7 @@ class MainApplication(tk.Tk):
     def show_login(self) -> bool:
         """Show login dialog and return True if login successful"""
         dialog = LoginDialog(self)
+        self.session = dialog.session
         return dialog.result
     
     def show_default_frame(self):
@@ -135,6 +149,7 @@ class MainApplication(tk.Tk):
     def _create_header(self):
         header_frame = ttk.Frame(self)
         header_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=5)
+        self.header_frame = header_frame
         
         # Hospital name
         title = ttk.Label(
@@ -198,11 +213,18 @@ class MainApplication(tk.Tk):
             ]
     
     def logout(self):
-        """Logout the current user"""
+        """Logout the current user and log in again in the same window"""
+        if self.session:
+            Authenticator().revoke(self.session.token)
         self.auth_manager.logout()
-        self.destroy()
-        new_app = MainApplication()
-        new_app.mainloop()
+
+        # Navigation and frames depend on the role, so rebuild them for the next user
+        self.header_frame.destroy()
+        self.main_container.destroy()
+        if not self.show_login():
+            self.destroy()
+            return
+        self._build_ui()
 
 if __name__ == "__main__":
     app = MainApplication()
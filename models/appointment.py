@@ -22,7 +22,7 @@ class Appointment:
 
     @staticmethod
     def from_db_dict(data: Dict) -> 'Appointment':
-        return Appointment(
+        appointment = Appointment(
             appointment_id=data['appointment_id'],
             patient_id=data['patient_id'],
             doctor_id=data['doctor_id'],
@@ -31,6 +31,10 @@ class Appointment:
             status=data['status'],
             notes=data.get('notes')
         )
+        # Display names are present when the query joins patients/staff
+        appointment.patient_name = data.get('patient_name')
+        appointment.doctor_name = data.get('doctor_name')
+        return appointment
 
     def to_dict(self) -> Dict:
         return {
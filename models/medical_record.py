@@ -25,7 +25,7 @@ class MedicalRecord:
     @staticmethod
     def from_db_dict(data: Dict) -> 'MedicalRecord':
         prescriptions = eval(data['prescription']) if data['prescription'] else []
-        return MedicalRecord(
+        record = MedicalRecord(
             record_id=data['record_id'],
             patient_id=data['patient_id'],
             doctor_id=data['doctor_id'],
@@ -34,6 +34,10 @@ class MedicalRecord:
             prescriptions=prescriptions,
             notes=data.get('notes')
         )
+        # Display names are present when the query joins patients/staff
+        record.patient_name = data.get('patient_name')
+        record.doctor_name = data.get('doctor_name')
+        return record
 
     def to_dict(self) -> Dict:
         return {
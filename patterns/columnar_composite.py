@@ -0,0 +1,183 @@
+from typing import Dict, List, Optional, Tuple
+from .composite import (
+    HospitalComponent, HospitalComposite, Hospital, Department, Staff, Resource
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, only needed for columnar rollups
+    np = None
+
+# Node types, in the order of their codes in the ``node_type`` array
+NODE_TYPES = (HospitalComposite, Hospital, Department, Staff, Resource)
+_TYPE_CODES = {cls: code for code, cls in enumerate(NODE_TYPES)}
+STAFF = _TYPE_CODES[Staff]
+DEPARTMENT = _TYPE_CODES[Department]
+
+class ColumnarOrganization:
+    """Array-backed copy of a HospitalComponent tree for fast rollups.
+
+    Nodes are stored in pre-order, so every parent precedes its children and
+    the subtree of node ``i`` is the slice ``[i, i + size[i])``. Per-node data
+    lives in parallel arrays (``parent``, ``node_type``, ``cost``, ``role``);
+    subtree sizes come from one ``bincount`` per depth level, deepest first,
+    and every subtree total is then a difference of two cumulative sums.
+    Names and other display fields stay in plain lists for ``to_tree``.
+    """
+
+    def __init__(self, parent, node_type, cost, role, role_names: List[str],
+                 ids: List[str], names: List[str], details: List[Optional[str]]):
+        if np is None:
+            raise ImportError("ColumnarOrganization requires numpy (pip install numpy)")
+        self.parent = np.asarray(parent, dtype=np.int64)
+        self.node_type = np.asarray(node_type, dtype=np.int8)
+        self.cost = np.asarray(cost, dtype=np.float64)
+        self.role = np.asarray(role, dtype=np.int32)
+        self.role_names = role_names
+        self.ids = ids
+        self.names = names
+        self.details = details  # location, specialization or resource type
+        self._index: Optional[Dict[str, int]] = None
+        self._totals: Optional[Tuple] = None
+        self.size = self._subtree_sizes()
+
+    @classmethod
+    def from_tree(cls, root: HospitalComponent) -> 'ColumnarOrganization':
+        parent: List[int] = []
+        node_type: List[int] = []
+        cost: List[float] = []
+        role: List[int] = []
+        ids: List[str] = []
+        names: List[str] = []
+        details: List[Optional[str]] = []
+        role_codes: Dict[str, int] = {}
+
+        stack = [(root, -1)]
+        while stack:
+            node, parent_index = stack.pop()
+            index = len(ids)
+            parent.append(parent_index)
+            node_type.append(_TYPE_CODES[type(node)])
+            ids.append(node.id)
+            names.append(node.name)
+            if isinstance(node, HospitalComposite):
+                cost.append(0.0)
+                role.append(-1)
+                details.append(getattr(node, 'location', None)
+                               or getattr(node, 'specialization', None))
+                # Reversed so children pop off the stack in their original order
+                stack.extend((child, index) for child in reversed(node.get_children()))
+            elif isinstance(node, Staff):
+                cost.append(node.salary)
+                role.append(role_codes.setdefault(node.role, len(role_codes)))
+                details.append(node.specialization)
+            else:
+                cost.append(node.cost)
+                role.append(-1)
+                details.append(node.type)
+
+        return cls(parent, node_type, cost, role, list(role_codes), ids, names, details)
+
+    def to_tree(self) -> HospitalComponent:
+        nodes: List[HospitalComponent] = []
+        for i in range(len(self.ids)):
+            cls = NODE_TYPES[self.node_type[i]]
+            if cls is Hospital:
+                node = Hospital(self.ids[i], self.names[i], self.details[i])
+            elif cls is Department:
+                node = Department(self.ids[i], self.names[i], self.details[i])
+            elif cls is Staff:
+                node = Staff(self.ids[i], self.names[i], float(self.cost[i]),
+                             self.role_names[self.role[i]], self.details[i])
+            elif cls is Resource:
+                node = Resource(self.ids[i], self.names[i], float(self.cost[i]), self.details[i])
+            else:
+                node = HospitalComposite(self.ids[i], self.names[i])
+            nodes.append(node)
+            if self.parent[i] >= 0:
+                nodes[self.parent[i]].add(node)
+        return nodes[0]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _depths(self):
+        """Depth of every node, found one level at a time from the root"""
+        depth = np.full(len(self.parent), -1, dtype=np.int64)
+        frontier = np.flatnonzero(self.parent < 0)
+        level = 0
+        while frontier.size:
+            depth[frontier] = level
+            frontier = np.flatnonzero(np.isin(self.parent, frontier))
+            level += 1
+        return depth
+
+    def _subtree_sizes(self):
+        """Nodes per subtree: each level adds its sizes to its parents, deepest first"""
+        n = len(self.parent)
+        size = np.ones(n, dtype=np.int64)
+        if not n:
+            return size
+        depth = self._depths()
+        for level in range(int(depth.max()), 0, -1):
+            members = np.flatnonzero(depth == level)
+            size += np.bincount(self.parent[members], weights=size[members],
+                                minlength=n).astype(np.int64)
+        return size
+
+    def _subtree_sum(self, values):
+        running = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+        end = np.arange(len(values)) + self.size
+        return running[end] - running[:-1]
+
+    def _rollups(self):
+        if self._totals is None:
+            is_staff = (self.node_type == STAFF).astype(np.float64)
+            self._totals = (self._subtree_sum(self.cost),
+                            np.rint(self._subtree_sum(is_staff)).astype(np.int64))
+        return self._totals
+
+    def index_of(self, node_id: str) -> int:
+        if self._index is None:
+            index = {node_id: i for i, node_id in enumerate(self.ids)}
+            if len(index) != len(self.ids):
+                raise ValueError("Node IDs must be unique to look nodes up by ID")
+            self._index = index
+        return self._index[node_id]
+
+    def set_cost(self, node_id: str, value: float):
+        """Change a staff salary or resource cost; totals are recomputed lazily"""
+        self.cost[self.index_of(node_id)] = value
+        self._totals = None
+
+    def get_cost(self, node_id: Optional[str] = None) -> float:
+        index = 0 if node_id is None else self.index_of(node_id)
+        return float(self._rollups()[0][index])
+
+    def get_staff_count(self, node_id: Optional[str] = None) -> int:
+        index = 0 if node_id is None else self.index_of(node_id)
+        return int(self._rollups()[1][index])
+
+    def get_role_costs(self, node_id: Optional[str] = None) -> Dict[str, float]:
+        """Staff cost per role within a subtree"""
+        start = 0 if node_id is None else self.index_of(node_id)
+        end = start + int(self.size[start])
+        staff = self.node_type[start:end] == STAFF
+        totals = np.bincount(self.role[start:end][staff], weights=self.cost[start:end][staff],
+                             minlength=len(self.role_names))
+        return {name: float(total) for name, total in zip(self.role_names, totals)}
+
+    def get_department_breakdown(self) -> List[Dict]:
+        """Cost and headcount of every department with its branch"""
+        costs, staff_counts = self._rollups()
+        result = []
+        for index in np.flatnonzero(self.node_type == DEPARTMENT):
+            branch = self.parent[index]
+            result.append({
+                'department_id': self.ids[index],
+                'name': self.names[index],
+                'branch_id': self.ids[branch] if branch >= 0 else None,
+                'total_cost': float(costs[index]),
+                'total_staff': int(staff_counts[index])
+            })
+        return result
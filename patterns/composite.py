@@ -5,6 +5,12 @@ class HospitalComponent(ABC):
     def __init__(self, id: str, name: str):
         self.id = id
         self.name = name
+        self.parent: Optional['HospitalComposite'] = None
+
+    def _invalidate(self):
+        """Mark cached totals stale on every ancestor"""
+        if self.parent is not None:
+            self.parent._invalidate()
 
     @abstractmethod
     def get_cost(self) -> float:
@@ -15,38 +21,86 @@ class HospitalComponent(ABC):
         pass
 
     @abstractmethod
-    def generate_report(self) -> dict:
+    def report_fields(self) -> dict:
+        """This node's report entry, without its children"""
         pass
 
+    def generate_report(self) -> dict:
+        return self.report_fields()
+
 class HospitalComposite(HospitalComponent):
+    """Component with children whose cost and staff totals are cached.
+
+    Totals are computed on first use and kept until something below changes:
+    adding or removing a child, or a Staff salary or Resource cost update,
+    clears the cache on the way up through ``parent`` links. A clean node
+    never has a stale descendant, so invalidation stops at the first
+    ancestor that is already dirty.
+    """
+
     def __init__(self, id: str, name: str):
         super().__init__(id, name)
         self._children: List[HospitalComponent] = []
+        self._cost: Optional[float] = None
+        self._staff_count: Optional[int] = None
+
+    def _invalidate(self):
+        node = self
+        while node is not None and (node._cost is not None or node._staff_count is not None):
+            node._cost = None
+            node._staff_count = None
+            node = node.parent
 
     def add(self, component: HospitalComponent):
+        if component.parent is not None:
+            component.parent.remove(component)
         self._children.append(component)
+        component.parent = self
+        self._invalidate()
 
     def remove(self, component: HospitalComponent):
         self._children.remove(component)
+        component.parent = None
+        self._invalidate()
+
+    def replace(self, old: HospitalComponent, new: HospitalComponent):
+        """Put ``new`` in ``old``'s place, keeping the order of the children"""
+        index = self._children.index(old)
+        if new.parent is not None:
+            new.parent.remove(new)
+        self._children[index] = new
+        old.parent = None
+        new.parent = self
+        self._invalidate()
 
     def get_child(self, index: int) -> Optional[HospitalComponent]:
         return self._children[index] if 0 <= index < len(self._children) else None
 
+    def get_children(self) -> List[HospitalComponent]:
+        return list(self._children)
+
     def get_cost(self) -> float:
-        return sum(child.get_cost() for child in self._children)
+        if self._cost is None:
+            self._cost = sum(child.get_cost() for child in self._children)
+        return self._cost
 
     def get_staff_count(self) -> int:
-        return sum(child.get_staff_count() for child in self._children)
+        if self._staff_count is None:
+            self._staff_count = sum(child.get_staff_count() for child in self._children)
+        return self._staff_count
 
-    def generate_report(self) -> dict:
-        report = {
+    def report_fields(self) -> dict:
+        return {
             'id': self.id,
             'name': self.name,
             'type': self.__class__.__name__,
             'total_cost': self.get_cost(),
-            'total_staff': self.get_staff_count(),
-            'children': [child.generate_report() for child in self._children]
+            'total_staff': self.get_staff_count()
         }
+
+    def generate_report(self) -> dict:
+        report = self.report_fields()
+        report['children'] = [child.generate_report() for child in self._children]
         return report
 
 class Hospital(HospitalComposite):
@@ -54,8 +108,8 @@ class Hospital(HospitalComposite):
         super().__init__(id, name)
         self.location = location
 
-    def generate_report(self) -> dict:
-        report = super().generate_report()
+    def report_fields(self) -> dict:
+        report = super().report_fields()
         report['location'] = self.location
         return report
 
@@ -64,45 +118,68 @@ class Department(HospitalComposite):
         super().__init__(id, name)
         self.specialization = specialization
 
-    def generate_report(self) -> dict:
-        report = super().generate_report()
+    def report_fields(self) -> dict:
+        report = super().report_fields()
         report['specialization'] = self.specialization
         return report
 
 class Staff(HospitalComponent):
-    def __init__(self, id: str, name: str, salary: float, role: str):
+    def __init__(self, id: str, name: str, salary: float, role: str,
+                 specialization: Optional[str] = None):
         super().__init__(id, name)
-        self.salary = salary
+        self._salary = salary
         self.role = role
+        self.specialization = specialization  # set for doctors
+
+    @property
+    def salary(self) -> float:
+        return self._salary
+
+    @salary.setter
+    def salary(self, value: float):
+        self._salary = value
+        self._invalidate()
 
     def get_cost(self) -> float:
-        return self.salary
+        return self._salary
 
     def get_staff_count(self) -> int:
         return 1
 
-    def generate_report(self) -> dict:
-        return {
+    def report_fields(self) -> dict:
+        report = {
             'id': self.id,
             'name': self.name,
             'type': self.__class__.__name__,
             'role': self.role,
             'salary': self.salary
         }
+        if self.specialization:
+            report['specialization'] = self.specialization
+        return report
 
 class Resource(HospitalComponent):
     def __init__(self, id: str, name: str, cost: float, type: str):
         super().__init__(id, name)
-        self.cost = cost
+        self._cost = cost
         self.type = type
 
+    @property
+    def cost(self) -> float:
+        return self._cost
+
+    @cost.setter
+    def cost(self, value: float):
+        self._cost = value
+        self._invalidate()
+
     def get_cost(self) -> float:
-        return self.cost
+        return self._cost
 
     def get_staff_count(self) -> int:
         return 0
 
-    def generate_report(self) -> dict:
+    def report_fields(self) -> dict:
         return {
             'id': self.id,
             'name': self.name,
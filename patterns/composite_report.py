@@ -0,0 +1,130 @@
+"""Streaming reports for HospitalComponent trees.
+
+``HospitalComposite.generate_report`` builds the whole nested dict before
+anything can be written. The writers here walk the tree iteratively and
+write each node as soon as it is reached, using the cached subtree totals,
+so memory stays proportional to the tree's depth rather than its size:
+
+    with open('organisation.json', 'w') as out:
+        write_json(root, out, max_depth=2)
+    write_csv(root, connection, branch_ids=['BR1', 'BR3'])  # a connected socket
+
+``max_depth`` counts from the root (0 = the root only; nodes at the limit
+keep their totals but list no children). ``branch_ids`` keeps only the
+listed children of the root, whose totals then cover just those branches.
+"""
+import csv
+import json
+import socket
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, NamedTuple, Optional, Union
+from .composite import HospitalComponent, HospitalComposite
+
+CSV_COLUMNS = [
+    'depth', 'parent_id', 'id', 'name', 'type', 'total_cost', 'total_staff',
+    'location', 'specialization', 'role', 'salary', 'resource_type', 'cost'
+]
+
+Target = Union[str, IO[str], socket.socket]
+
+class ReportRow(NamedTuple):
+    depth: int
+    parent_id: Optional[str]
+    fields: dict
+    expanded: bool  # the node's children follow at depth + 1
+
+def walk_report(root: HospitalComponent, max_depth: Optional[int] = None,
+                branch_ids: Optional[Iterable[str]] = None) -> Iterator[ReportRow]:
+    """Report entries in pre-order, one node at a time"""
+    fields = root.report_fields()
+    is_composite = isinstance(root, HospitalComposite)
+    children = root.get_children() if is_composite else []
+    if branch_ids is not None and is_composite:
+        wanted = set(branch_ids)
+        children = [child for child in children if child.id in wanted]
+        fields['total_cost'] = sum(child.get_cost() for child in children)
+        fields['total_staff'] = sum(child.get_staff_count() for child in children)
+
+    expanded = is_composite and max_depth != 0
+    yield ReportRow(0, None, fields, expanded)
+    if not expanded:
+        return
+
+    stack = [(root.id, iter(children))]
+    while stack:
+        parent_id, pending = stack[-1]
+        child = next(pending, None)
+        if child is None:
+            stack.pop()
+            continue
+        depth = len(stack)
+        expand = isinstance(child, HospitalComposite) and (max_depth is None or depth < max_depth)
+        yield ReportRow(depth, parent_id, child.report_fields(), expand)
+        if expand:
+            stack.append((child.id, iter(child.get_children())))
+
+def iter_json(root: HospitalComponent, max_depth: Optional[int] = None,
+              branch_ids: Optional[Iterable[str]] = None) -> Iterator[str]:
+    """The report as JSON text chunks, in the shape of generate_report()"""
+    open_levels = 0
+    needs_comma = False
+    for row in walk_report(root, max_depth, branch_ids):
+        while open_levels > row.depth:
+            yield ']}'
+            open_levels -= 1
+            needs_comma = True
+        if needs_comma:
+            yield ', '
+        entry = json.dumps(row.fields, default=str)
+        if row.expanded:
+            yield entry[:-1] + ', "children": ['
+            open_levels += 1
+            needs_comma = False
+        else:
+            yield entry
+            needs_comma = True
+    yield ']}' * open_levels
+
+@contextmanager
+def _writer(target: Target):
+    """A text stream for a path, a socket or an already open file"""
+    if isinstance(target, str):
+        with open(target, 'w', encoding='utf-8', newline='') as file:
+            yield file
+    elif isinstance(target, socket.socket):
+        with target.makefile('w', encoding='utf-8', newline='') as file:
+            yield file
+    else:
+        yield target
+        target.flush()
+
+def write_json(root: HospitalComponent, target: Target, max_depth: Optional[int] = None,
+               branch_ids: Optional[Iterable[str]] = None, chunk_size: int = 64 * 1024) -> int:
+    """Stream the JSON report to ``target``; returns the characters written"""
+    written = 0
+    with _writer(target) as out:
+        buffer = []
+        buffered = 0
+        for chunk in iter_json(root, max_depth, branch_ids):
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= chunk_size:
+                out.write(''.join(buffer))
+                written += buffered
+                buffer.clear()
+                buffered = 0
+        out.write(''.join(buffer))
+    return written + buffered
+
+def write_csv(root: HospitalComponent, target: Target, max_depth: Optional[int] = None,
+              branch_ids: Optional[Iterable[str]] = None) -> int:
+    """Stream one CSV row per node to ``target``; returns the rows written"""
+    rows = 0
+    with _writer(target) as out:
+        writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS, restval='', extrasaction='ignore')
+        writer.writeheader()
+        for row in walk_report(root, max_depth, branch_ids):
+            fields = dict(row.fields, depth=row.depth, parent_id=row.parent_id or '')
+            writer.writerow(fields)
+            rows += 1
+    return rows
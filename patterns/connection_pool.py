@@ -0,0 +1,192 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Optional
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+class PooledConnection:
+    """A pooled mysql.connector connection plus its usage statistics"""
+
+    def __init__(self, connection, connection_id: int):
+        self.connection = connection
+        self.connection_id = connection_id
+        self.created_at = time.time()
+        self.last_used = time.monotonic()
+        self.checkouts = 0
+        self.queries = 0
+        self.errors = 0
+        self.validations = 0
+        self.busy_time = 0.0
+        self._checked_out_at: Optional[float] = None
+        self.broken = False
+
+    def cursor(self, *args, **kwargs):
+        return self.connection.cursor(*args, **kwargs)
+
+    def get_stats(self) -> Dict:
+        return {
+            'connection_id': self.connection_id,
+            'created_at': self.created_at,
+            'idle_seconds': round(time.monotonic() - self.last_used, 3),
+            'in_use': self._checked_out_at is not None,
+            'checkouts': self.checkouts,
+            'queries': self.queries,
+            'errors': self.errors,
+            'validations': self.validations,
+            'busy_time': round(self.busy_time, 6)
+        }
+
+class ConnectionPool:
+    """Fixed-size, thread-safe pool of MySQL connections.
+
+    Connections are opened lazily up to ``pool_size`` and handed out with
+    checkout/return semantics. A connection is only pinged when it has been
+    idle for longer than ``validate_after`` seconds, so busy connections skip
+    the extra round trip.
+    """
+
+    def __init__(self,
+                 pool_size: int = 5,
+                 validate_after: float = 30.0,
+                 checkout_timeout: Optional[float] = 10.0,
+                 **connect_args):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.pool_size = pool_size
+        self.validate_after = validate_after
+        self.checkout_timeout = checkout_timeout
+        self._connect_args = connect_args
+        self._idle: Deque[PooledConnection] = deque()
+        self._all: List[PooledConnection] = []
+        self._lock = threading.Condition(threading.Lock())
+        self._next_id = 1
+        self._pending = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._discarded = 0
+
+    def _connect(self) -> PooledConnection:
+        connection = mysql.connector.connect(autocommit=True, **self._connect_args)
+        with self._lock:
+            connection_id = self._next_id
+            self._next_id += 1
+        return PooledConnection(connection, connection_id)
+
+    def _validate(self, pooled: PooledConnection) -> bool:
+        pooled.validations += 1
+        try:
+            return pooled.connection.is_connected()
+        except Error:
+            return False
+
+    def _discard(self, pooled: PooledConnection):
+        with self._lock:
+            if pooled in self._all:
+                self._all.remove(pooled)
+            self._discarded += 1
+            self._lock.notify()
+        try:
+            pooled.connection.close()
+        except Error:
+            pass
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Check out a connection, opening a new one if the pool has room"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            create = False
+            with self._lock:
+                while not self._idle and len(self._all) + self._pending >= self.pool_size:
+                    self._waits += 1
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolError("Timed out waiting for a database connection")
+                    self._lock.wait(remaining)
+
+                if self._idle:
+                    pooled = self._idle.pop()
+                else:
+                    # Reserve the slot before connecting outside the lock
+                    self._pending += 1
+                    create = True
+
+            if create:
+                try:
+                    pooled = self._connect()
+                except Error:
+                    with self._lock:
+                        self._pending -= 1
+                        self._lock.notify()
+                    raise
+                with self._lock:
+                    self._pending -= 1
+                    self._all.append(pooled)
+            elif time.monotonic() - pooled.last_used > self.validate_after:
+                if not self._validate(pooled):
+                    self._discard(pooled)
+                    continue
+
+            pooled.checkouts += 1
+            pooled._checked_out_at = time.monotonic()
+            return pooled
+
+    def release(self, pooled: PooledConnection):
+        """Return a connection to the pool"""
+        now = time.monotonic()
+        if pooled._checked_out_at is not None:
+            pooled.busy_time += now - pooled._checked_out_at
+        pooled._checked_out_at = None
+        pooled.last_used = now
+
+        if not pooled.broken:
+            try:
+                if pooled.connection.in_transaction:
+                    pooled.connection.rollback()
+            except Error:
+                pooled.broken = True
+
+        if pooled.broken:
+            self._discard(pooled)
+            return
+
+        with self._lock:
+            self._idle.append(pooled)
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        pooled = self.acquire(timeout)
+        try:
+            yield pooled
+        finally:
+            self.release(pooled)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            connections = list(self._all)
+            return {
+                'pool_size': self.pool_size,
+                'open': len(connections),
+                'idle': len(self._idle),
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'discarded': self._discarded,
+                'connections': [c.get_stats() for c in connections]
+            }
+
+    def close_all(self):
+        with self._lock:
+            connections = list(self._all)
+            self._all = []
+            self._idle.clear()
+        for pooled in connections:
+            try:
+                pooled.connection.close()
+            except Error:
+                pass
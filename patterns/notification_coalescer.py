@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+from .observer import Observer, PartialDeliveryError
+
+Event = Tuple[str, dict]
+
+DIGEST_EVENT = "NOTIFICATION_DIGEST"
+
+class CoalescingNotifier(Observer):
+    """Stage in front of a channel that merges each batch per recipient.
+
+    Events for the same appointment collapse into its final state, so
+    scheduled -> rescheduled -> cancelled becomes a single cancellation and
+    scheduled -> rescheduled a single booking at the new time. When a
+    recipient still has several messages left they are sent as one
+    NOTIFICATION_DIGEST event whose ``events`` list the notifier renders
+    together. Events without a recipient pass straight through.
+
+    The grouping window is the batch. OutboxDrainer claims all of a
+    recipient's due rows together once the oldest has waited
+    ``coalesce_window`` seconds, so a burst lands in one batch.
+    """
+
+    def __init__(self, channel: Observer, recipient_key: str):
+        self.channel = channel
+        self.recipient_key = recipient_key
+        self._lock = threading.Lock()
+        self.events_in = 0
+        self.messages_out = 0
+
+    def update(self, event_type: str, data: dict):
+        self.update_batch([(event_type, data)])
+
+    def update_batch(self, events: List[Event]):
+        outgoing, sources = self._coalesce(events)
+        with self._lock:
+            self.events_in += len(events)
+            self.messages_out += len(outgoing)
+        if not outgoing:
+            return
+        try:
+            self.channel.update_batch(outgoing)
+        except PartialDeliveryError as e:
+            # Every event merged into an undelivered message is undelivered
+            failed = {position for index in e.failed for position in sources[index]}
+            raise PartialDeliveryError(failed, str(e)) from e
+
+    def coalesce(self, events: List[Event]) -> List[Event]:
+        return self._coalesce(events)[0]
+
+    def _coalesce(self, events: List[Event]) -> Tuple[List[Event], List[List[int]]]:
+        """Outgoing messages, plus the positions in ``events`` each one stands for"""
+        # recipient -> appointment (or position, when there is none) -> positions
+        recipients: "OrderedDict[str, OrderedDict]" = OrderedDict()
+        outgoing: List[Event] = []
+        sources: List[List[int]] = []
+        for position, (event_type, data) in enumerate(events):
+            recipient = data.get(self.recipient_key)
+            if not recipient:
+                outgoing.append((event_type, data))
+                sources.append([position])
+                continue
+            key = data.get('appointment_id') or f"#{position}"
+            recipients.setdefault(recipient, OrderedDict()) \
+                .setdefault(key, []).append(position)
+
+        for recipient, appointments in recipients.items():
+            collapsed = [self._collapse([events[position] for position in positions])
+                         for positions in appointments.values()]
+            sources.append([position for positions in appointments.values()
+                            for position in positions])
+            if len(collapsed) == 1:
+                outgoing.append(collapsed[0])
+            else:
+                first = collapsed[0][1]
+                outgoing.append((DIGEST_EVENT, {
+                    self.recipient_key: recipient,
+                    'patient_name': first.get('patient_name'),
+                    'patient_id': first.get('patient_id'),
+                    'events': collapsed
+                }))
+        return outgoing, sources
+
+    @staticmethod
+    def _collapse(history: List[Event]) -> Event:
+        """Final state of one appointment, keeping details later events omit"""
+        if len(history) == 1:
+            return history[0]
+        merged: Dict = {}
+        for _, data in history:
+            merged.update({key: value for key, value in data.items() if value is not None})
+        first_type, last_type = history[0][0], history[-1][0]
+        if first_type == "APPOINTMENT_SCHEDULED" and last_type == "APPOINTMENT_RESCHEDULED":
+            # The patient never saw the original time; announce the booking once
+            merged['status'] = "SCHEDULED"
+            return first_type, merged
+        return last_type, merged
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'events_in': self.events_in, 'messages_out': self.messages_out}
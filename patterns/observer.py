@@ -1,28 +1,170 @@
 from abc import ABC, abstractmethod
-from typing import List
+import threading
+import weakref
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
+from ..utils.event_log import EventLog
+from .singleton import DatabaseManager
+
+class PartialDeliveryError(Exception):
+    """Raised by ``update_batch`` when only some of a batch was delivered.
+
+    ``failed`` holds the positions, within the batch passed in, of the
+    events that were not delivered; the others went out and must not be
+    sent again. Any other exception means nothing in the batch is known
+    to have been delivered.
+    """
+
+    def __init__(self, failed: Iterable[int], message: Optional[str] = None):
+        self.failed = sorted(failed)
+        super().__init__(message or f"{len(self.failed)} event(s) not delivered")
 
 class Observer(ABC):
     @abstractmethod
     def update(self, event_type: str, data: dict):
         pass
 
+    def update_batch(self, events: List[Tuple[str, dict]]):
+        """Handle several (event_type, data) pairs; override to deliver them together"""
+        for event_type, data in events:
+            self.update(event_type, data)
+
+ALL_EVENTS = "*"
+
 class Subject(ABC):
+    """Observer registry indexed by event type.
+
+    Observers subscribe to exact event types, to every event (``"*"``, the
+    default) or to a prefix pattern such as ``"APPOINTMENT_*"``. They are held
+    through weak references and drop out automatically once collected, so
+    the caller must keep its own reference to anything it attaches.
+    attach/detach are O(1) per event type; notify only reaches matching
+    observers, using a per-event-type lookup rebuilt after each change.
+    """
+
     def __init__(self):
-        self._observers: List[Observer] = []
+        # pattern -> {id(observer): weakref}
+        self._subscriptions: Dict[str, Dict[int, weakref.ref]] = {}
+        self._patterns_by_observer: Dict[int, Set[str]] = {}
+        self._resolved: Dict[str, Tuple[weakref.ref, ...]] = {}
+        self._lock = threading.RLock()
+
+    def attach(self, observer: Observer, event_types: Iterable[str] = (ALL_EVENTS,)):
+        if isinstance(event_types, str):
+            event_types = (event_types,)
+        key = id(observer)
+        with self._lock:
+            patterns = self._patterns_by_observer.get(key)
+            if patterns and self._ref_for(key, patterns)() is not observer:
+                self._remove(key)  # stale entry whose id has been reused
+                patterns = None
+            if patterns:
+                ref = self._ref_for(key, patterns)
+            else:
+                patterns = self._patterns_by_observer[key] = set()
+                ref = weakref.ref(observer, self._make_reaper(key))
+            for pattern in event_types:
+                self._subscriptions.setdefault(pattern, {})[key] = ref
+                patterns.add(pattern)
+            self._resolved.clear()
+
+    def _ref_for(self, key: int, patterns: Set[str]) -> weakref.ref:
+        return self._subscriptions[next(iter(patterns))][key]
 
-    def attach(self, observer: Observer):
-        if observer not in self._observers:
-            self._observers.append(observer)
+    def _make_reaper(self, key: int):
+        subject_ref = weakref.ref(self)
 
-    def detach(self, observer: Observer):
-        self._observers.remove(observer)
+        def reap(ref):
+            subject = subject_ref()
+            if subject is not None:
+                subject._remove(key, ref)
+        return reap
+
+    def _remove(self, key: int, ref: Optional[weakref.ref] = None,
+                event_types: Optional[Iterable[str]] = None):
+        with self._lock:
+            patterns = self._patterns_by_observer.get(key)
+            if not patterns:
+                return
+            if ref is not None and self._ref_for(key, patterns) is not ref:
+                return  # id reused by a newer observer
+            for pattern in list(patterns if event_types is None else event_types):
+                if pattern not in patterns:
+                    continue
+                subscribers = self._subscriptions[pattern]
+                del subscribers[key]
+                if not subscribers:
+                    del self._subscriptions[pattern]
+                patterns.discard(pattern)
+            if not patterns:
+                del self._patterns_by_observer[key]
+            self._resolved.clear()
+
+    def detach(self, observer: Observer, event_types: Optional[Iterable[str]] = None):
+        """Unsubscribe from ``event_types``, or from everything when None"""
+        if isinstance(event_types, str):
+            event_types = (event_types,)
+        key = id(observer)
+        with self._lock:
+            patterns = self._patterns_by_observer.get(key)
+            if not patterns or self._ref_for(key, patterns)() is not observer:
+                raise ValueError("Observer is not attached")
+            self._remove(key, event_types=event_types)
+
+    def _observers_for(self, event_type: str) -> Tuple[weakref.ref, ...]:
+        refs = self._resolved.get(event_type)
+        if refs is not None:
+            return refs
+        with self._lock:
+            matched: Dict[int, weakref.ref] = {}
+            matched.update(self._subscriptions.get(event_type, {}))
+            for pattern, subscribers in self._subscriptions.items():
+                if pattern.endswith("*") and pattern != event_type \
+                        and event_type.startswith(pattern[:-1]):
+                    for key, ref in subscribers.items():
+                        matched.setdefault(key, ref)
+            refs = tuple(matched.values())
+            self._resolved[event_type] = refs
+            return refs
 
     def notify(self, event_type: str, data: dict):
-        for observer in self._observers:
-            observer.update(event_type, data)
+        for ref in self._observers_for(event_type):
+            observer = ref()
+            if observer is not None:
+                observer.update(event_type, data)
+
+    def notify_batch(self, events: List[Tuple[str, dict]]):
+        # Keep each observer's batch whole: group events per observer
+        batches: Dict[int, Tuple[Observer, List[Tuple[str, dict]]]] = {}
+        for event in events:
+            for ref in self._observers_for(event[0]):
+                observer = ref()
+                if observer is not None:
+                    batches.setdefault(id(observer), (observer, []))[1].append(event)
+        for observer, observer_events in batches.values():
+            observer.update_batch(observer_events)
+
+    def observer_count(self, event_type: Optional[str] = None) -> int:
+        """Live observers in total, or those an ``event_type`` would reach"""
+        if event_type is None:
+            return len(self._patterns_by_observer)
+        return sum(1 for ref in self._observers_for(event_type) if ref() is not None)
+
+class _TemplateData(dict):
+    """Fields missing from the event render as None, like ``data.get`` would"""
+
+    def __missing__(self, key):
+        return None
 
 class EmailNotifier(Observer):
+    TEMPLATES = {
+        "APPOINTMENT_SCHEDULED": ("Your appointment has been scheduled for {date_time} "
+                                  "with Dr. {doctor_name}"),
+        "APPOINTMENT_RESCHEDULED": ("Your appointment with Dr. {doctor_name} has been "
+                                    "moved to {date_time}"),
+        "APPOINTMENT_CANCELLED": "Your appointment for {date_time} has been cancelled"
+    }
+
     def update(self, event_type: str, data: dict):
         # In a real system, this would send an actual email
         print(f"EMAIL NOTIFICATION: {event_type}")
@@ -31,11 +173,12 @@ class EmailNotifier(Observer):
         print(f"Message: {self._generate_message(event_type, data)}\n")
 
     def _generate_message(self, event_type: str, data: dict) -> str:
-        if event_type == "APPOINTMENT_SCHEDULED":
-            return (f"Your appointment has been scheduled for {data.get('date_time')} "
-                   f"with Dr. {data.get('doctor_name')}")
-        elif event_type == "APPOINTMENT_CANCELLED":
-            return f"Your appointment for {data.get('date_time')} has been cancelled"
+        if event_type == "NOTIFICATION_DIGEST":
+            lines = [f"- {self._generate_message(t, d)}" for t, d in data.get('events', [])]
+            return f"You have {len(lines)} appointment updates:\n" + "\n".join(lines)
+        template = self.TEMPLATES.get(event_type)
+        if template is not None:
+            return template.format_map(_TemplateData(data))
         return f"Event: {event_type} - Details: {data}"
 
 class SMSNotifier(Observer):
@@ -46,46 +189,82 @@ class SMSNotifier(Observer):
         print(f"Message: {self._generate_message(event_type, data)}\n")
 
     def _generate_message(self, event_type: str, data: dict) -> str:
+        if event_type == "NOTIFICATION_DIGEST":
+            return "; ".join(self._generate_message(t, d) for t, d in data.get('events', []))
         if event_type == "APPOINTMENT_SCHEDULED":
             return (f"Appt scheduled: {data.get('date_time')} "
                    f"with Dr. {data.get('doctor_name')}")
+        elif event_type == "APPOINTMENT_RESCHEDULED":
+            return f"Appt moved to {data.get('date_time')}"
         elif event_type == "APPOINTMENT_CANCELLED":
             return f"Appt cancelled: {data.get('date_time')}"
         return f"{event_type}: {data}"
 
 class SystemLogger(Observer):
+    """Records every event in the structured event log (utils/event_log.py).
+
+    An event raised inside a transaction is recorded when it commits, so a
+    rolled-back change leaves no entry behind.
+    """
+
+    def __init__(self, event_log: Optional[EventLog] = None):
+        self.event_log = event_log or EventLog.default()
+        self.db = DatabaseManager.get_instance()
+
     def update(self, event_type: str, data: dict):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"SYSTEM LOG [{timestamp}] {event_type}")
-        print(f"Details: {data}\n")
+        data = dict(data)
+        self.db.on_commit(lambda: self.event_log.record(event_type, data))
 
 class AppointmentSystem(Subject):
     def schedule_appointment(self, patient_data: dict, doctor_data: dict, 
-                           date_time: datetime):
+                           date_time: datetime, appointment_id: Optional[str] = None):
         # Logic to schedule appointment in database would go here
         
-        notification_data = {
-            "appointment_id": "AP" + datetime.now().strftime("%Y%m%d%H%M%S"),
-            "patient_name": patient_data.get("name"),
-            "patient_id": patient_data.get("id"),
-            "email": patient_data.get("email"),
-            "phone": patient_data.get("phone"),
-            "doctor_name": doctor_data.get("name"),
-            "doctor_id": doctor_data.get("id"),
-            "date_time": date_time.strftime("%Y-%m-%d %H:%M"),
-            "status": "SCHEDULED"
-        }
-        
+        notification_data = self._appointment_data(
+            appointment_id, patient_data, doctor_data, date_time, "SCHEDULED")
         self.notify("APPOINTMENT_SCHEDULED", notification_data)
         return notification_data["appointment_id"]
 
-    def cancel_appointment(self, appointment_id: str, reason: str):
+    def schedule_appointments(self, bookings: List[Tuple[str, dict, dict, datetime]]) -> List[str]:
+        """Announce several (appointment_id, patient_data, doctor_data, date_time) bookings"""
+        events = [
+            ("APPOINTMENT_SCHEDULED", self._appointment_data(
+                appointment_id, patient_data, doctor_data, date_time, "SCHEDULED"))
+            for appointment_id, patient_data, doctor_data, date_time in bookings
+        ]
+        self.notify_batch(events)
+        return [data["appointment_id"] for _, data in events]
+
+    def reschedule_appointment(self, appointment_id: str, patient_data: dict,
+                               doctor_data: dict, new_date_time: datetime):
+        notification_data = self._appointment_data(
+            appointment_id, patient_data, doctor_data, new_date_time, "RESCHEDULED")
+        self.notify("APPOINTMENT_RESCHEDULED", notification_data)
+
+    def cancel_appointment(self, appointment_id: str, reason: str,
+                           patient_data: Optional[dict] = None,
+                           doctor_data: Optional[dict] = None,
+                           date_time: Optional[datetime] = None):
         # Logic to cancel appointment in database would go here
         
-        notification_data = {
-            "appointment_id": appointment_id,
-            "reason": reason,
-            "status": "CANCELLED"
-        }
+        notification_data = self._appointment_data(
+            appointment_id, patient_data or {}, doctor_data or {}, date_time, "CANCELLED")
+        notification_data["reason"] = reason
         
         self.notify("APPOINTMENT_CANCELLED", notification_data)
+
+    def _appointment_data(self, appointment_id: Optional[str], patient_data: dict,
+                          doctor_data: dict, date_time: Optional[datetime],
+                          status: str) -> dict:
+        # Accepts both model to_dict() keys and the short id/phone keys
+        return {
+            "appointment_id": appointment_id or "AP" + datetime.now().strftime("%Y%m%d%H%M%S"),
+            "patient_name": patient_data.get("name"),
+            "patient_id": patient_data.get("patient_id", patient_data.get("id")),
+            "email": patient_data.get("email"),
+            "phone": patient_data.get("contact_number", patient_data.get("phone")),
+            "doctor_name": doctor_data.get("name"),
+            "doctor_id": doctor_data.get("doctor_id", doctor_data.get("id")),
+            "date_time": date_time.strftime("%Y-%m-%d %H:%M") if date_time else None,
+            "status": status
+        }
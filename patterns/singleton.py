@@ -1,28 +1,28 @@
-import mysql.connector
+import threading
+from contextlib import contextmanager
 from mysql.connector import Error
-from typing import Optional
+from typing import Callable, Dict, Iterator, Optional, Sequence
+from ..config import DB_CONFIG, DB_POOL_CONFIG
+from .connection_pool import ConnectionPool, PooledConnection
 
 class DatabaseManager:
     _instance = None
-    _connection = None
+    _pool: Optional[ConnectionPool] = None
+    _lock = threading.Lock()
+    _local = threading.local()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(DatabaseManager, cls).__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(DatabaseManager, cls).__new__(cls)
         return cls._instance
 
     def __init__(self):
-        if not self._connection:
-            try:
-                self._connection = mysql.connector.connect(
-                    host="localhost",
-                    user="root",
-                    password="Root@123",
-                    database="serenity_hospital_db"
-                )
-                print("Database connection successful")
-            except Error as e:
-                print(f"Error connecting to database: {e}")
+        if not self._pool:
+            with self._lock:
+                if not self._pool:
+                    DatabaseManager._pool = ConnectionPool(**DB_POOL_CONFIG, **DB_CONFIG)
 
     @classmethod
     def get_instance(cls):
@@ -30,55 +30,272 @@ class DatabaseManager:
             cls._instance = DatabaseManager()
         return cls._instance
 
-    def get_connection(self):
-        if not self._connection or not self._connection.is_connected():
-            self.__init__()
-        return self._connection
+    @classmethod
+    def configure_pool(cls, pool_size: int = None, validate_after: float = None,
+                       checkout_timeout: float = None):
+        """Replace the connection pool with one using the given settings"""
+        settings = dict(DB_POOL_CONFIG)
+        if pool_size is not None:
+            settings['pool_size'] = pool_size
+        if validate_after is not None:
+            settings['validate_after'] = validate_after
+        if checkout_timeout is not None:
+            settings['checkout_timeout'] = checkout_timeout
+
+        with cls._lock:
+            old_pool = cls._pool
+            cls._pool = ConnectionPool(**settings, **DB_CONFIG)
+        if old_pool:
+            old_pool.close_all()
+
+    @contextmanager
+    def connection(self):
+        """Check out a pooled connection for the duration of the block"""
+        with self._pool.connection() as pooled:
+            yield pooled
+
+    def get_connection(self) -> PooledConnection:
+        """Check out a pooled connection; return it with release_connection()"""
+        return self._pool.acquire()
+
+    def release_connection(self, pooled: PooledConnection):
+        self._pool.release(pooled)
+
+    def get_pool_stats(self) -> Dict:
+        return self._pool.get_stats()
+
+    @contextmanager
+    def transaction(self):
+        """Run the block as a single unit of work.
+
+        Every query issued on this thread inside the block shares one pooled
+        connection and is committed once when the outermost block exits.
+        Nested blocks join the enclosing transaction; an exception leaving
+        any block, or a call to set_rollback_only(), rolls back the whole
+        transaction.
+        """
+        state = getattr(self._local, 'transaction', None)
+        if state is not None:
+            state['depth'] += 1
+            try:
+                yield state['connection']
+            except BaseException:
+                state['rollback_only'] = True
+                raise
+            finally:
+                state['depth'] -= 1
+            return
+
+        try:
+            pooled = self._pool.acquire()
+        except Error as e:
+            raise Error(f"Could not establish database connection: {e}")
+
+        state = {'connection': pooled, 'depth': 1, 'rollback_only': False,
+                 'rollback_requested': False, 'on_commit': []}
+        self._local.transaction = state
+        try:
+            pooled.connection.start_transaction()
+            yield pooled
+            if state['rollback_only']:
+                raise Error("Transaction rolled back by a nested block")
+            if state['rollback_requested']:
+                pooled.connection.rollback()
+            else:
+                pooled.connection.commit()
+        except BaseException:
+            try:
+                pooled.connection.rollback()
+            except Error:
+                pooled.broken = True
+            raise
+        finally:
+            self._local.transaction = None
+            self._pool.release(pooled)
+
+        if state['rollback_requested']:
+            return
+        for callback in state['on_commit']:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in on-commit callback: {e}")
+
+    def set_rollback_only(self):
+        """Roll the current transaction back instead of committing it.
+
+        Lets a block return early without committing what it already wrote.
+        Called from the outermost block the rollback is silent; from a nested
+        block the outermost one raises on exit, as after an exception.
+        """
+        state = getattr(self._local, 'transaction', None)
+        if state is None:
+            raise Error("No transaction in progress")
+        if state['depth'] > 1:
+            state['rollback_only'] = True
+        else:
+            state['rollback_requested'] = True
+
+    def on_commit(self, callback: Callable[[], None]):
+        """Run ``callback`` once the current transaction commits.
+
+        Outside a transaction it runs immediately; if the transaction rolls
+        back it never runs.
+        """
+        state = getattr(self._local, 'transaction', None)
+        if state is None:
+            callback()
+        else:
+            state['on_commit'].append(callback)
+
+    def in_transaction(self) -> bool:
+        return getattr(self._local, 'transaction', None) is not None
+
+    def transaction_local(self) -> Optional[Dict]:
+        """Scratch dict for bookkeeping that lives exactly as long as the
+        current transaction (dropped on commit and rollback alike); None
+        outside a transaction.
+        """
+        state = getattr(self._local, 'transaction', None)
+        return None if state is None else state.setdefault('local', {})
 
     def execute_query(self, query: str, params: tuple = None) -> Optional[list]:
-        if not self._connection or not self._connection.is_connected():
-            self.__init__()
-            if not self._connection:
-                raise Error("Could not establish database connection")
-                
+        state = getattr(self._local, 'transaction', None)
+        if state is not None:
+            pooled = state['connection']
+        else:
+            try:
+                pooled = self._pool.acquire()
+            except Error as e:
+                raise Error(f"Could not establish database connection: {e}")
+
         cursor = None
         try:
-            cursor = self._connection.cursor(dictionary=True)
-            
+            cursor = pooled.cursor(dictionary=True)
+            pooled.queries += 1
+
             # Execute the query
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
-            
+
             # Handle SELECT queries
             if query.lower().strip().startswith('select'):
-                result = cursor.fetchall()
-                cursor.close()
-                return result
-            
-            # Handle INSERT/UPDATE/DELETE queries
-            self._connection.commit()
-            affected = cursor.rowcount
-            cursor.close()
-            return [{"affected_rows": affected}]
-            
+                return cursor.fetchall()
+
+            # Handle INSERT/UPDATE/DELETE queries; outside a transaction the
+            # pooled connection autocommits, inside one transaction() commits
+            return [{"affected_rows": cursor.rowcount}]
+
         except Error as e:
-            if cursor:
-                cursor.close()
+            pooled.errors += 1
+            if not pooled.connection.is_connected():
+                pooled.broken = True
             raise e
         except Exception as e:
+            pooled.errors += 1
+            raise Error(f"Query execution failed: {str(e)}")
+        finally:
             if cursor:
                 cursor.close()
-            raise Error(f"Query execution failed: {str(e)}")
-                
+            if state is None:
+                self._pool.release(pooled)
+
+    def iter_query(self, query: str, params: tuple = None,
+                   batch_size: int = 1000) -> Iterator[Dict]:
+        """Stream the rows of a SELECT without materialising the result set.
+
+        Rows are read from an unbuffered cursor ``batch_size`` at a time, so
+        memory stays bounded however large the result is. The connection is
+        held until the iterator is exhausted or closed; inside a transaction
+        the iterator must be consumed before the next query is issued.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        state = getattr(self._local, 'transaction', None)
+        if state is not None:
+            pooled = state['connection']
+        else:
+            try:
+                pooled = self._pool.acquire()
+            except Error as e:
+                raise Error(f"Could not establish database connection: {e}")
+
+        cursor = None
+        exhausted = False
+        try:
+            cursor = pooled.cursor(dictionary=True, buffered=False)
+            pooled.queries += 1
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    exhausted = True
+                    break
+                yield from rows
         except Error as e:
-            print(f"Error executing query: {e}")
+            pooled.errors += 1
+            if not pooled.connection.is_connected():
+                pooled.broken = True
+            raise e
+        finally:
+            if cursor and not exhausted and not pooled.broken:
+                if state is None:
+                    # Abandoned early: dropping the connection is cheaper than
+                    # reading the rest of a large result off the wire
+                    pooled.broken = True
+                else:
+                    try:
+                        while cursor.fetchmany(batch_size):
+                            pass
+                    except Error:
+                        pooled.broken = True
             if cursor:
-                cursor.close()
-            return None
+                try:
+                    cursor.close()
+                except Error:
+                    pooled.broken = True
+            if state is None:
+                self._pool.release(pooled)
+
+    def execute_many(self, query: str, params_list: Sequence[tuple],
+                     chunk_size: int = 500) -> Optional[list]:
+        """Execute a write statement once per parameter tuple.
+
+        INSERT ... VALUES statements are sent as multi-row INSERTs of at most
+        ``chunk_size`` rows each, and all chunks are committed together.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        affected = 0
+        with self.transaction() as pooled:
+            cursor = None
+            try:
+                cursor = pooled.cursor()
+                for start in range(0, len(params_list), chunk_size):
+                    chunk = params_list[start:start + chunk_size]
+                    pooled.queries += 1
+                    cursor.executemany(query, chunk)
+                    affected += cursor.rowcount
+            except Error:
+                pooled.errors += 1
+                raise
+            except Exception as e:
+                pooled.errors += 1
+                raise Error(f"Query execution failed: {str(e)}")
+            finally:
+                if cursor:
+                    cursor.close()
+        return [{"affected_rows": affected}]
 
     def close_connection(self):
-        if self._connection and self._connection.is_connected():
-            self._connection.close()
-            print("Database connection closed")
+        if self._pool:
+            self._pool.close_all()
+            print("Database connections closed")
@@ -0,0 +1,407 @@
+"""Headless HTTP/JSON API over the service layer.
+
+    python -m hospital_management_system.server [--host 127.0.0.1] [--port 8080]
+
+Clients log in with ``POST /login`` ({"username", "password"}) and send the
+returned token as ``Authorization: Bearer <token>``. Each request runs its
+service call on a bounded thread pool (sized to the DB connection pool by
+default) inside ``as_user(...)``, so the RBAC decorators and row scopes see
+that request's user while other requests run concurrently. Requests beyond
+``max_pending`` are answered with 503 instead of queueing without limit.
+
+Routes:
+    GET  /health
+    POST /login, /logout
+    GET  /patients?page_size&cursor      GET /patients/search?q&limit
+    GET  /patients/{patient_id}
+    GET  /doctors?page_size&cursor       GET /doctors/search?q&limit
+    GET  /doctors/{doctor_id}
+    GET  /appointments?start&end&status&q&page_size&cursor
+    POST /appointments                   GET /appointments/{appointment_id}
+    POST /appointments/{appointment_id}/cancel, .../reschedule
+    GET  /records?patient&doctor&q&start&end&page_size&cursor
+    POST /records                        GET /records/{record_id}
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Pattern, Tuple
+from urllib.parse import parse_qs, urlsplit
+from mysql.connector import Error
+
+from .auth.credentials import Authenticator
+from .auth.rbac import (
+    AuthenticationManager, Permission, UserRole, as_user, require_permission
+)
+from .auth.role_store import RoleDefinitionLoader
+from .config import DB_POOL_CONFIG, SERVER_CONFIG
+from .services import AppointmentService, DoctorService, MedicalRecordService, PatientService
+from .services.notification_outbox import OutboxDrainer
+from .services.pagination import Page
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class Route(NamedTuple):
+    method: str
+    pattern: Pattern
+    handler: Callable
+    status: int = 200
+    auth: bool = True
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+def _entity(entity) -> Dict:
+    if entity is None:
+        raise HttpError(404, "Not found")
+    data = entity.to_dict()
+    # Display names joined in by listing queries
+    for name in ('patient_name', 'doctor_name'):
+        if getattr(entity, name, None) is not None:
+            data[name] = getattr(entity, name)
+    return data
+
+def _page(page: Page) -> Dict:
+    return {'items': [_entity(item) for item in page.items], 'next_cursor': page.next_cursor}
+
+def _int(query: Dict[str, str], name: str, default: int) -> int:
+    try:
+        return int(query.get(name, default))
+    except ValueError:
+        raise HttpError(400, f"{name} must be an integer")
+
+def _date(value: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(value) if value else None
+
+def _required(body: Dict, *names: str) -> List:
+    missing = [name for name in names if body.get(name) in (None, '')]
+    if missing:
+        raise HttpError(400, f"Missing field(s): {', '.join(missing)}")
+    return [body[name] for name in names]
+
+class HospitalApi:
+    """Route handlers; every one runs on a worker thread as the request's user"""
+
+    def __init__(self):
+        self.authenticator = Authenticator()
+        self.patients = PatientService()
+        self.doctors = DoctorService()
+        self.appointments = AppointmentService()
+        self.records = MedicalRecordService()
+
+    def routes(self) -> List[Route]:
+        table = [
+            ('GET', r'/health', self.health, 200, False),
+            ('POST', r'/login', self.login, 200, False),
+            ('POST', r'/logout', self.logout, 200, False),
+            ('GET', r'/patients', self.list_patients),
+            ('GET', r'/patients/search', self.search_patients),
+            ('GET', r'/patients/(?P<patient_id>[^/]+)', self.get_patient),
+            ('GET', r'/doctors', self.list_doctors),
+            ('GET', r'/doctors/search', self.search_doctors),
+            ('GET', r'/doctors/(?P<doctor_id>[^/]+)', self.get_doctor),
+            ('GET', r'/appointments', self.list_appointments),
+            ('POST', r'/appointments', self.create_appointment, 201),
+            ('GET', r'/appointments/(?P<appointment_id>[^/]+)', self.get_appointment),
+            ('POST', r'/appointments/(?P<appointment_id>[^/]+)/cancel', self.cancel_appointment),
+            ('POST', r'/appointments/(?P<appointment_id>[^/]+)/reschedule',
+             self.reschedule_appointment),
+            ('GET', r'/records', self.list_records),
+            ('POST', r'/records', self.create_record, 201),
+            ('GET', r'/records/(?P<record_id>[^/]+)', self.get_record),
+        ]
+        return [Route(method, re.compile(path), handler, *options)
+                for method, path, handler, *options in table]
+
+    def health(self, query, body, headers):
+        return {'status': 'ok'}
+
+    def login(self, query, body, headers):
+        username, password = _required(body, 'username', 'password')
+        session = self.authenticator.authenticate(username, password)
+        if session is None:
+            raise HttpError(401, "Invalid username or password")
+        return {
+            'token': session.token,
+            'expires_at': datetime.fromtimestamp(session.expires_at),
+            'role': session.user.role.value,
+            'reference_id': session.user.reference_id
+        }
+
+    def logout(self, query, body, headers):
+        token = headers.get('authorization', '')[len('Bearer '):]
+        if token:
+            self.authenticator.revoke(token)
+        return {'status': 'logged out'}
+
+    # Patients: lists need VIEW_PATIENTS; a single patient is row-scoped
+    # so patients can read their own profile
+    @require_permission(Permission.VIEW_PATIENTS)
+    def list_patients(self, query, body, headers):
+        return _page(self.patients.get_patients_page(_int(query, 'page_size', 100),
+                                                     query.get('cursor')))
+
+    @require_permission(Permission.VIEW_PATIENTS)
+    def search_patients(self, query, body, headers):
+        found = self.patients.search_patients(query.get('q', ''), _int(query, 'limit', 100))
+        return {'items': [_entity(patient) for patient in found]}
+
+    def get_patient(self, query, body, headers, patient_id):
+        return _entity(self.patients.get_patient_by_id(patient_id))
+
+    @require_permission(Permission.VIEW_DOCTORS)
+    def list_doctors(self, query, body, headers):
+        return _page(self.doctors.get_doctors_page(_int(query, 'page_size', 100),
+                                                   query.get('cursor')))
+
+    @require_permission(Permission.VIEW_DOCTORS)
+    def search_doctors(self, query, body, headers):
+        found = self.doctors.search_doctors(query.get('q', ''), _int(query, 'limit', 100))
+        return {'items': [_entity(doctor) for doctor in found]}
+
+    @require_permission(Permission.VIEW_DOCTORS)
+    def get_doctor(self, query, body, headers, doctor_id):
+        return _entity(self.doctors.get_doctor_by_id(doctor_id))
+
+    def list_appointments(self, query, body, headers):
+        return _page(self.appointments.get_appointments_page(
+            _date(query.get('start')), _date(query.get('end')), query.get('status'),
+            query.get('q'), _int(query, 'page_size', 100), query.get('cursor')))
+
+    def create_appointment(self, query, body, headers):
+        patient_id, doctor_id, date_time, department = _required(
+            body, 'patient_id', 'doctor_id', 'date_time', 'department')
+        return _entity(self.appointments.create_appointment(
+            patient_id=patient_id, doctor_id=doctor_id,
+            date_time=datetime.fromisoformat(date_time), department=department,
+            notes=body.get('notes')))
+
+    @require_permission(Permission.VIEW_APPOINTMENTS)
+    def get_appointment(self, query, body, headers, appointment_id):
+        return _entity(self.appointments.get_appointment_by_id(appointment_id))
+
+    @require_permission(Permission.CANCEL_APPOINTMENT)
+    def cancel_appointment(self, query, body, headers, appointment_id):
+        if not self.appointments.cancel_appointment(appointment_id, body.get('reason')):
+            raise HttpError(404, "Not found")
+        return _entity(self.appointments.get_appointment_by_id(appointment_id))
+
+    @require_permission(Permission.RESCHEDULE_APPOINTMENT)
+    def reschedule_appointment(self, query, body, headers, appointment_id):
+        date_time, = _required(body, 'date_time')
+        if not self.appointments.reschedule_appointment(appointment_id,
+                                                        datetime.fromisoformat(date_time)):
+            raise HttpError(404, "Not found")
+        return _entity(self.appointments.get_appointment_by_id(appointment_id))
+
+    @require_permission(Permission.VIEW_MEDICAL_RECORDS)
+    def list_records(self, query, body, headers):
+        return _page(self.records.search_records_page(
+            query.get('patient'), query.get('doctor'), _date(query.get('start')),
+            _date(query.get('end')), query.get('q'), _int(query, 'page_size', 100),
+            query.get('cursor')))
+
+    @require_permission(Permission.CREATE_MEDICAL_RECORD)
+    def create_record(self, query, body, headers):
+        user = AuthenticationManager().get_current_user()
+        if user.role == UserRole.DOCTOR:
+            body['doctor_id'] = user.reference_id  # doctors record their own visits
+        patient_id, doctor_id, diagnosis = _required(body, 'patient_id', 'doctor_id', 'diagnosis')
+        return _entity(self.records.create_record(patient_id, doctor_id, diagnosis,
+                                                  body.get('prescriptions') or [],
+                                                  body.get('notes')))
+
+    @require_permission(Permission.VIEW_MEDICAL_RECORDS)
+    def get_record(self, query, body, headers, record_id):
+        return _entity(self.records.get_record_by_id(record_id))
+
+class ApiServer:
+    """Minimal HTTP/1.1 server (keep-alive, Content-Length bodies) for HospitalApi"""
+
+    def __init__(self, api: HospitalApi, host: str = SERVER_CONFIG['host'],
+                 port: int = SERVER_CONFIG['port'], workers: Optional[int] = None):
+        self.api = api
+        self.routes = api.routes()
+        self.host = host
+        self.port = port
+        workers = workers or SERVER_CONFIG['workers'] or DB_POOL_CONFIG['pool_size']
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-worker")
+        self.max_pending = SERVER_CONFIG['max_pending']
+        self.max_body = SERVER_CONFIG['max_body']
+        self.keepalive_timeout = SERVER_CONFIG['keepalive_timeout']
+        self.pending = 0
+        self.requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(),
+                                                          self.keepalive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    writer.write(self._response(400, {'error': "Malformed request line"}, False))
+                    break
+
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    writer.write(self._response(400, {'error': "Bad Content-Length"}, False))
+                    break
+                if length > self.max_body:
+                    writer.write(self._response(413, {'error': "Request body too large"}, False))
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self._dispatch(method, target, headers, body)
+                keep_alive = (version == 'HTTP/1.1'
+                              and headers.get('connection', '').lower() != 'close')
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _match(self, method: str, path: str) -> Tuple[Route, Dict[str, str]]:
+        allowed = False
+        for route in self.routes:
+            match = route.pattern.fullmatch(path)
+            if match:
+                if route.method == method:
+                    return route, match.groupdict()
+                allowed = True
+        if allowed:
+            raise HttpError(405, "Method not allowed")
+        raise HttpError(404, "Not found")
+
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str],
+                        raw_body: bytes) -> Tuple[int, Any]:
+        self.requests += 1
+        try:
+            url = urlsplit(target)
+            route, params = self._match(method, url.path.rstrip('/') or '/')
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            try:
+                body = json.loads(raw_body) if raw_body else {}
+            except ValueError:
+                raise HttpError(400, "Body is not valid JSON")
+            if not isinstance(body, dict):
+                raise HttpError(400, "Body must be a JSON object")
+
+            user = None
+            if route.auth:
+                authorization = headers.get('authorization', '')
+                if authorization.startswith('Bearer '):
+                    user = self.api.authenticator.resume(authorization[len('Bearer '):])
+                if user is None:
+                    raise HttpError(401, "Missing or expired session token")
+
+            if self.pending >= self.max_pending:
+                raise HttpError(503, "Server busy")
+            self.pending += 1
+            try:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self.executor, self._call, route, user,
+                                                    query, body, headers, params)
+            finally:
+                self.pending -= 1
+            return route.status, result
+        except HttpError as e:
+            return e.status, {'error': str(e)}
+        except PermissionError as e:
+            return 403, {'error': str(e)}
+        except (ValueError, TypeError, KeyError) as e:
+            return 400, {'error': str(e)}
+        except Error as e:
+            print(f"Database error serving {method} {target}: {e}")
+            return 500, {'error': "Database error"}
+        except Exception as e:
+            print(f"Error serving {method} {target}: {e}")
+            return 500, {'error': "Internal server error"}
+
+    @staticmethod
+    def _call(route: Route, user, query, body, headers, params):
+        with as_user(user) if user is not None else contextlib.nullcontext():
+            return route.handler(query, body, headers, **params)
+
+    @staticmethod
+    def _response(status: int, payload: Any, keep_alive: bool) -> bytes:
+        body = json.dumps(payload, default=_json_default).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode('latin-1') + body
+
+async def serve(host: str, port: int, workers: Optional[int] = None):
+    server = ApiServer(HospitalApi(), host, port, workers)
+    await server.start()
+    OutboxDrainer().start()
+    RoleDefinitionLoader().start()
+    print(f"Serving on http://{server.host}:{server.port} "
+          f"({server.executor._max_workers} workers)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Hospital management HTTP/JSON API")
+    parser.add_argument('--host', default=SERVER_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=SERVER_CONFIG['port'])
+    parser.add_argument('--workers', type=int, default=SERVER_CONFIG['workers'])
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,17 @@
 from .base_service import BaseService
+from .pagination import Page
 from .patient_service import PatientService
 from .doctor_service import DoctorService
 from .appointment_service import AppointmentService
 from .medical_record_service import MedicalRecordService
+from .organization_service import OrganizationService
 
 __all__ = [
     'BaseService',
+    'Page',
     'PatientService',
     'DoctorService',
     'AppointmentService',
-    'MedicalRecordService'
+    'MedicalRecordService',
+    'OrganizationService'
 ]
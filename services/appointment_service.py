@@ -1,14 +1,29 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Iterator, Tuple
 from datetime import datetime
 from ..models import Appointment
-from ..patterns.observer import AppointmentSystem
-from ..auth.rbac import AuthenticationManager, Permission, require_permission, require_self_or_admin
+from ..patterns.observer import AppointmentSystem, SystemLogger
+from ..auth.rbac import AuthenticationManager, Permission, UserRole, require_permission, require_self_or_admin
 from .base_service import BaseService
+from .notification_outbox import NotificationOutbox
+from .doctor_service import DoctorService
+from .patient_service import PatientService
+from .pagination import Page
+from .search import match_condition
 
 class AppointmentService(BaseService[Appointment]):
     def __init__(self):
         super().__init__()
         self.notification_system = AppointmentSystem()
+        # Email/SMS are written to the outbox inside the booking transaction;
+        # the system logger appends to the event log's memory buffer once it
+        # commits (observers are held weakly, so keep our own references)
+        self.outbox = NotificationOutbox()
+        self.system_logger = SystemLogger()
+        self.notification_system.attach(self.outbox)
+        self.notification_system.attach(self.system_logger)
+        # Patient/doctor lookups for notifications go through their caches
+        self.patient_service = PatientService()
+        self.doctor_service = DoctorService()
 
     @require_permission(Permission.CREATE_APPOINTMENT)
     @require_self_or_admin(resource_id_param="patient_id")
@@ -18,46 +33,152 @@ class AppointmentService(BaseService[Appointment]):
                          date_time: datetime,
                          department: str,
                          notes: str = None) -> Optional[Appointment]:
-        appointment_id = self._generate_id("APT", "appointments")
-        
-        query = """
-        INSERT INTO appointments (
-            appointment_id, patient_id, doctor_id,
-            appointment_date, department, status, notes
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        params = (
-            appointment_id, patient_id, doctor_id,
-            date_time, department, 'scheduled', notes
-        )
-        
-        if self._execute_query(query, params) is not None:
+        with self._transaction():
+            appointment_id = self._generate_id("APT", "appointments")
+            
+            query = """
+            INSERT INTO appointments (
+                appointment_id, patient_id, doctor_id,
+                appointment_date, department, status, notes
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """
+            params = (
+                appointment_id, patient_id, doctor_id,
+                date_time, department, 'scheduled', notes
+            )
+            
+            if self._execute_query(query, params) is None:
+                self._rollback()
+                return None
+
             # Get patient and doctor details for notification
             patient_data = self._get_patient_data(patient_id)
             doctor_data = self._get_doctor_data(doctor_id)
-            
-            # Notify observers
+
+            # Queue notifications in the same transaction as the appointment
             self.notification_system.schedule_appointment(
                 patient_data,
                 doctor_data,
-                date_time
+                date_time,
+                appointment_id
             )
-            
-            return self.get_appointment_by_id(appointment_id)
-        return None
+        
+        return self.get_appointment_by_id(appointment_id)
+
+    @require_permission(Permission.CREATE_APPOINTMENT)
+    def create_appointments_bulk(self, appointments: List[Dict],
+                                 chunk_size: int = 500,
+                                 notify: bool = True) -> List[str]:
+        """Book many appointments at once and return their new IDs in input order.
+
+        Each dict takes the same keys as create_appointment's arguments.
+        """
+        if not appointments:
+            return []
+
+        user = AuthenticationManager().get_current_user()
+        if user.role != UserRole.ADMIN and any(
+                data['patient_id'] != user.reference_id for data in appointments):
+            raise PermissionError("Cannot access other user's data")
 
-    def get_appointment_by_id(self, appointment_id: str) -> Optional[Appointment]:
         query = """
-        SELECT * FROM appointments WHERE appointment_id = %s
+        INSERT INTO appointments (
+            appointment_id, patient_id, doctor_id,
+            appointment_date, department, status, notes
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
-        result = self._execute_query(query, (appointment_id,))
-        return Appointment(**result[0]) if result else None
+        with self._transaction():
+            appointment_ids = self._generate_ids("APT", "appointments", len(appointments))
+            params_list = [
+                (
+                    appointment_id, data['patient_id'], data['doctor_id'],
+                    data['date_time'], data['department'], 'scheduled', data.get('notes')
+                )
+                for appointment_id, data in zip(appointment_ids, appointments)
+            ]
+            self._execute_many(query, params_list, chunk_size)
+
+            if notify:
+                patients = self._get_rows_by_ids(
+                    "SELECT * FROM patients WHERE patient_id IN ({})",
+                    "patient_id", {data['patient_id'] for data in appointments})
+                doctors = self._get_rows_by_ids(
+                    """
+                    SELECT d.*, s.name, s.email, s.contact_number
+                    FROM doctors d
+                    JOIN staff s ON d.staff_id = s.staff_id
+                    WHERE d.doctor_id IN ({})
+                    """,
+                    "doctor_id", {data['doctor_id'] for data in appointments})
+
+                self.notification_system.schedule_appointments([
+                    (
+                        appointment_id,
+                        patients.get(data['patient_id'], {}),
+                        doctors.get(data['doctor_id'], {}),
+                        data['date_time']
+                    )
+                    for appointment_id, data in zip(appointment_ids, appointments)
+                ])
+
+        return appointment_ids
+
+    def get_appointment_by_id(self, appointment_id: str) -> Optional[Appointment]:
+        scope, scope_params = self._row_scope("appointments")
+        query = f"""
+        SELECT * FROM appointments WHERE appointment_id = %s AND {scope}
+        """
+        result = self._execute_query(query, (appointment_id, *scope_params))
+        return Appointment.from_db_dict(result[0]) if result else None
         
     @require_permission(Permission.VIEW_APPOINTMENTS)
     def get_appointments(self, start_date: Optional[datetime] = None, 
                         end_date: Optional[datetime] = None,
                         status: Optional[str] = None,
                         search_term: Optional[str] = None) -> List[Appointment]:
+        query, params = self._build_appointments_query(start_date, end_date, status, search_term)
+        query += " ORDER BY appointment_date DESC"
+        result = self._execute_query(query, params)
+        return [Appointment.from_db_dict(row) for row in result] if result else []
+
+    @require_permission(Permission.VIEW_APPOINTMENTS)
+    def get_appointments_page(self, start_date: Optional[datetime] = None,
+                              end_date: Optional[datetime] = None,
+                              status: Optional[str] = None,
+                              search_term: Optional[str] = None,
+                              page_size: int = 100,
+                              cursor: Optional[str] = None) -> Page[Appointment]:
+        """Newest-first page of appointments matching the get_appointments filters"""
+        query, params = self._build_appointments_query(start_date, end_date, status, search_term)
+        return self._fetch_page(query, params,
+                                ["a.appointment_date", "a.appointment_id"],
+                                Appointment.from_db_dict, page_size, cursor,
+                                descending=True)
+
+    @require_permission(Permission.VIEW_APPOINTMENTS)
+    def count_appointments(self, start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None,
+                           status: Optional[str] = None,
+                           search_term: Optional[str] = None) -> int:
+        query, params = self._build_appointments_query(start_date, end_date, status, search_term)
+        return self._count(query, params)
+
+    @require_permission(Permission.VIEW_APPOINTMENTS)
+    def iter_appointments(self, start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None,
+                          status: Optional[str] = None,
+                          search_term: Optional[str] = None,
+                          batch_size: int = 1000) -> Iterator[Appointment]:
+        """Stream appointments matching the same filters as get_appointments"""
+        query, params = self._build_appointments_query(start_date, end_date, status, search_term)
+        query += " ORDER BY appointment_date DESC"
+        for row in self._iter_query(query, params, batch_size):
+            yield Appointment.from_db_dict(row)
+
+    def _build_appointments_query(self, start_date: Optional[datetime],
+                                  end_date: Optional[datetime],
+                                  status: Optional[str],
+                                  search_term: Optional[str]) -> Tuple[str, Optional[tuple]]:
         query = """
         SELECT a.*, p.name as patient_name, d.name as doctor_name
         FROM appointments a
@@ -66,135 +187,149 @@ class AppointmentService(BaseService[Appointment]):
         JOIN staff d ON doc.staff_id = d.staff_id
         WHERE 1=1
         """
-        params = []
+        scope, params = self._row_scope("appointments", "a")
+        query += f" AND {scope}"
 
         if start_date and end_date:
-            query += " AND DATE(appointment_date) BETWEEN %s AND %s"
-            params.extend([start_date, end_date])
+            query += " AND a.appointment_date >= %s AND a.appointment_date < %s"
+            params.extend(self._day_range(start_date, end_date))
 
         if status:
             query += " AND status = %s"
             params.append(status)
 
         if search_term:
-            query += " AND (p.name LIKE %s OR d.name LIKE %s)"
-            search_pattern = f"%{search_term}%"
-            params.extend([search_pattern, search_pattern])
+            patient_condition, patient_params = match_condition(("p.name",), search_term)
+            doctor_condition, doctor_params = match_condition(("d.name",), search_term)
+            query += f" AND ({patient_condition} OR {doctor_condition})"
+            params.extend(patient_params + doctor_params)
 
-        query += " ORDER BY appointment_date DESC"
-        result = self._execute_query(query, tuple(params) if params else None)
-        return [Appointment(**row) for row in result] if result else []
+        return query, tuple(params) if params else None
         
     def get_appointments_by_date(self, date: datetime) -> List[Appointment]:
-        query = """
+        scope, scope_params = self._row_scope("appointments")
+        query = f"""
         SELECT * FROM appointments 
-        WHERE DATE(appointment_date) = DATE(%s)
+        WHERE appointment_date >= %s AND appointment_date < %s AND {scope}
         """
-        result = self._execute_query(query, (date,))
-        return [Appointment(**row) for row in result] if result else []
+        result = self._execute_query(query, (*self._day_range(date), *scope_params))
+        return [Appointment.from_db_dict(row) for row in result] if result else []
 
     def get_recent_appointments(self, limit: int = 5) -> List[Appointment]:
-        query = """
+        scope, scope_params = self._row_scope("appointments")
+        query = f"""
         SELECT * FROM appointments 
+        WHERE {scope}
         ORDER BY appointment_date DESC 
         LIMIT %s
         """
-        result = self._execute_query(query, (limit,))
-        return [Appointment(**row) for row in result] if result else []
+        result = self._execute_query(query, (*scope_params, limit))
+        return [Appointment.from_db_dict(row) for row in result] if result else []
         
         if result and len(result) > 0:
             return Appointment.from_db_dict(result[0])
         return None
 
     def get_appointments_by_patient(self, patient_id: str) -> List[Appointment]:
-        query = """
+        scope, scope_params = self._row_scope("appointments", "a")
+        query = f"""
         SELECT a.*, d.name as doctor_name
         FROM appointments a
         JOIN doctors doc ON a.doctor_id = doc.doctor_id
         JOIN staff d ON doc.staff_id = d.staff_id
-        WHERE a.patient_id = %s
+        WHERE a.patient_id = %s AND {scope}
         ORDER BY a.appointment_date DESC
         """
-        result = self._execute_query(query, (patient_id,))
+        result = self._execute_query(query, (patient_id, *scope_params))
         return [Appointment.from_db_dict(row) for row in (result or [])]
 
     def get_appointments_by_doctor(self, doctor_id: str) -> List[Appointment]:
-        query = """
+        scope, scope_params = self._row_scope("appointments", "a")
+        query = f"""
         SELECT a.*, p.name as patient_name
         FROM appointments a
         JOIN patients p ON a.patient_id = p.patient_id
-        WHERE a.doctor_id = %s
+        WHERE a.doctor_id = %s AND {scope}
         ORDER BY a.appointment_date DESC
         """
-        result = self._execute_query(query, (doctor_id,))
+        result = self._execute_query(query, (doctor_id, *scope_params))
         return [Appointment.from_db_dict(row) for row in (result or [])]
 
     def update_appointment_status(self, 
                                 appointment_id: str, 
                                 status: str,
                                 notes: str = None) -> bool:
-        query = """
+        scope, scope_params = self._row_scope("appointments")
+        query = f"""
         UPDATE appointments 
         SET status = %s, notes = COALESCE(%s, notes)
-        WHERE appointment_id = %s
+        WHERE appointment_id = %s AND {scope}
         """
-        return self._execute_query(query, (status, notes, appointment_id)) is not None
+        return self._execute_query(query, (status, notes, appointment_id, *scope_params)) is not None
 
     def reschedule_appointment(self,
                              appointment_id: str,
                              new_date_time: datetime) -> bool:
-        appointment = self.get_appointment_by_id(appointment_id)
-        if not appointment:
-            return False
-            
-        query = """
-        UPDATE appointments 
-        SET appointment_date = %s, status = 'rescheduled'
-        WHERE appointment_id = %s
-        """
-        success = self._execute_query(query, (new_date_time, appointment_id)) is not None
-        
-        if success:
-            # Get patient and doctor details for notification
-            patient_data = self._get_patient_data(appointment.patient_id)
-            doctor_data = self._get_doctor_data(appointment.doctor_id)
+        with self._transaction():
+            appointment = self.get_appointment_by_id(appointment_id)
+            if not appointment:
+                self._rollback()
+                return False
+                
+            query = """
+            UPDATE appointments 
+            SET appointment_date = %s, status = 'rescheduled'
+            WHERE appointment_id = %s
+            """
+            success = self._execute_query(query, (new_date_time, appointment_id)) is not None
             
-            # Notify observers
-            self.notification_system.notify(
-                "APPOINTMENT_RESCHEDULED",
-                {
-                    "appointment_id": appointment_id,
-                    "patient": patient_data,
-                    "doctor": doctor_data,
-                    "new_date_time": new_date_time
-                }
-            )
+            if success:
+                # Get patient and doctor details for notification
+                patient_data = self._get_patient_data(appointment.patient_id)
+                doctor_data = self._get_doctor_data(appointment.doctor_id)
+
+                # Notify observers
+                self.notification_system.reschedule_appointment(
+                    appointment_id,
+                    patient_data,
+                    doctor_data,
+                    new_date_time
+                )
         
         return success
 
     def cancel_appointment(self, appointment_id: str, reason: str = None) -> bool:
-        appointment = self.get_appointment_by_id(appointment_id)
-        if not appointment:
-            return False
-            
-        success = self.update_appointment_status(appointment_id, 'cancelled', reason)
-        
-        if success:
-            self.notification_system.cancel_appointment(appointment_id, reason)
+        with self._transaction():
+            appointment = self.get_appointment_by_id(appointment_id)
+            if not appointment:
+                self._rollback()
+                return False
+                
+            success = self.update_appointment_status(appointment_id, 'cancelled', reason)
+
+            if success:
+                self.notification_system.cancel_appointment(
+                    appointment_id,
+                    reason,
+                    self._get_patient_data(appointment.patient_id),
+                    self._get_doctor_data(appointment.doctor_id),
+                    appointment.date_time
+                )
         
         return success
 
+    def _get_rows_by_ids(self, query: str, key: str, ids: set) -> Dict[str, Dict]:
+        ids = list(ids)
+        placeholders = ", ".join(["%s"] * len(ids))
+        result = self._execute_query(query.format(placeholders), tuple(ids))
+        return {row[key]: row for row in (result or [])}
+
     def _get_patient_data(self, patient_id: str) -> Dict:
-        query = "SELECT * FROM patients WHERE patient_id = %s"
-        result = self._execute_query(query, (patient_id,))
-        return result[0] if result else {}
+        # Read as the calling user: a patient or doctor outside the
+        # appointment's scope gets {} and the notification has no address
+        patient = self.patient_service.get_patient_by_id(patient_id)
+        return patient.to_dict() if patient else {}
 
     def _get_doctor_data(self, doctor_id: str) -> Dict:
-        query = """
-        SELECT d.*, s.name, s.email, s.contact_number
-        FROM doctors d
-        JOIN staff s ON d.staff_id = s.staff_id
-        WHERE d.doctor_id = %s
-        """
-        result = self._execute_query(query, (doctor_id,))
-        return result[0] if result else {}
+        doctor = self.doctor_service.get_doctor_by_id(doctor_id)
+        return doctor.to_dict() if doctor else {}
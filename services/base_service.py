@@ -1,17 +1,171 @@
+import copy
+import threading
+from ..auth.row_scope import row_scope
+from ..config import CACHE_CONFIG
 from ..patterns.singleton import DatabaseManager
-from typing import Optional, List, TypeVar, Generic, Dict
+from .cache import LRUCache
+from .id_allocator import IdAllocator
+from .pagination import Page, encode_cursor, decode_cursor, keyset_predicate
+from typing import Optional, List, TypeVar, Generic, Dict, Iterator, Callable, Sequence, Tuple
+from datetime import date, datetime, timedelta
 
 T = TypeVar('T')
 
 class BaseService(Generic[T]):
+    # Entity caches are shared by every service instance, keyed by entity type
+    _caches: Dict[str, LRUCache] = {}
+    _caches_lock = threading.Lock()
+
     def __init__(self):
         self.db = DatabaseManager.get_instance()
+        # Set to False (e.g. in tests) to always read through to the database
+        self.cache_enabled = True
+
+    @classmethod
+    def _get_cache(cls, namespace: str) -> LRUCache:
+        with BaseService._caches_lock:
+            cache = BaseService._caches.get(namespace)
+            if cache is None:
+                cache = LRUCache(**CACHE_CONFIG)
+                BaseService._caches[namespace] = cache
+            return cache
+
+    def _written(self) -> Optional[set]:
+        """(namespace, key) pairs the current transaction has written; None outside one"""
+        local = self.db.transaction_local()
+        return None if local is None else local.setdefault('written', set())
+
+    def _cached(self, namespace: str, key, loader: Callable[[], Optional[T]]):
+        """Read-through lookup: return the cached value or load and cache it.
+
+        Inside a transaction, rows it has not written are committed data and
+        are cached as usual; a row it wrote (see _invalidate) may still roll
+        back, so it is read from the database and never cached.
+        """
+        if not self.cache_enabled:
+            return loader()
+
+        written = self._written()
+        if written and ((namespace, key) in written or (namespace, None) in written):
+            return loader()
+
+        cache = self._get_cache(namespace)
+        value = cache.get(key)
+        if value is None:
+            value = loader()
+            if value is None:
+                return value
+            cache.set(key, value)
+        # Callers may mutate what they get back, so never hand out the cached object
+        return copy.deepcopy(value)
+
+    def _invalidate(self, namespace: str, key=None):
+        """Drop one cached entry, or the whole namespace when key is None.
+
+        Call it for every row written, new ones included. Inside a
+        transaction the entry is marked written, so this transaction stops
+        using the cache for it, and is dropped once it commits, so other
+        threads cannot re-cache the old row in between; a rollback leaves
+        the cache untouched.
+        """
+        written = self._written()
+        if written is not None:
+            written.add((namespace, key))
+        cache = self._get_cache(namespace)
+        if key is None:
+            self.db.on_commit(cache.clear)
+        else:
+            self.db.on_commit(lambda: cache.invalidate(key))
+
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, Dict]:
+        with BaseService._caches_lock:
+            caches = dict(BaseService._caches)
+        return {namespace: cache.get_stats() for namespace, cache in caches.items()}
+
+    def _row_scope(self, table: str, alias: Optional[str] = None) -> Tuple[str, List]:
+        """Predicate limiting ``table`` to the current user's rows (see auth.row_scope).
+
+        Raises PermissionError when no user is bound to the current context.
+        """
+        return row_scope(table, alias)
 
     def _execute_query(self, query: str, params: tuple = None) -> Optional[List[Dict]]:
         return self.db.execute_query(query, params)
 
+    def _iter_query(self, query: str, params: tuple = None,
+                    batch_size: int = 1000) -> Iterator[Dict]:
+        return self.db.iter_query(query, params, batch_size)
+
+    def _fetch_page(self, query: str, params: Optional[tuple],
+                    order_by: Sequence[str],
+                    row_mapper: Callable[[Dict], T],
+                    page_size: int = 100,
+                    cursor: Optional[str] = None,
+                    descending: bool = False) -> Page[T]:
+        """Fetch one keyset page of ``query``.
+
+        ``query`` must end in a WHERE clause (``WHERE 1=1`` is fine) and have
+        no ORDER BY; ``order_by`` lists the sort columns, the last of which
+        must be unique so the cursor identifies exactly one row.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+
+        params = list(params or [])
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(order_by):
+                raise ValueError("Page cursor does not match this listing")
+            predicate, predicate_params = keyset_predicate(order_by, values, descending)
+            query += f" AND {predicate}"
+            params.extend(predicate_params)
+
+        direction = "DESC" if descending else "ASC"
+        query += " ORDER BY " + ", ".join(f"{column} {direction}" for column in order_by)
+        # Fetch one extra row to learn whether another page exists
+        query += " LIMIT %s"
+        params.append(page_size + 1)
+
+        rows = self._execute_query(query, tuple(params)) or []
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_cursor = encode_cursor([last[column.split('.')[-1]] for column in order_by])
+        return Page([row_mapper(row) for row in rows], next_cursor)
+
+    def _count(self, query: str, params: Optional[tuple] = None) -> int:
+        """Count the rows ``query`` would return"""
+        result = self._execute_query(f"SELECT COUNT(*) AS count FROM ({query}) AS counted", params)
+        return result[0]['count'] if result else 0
+
+    @staticmethod
+    def _day_range(start: date, end: Optional[date] = None) -> Tuple[datetime, datetime]:
+        """Half-open [start 00:00, day after end 00:00) range covering whole days.
+
+        Comparing the raw column against these bounds keeps date filters
+        sargable, unlike wrapping the column in DATE().
+        """
+        end = start if end is None else end
+        lower = datetime(start.year, start.month, start.day)
+        upper = datetime(end.year, end.month, end.day) + timedelta(days=1)
+        return lower, upper
+
+    def _execute_many(self, query: str, params_list: List[tuple],
+                      chunk_size: int = 500) -> Optional[List[Dict]]:
+        return self.db.execute_many(query, params_list, chunk_size)
+
+    def _transaction(self):
+        return self.db.transaction()
+
+    def _rollback(self):
+        """Discard the current transaction's writes when its block exits"""
+        self.db.set_rollback_only()
+
     def _generate_id(self, prefix: str, table: str) -> str:
-        query = f"SELECT COUNT(*) as count FROM {table}"
-        result = self._execute_query(query)
-        count = result[0]['count'] if result else 0
-        return f"{prefix}{str(count + 1).zfill(4)}"
+        return IdAllocator().next_id(prefix, table)
+
+    def _generate_ids(self, prefix: str, table: str, count: int) -> List[str]:
+        """Reserve ``count`` IDs with at most one round trip"""
+        return IdAllocator().next_ids(prefix, table, count)
@@ -1,6 +1,8 @@
 from typing import List, Optional, Dict
 from ..models import Doctor
 from .base_service import BaseService
+from .pagination import Page
+from .search import match_condition, relevance_expression
 from datetime import date
 
 class DoctorService(BaseService[Doctor]):
@@ -12,41 +14,49 @@ class DoctorService(BaseService[Doctor]):
                      specialization: str,
                      qualifications: List[str],
                      consultation_fee: float) -> Optional[Doctor]:
-        staff_id = self._generate_id("STF", "staff")
-        doctor_id = self._generate_id("DOC", "doctors")
-        
-        # First create staff record
-        staff_query = """
-        INSERT INTO staff (
-            staff_id, name, role, department_id, 
-            contact_number, email, date_joined
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        staff_params = (
-            staff_id, name, "Doctor", department_id,
-            contact_number, email, date.today()
-        )
-        
-        if self._execute_query(staff_query, staff_params) is None:
-            return None
+        with self._transaction():
+            staff_id = self._generate_id("STF", "staff")
+            doctor_id = self._generate_id("DOC", "doctors")
             
-        # Then create doctor record
-        doctor_query = """
-        INSERT INTO doctors (
-            doctor_id, staff_id, specialization,
-            qualification, consultation_fee
-        ) VALUES (%s, %s, %s, %s, %s)
-        """
-        doctor_params = (
-            doctor_id, staff_id, specialization,
-            ','.join(qualifications), consultation_fee
-        )
-        
-        if self._execute_query(doctor_query, doctor_params) is not None:
-            return self.get_doctor_by_id(doctor_id)
-        return None
+            # First create staff record
+            staff_query = """
+            INSERT INTO staff (
+                staff_id, name, role, department_id, 
+                contact_number, email, date_joined
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """
+            staff_params = (
+                staff_id, name, "Doctor", department_id,
+                contact_number, email, date.today()
+            )
+            
+            if self._execute_query(staff_query, staff_params) is None:
+                self._rollback()
+                return None
+                
+            # Then create doctor record
+            doctor_query = """
+            INSERT INTO doctors (
+                doctor_id, staff_id, specialization,
+                qualification, consultation_fee
+            ) VALUES (%s, %s, %s, %s, %s)
+            """
+            doctor_params = (
+                doctor_id, staff_id, specialization,
+                ','.join(qualifications), consultation_fee
+            )
+            
+            if self._execute_query(doctor_query, doctor_params) is None:
+                self._rollback()
+                return None
+
+            self._invalidate("doctors", doctor_id)
+        return self.get_doctor_by_id(doctor_id)
 
     def get_doctor_by_id(self, doctor_id: str) -> Optional[Doctor]:
+        return self._cached("doctors", doctor_id, lambda: self._load_doctor(doctor_id))
+
+    def _load_doctor(self, doctor_id: str) -> Optional[Doctor]:
         query = """
         SELECT d.*, s.name, s.contact_number, s.email, s.department_id,
                s.date_joined
@@ -80,83 +90,137 @@ class DoctorService(BaseService[Doctor]):
         result = self._execute_query(query)
         return [Doctor.from_db_dict(row) for row in result] if result else []
 
-    def update_doctor(self, doctor: Doctor) -> bool:
-        # Update staff information
-        staff_query = """
-        UPDATE staff 
-        SET name = %s, department_id = %s,
-            contact_number = %s, email = %s
-        WHERE staff_id = %s
+    def get_doctors_page(self, page_size: int = 100,
+                         cursor: Optional[str] = None) -> Page[Doctor]:
+        query = """
+        SELECT d.*, s.name, s.contact_number, s.email, s.department_id,
+               s.date_joined
+        FROM doctors d
+        JOIN staff s ON d.staff_id = s.staff_id
+        WHERE 1=1
         """
-        staff_params = (
-            doctor.name, doctor.department_id,
-            doctor.contact_number, doctor.email,
-            doctor.staff_id
-        )
-        
-        if self._execute_query(staff_query, staff_params) is None:
-            return False
+        return self._fetch_page(query, None, ["d.doctor_id"], Doctor.from_db_dict,
+                                page_size, cursor)
+
+    def count_doctors(self) -> int:
+        return self._count("SELECT doctor_id FROM doctors")
+
+    def update_doctor(self, doctor: Doctor) -> bool:
+        with self._transaction():
+            # Update staff information
+            staff_query = """
+            UPDATE staff 
+            SET name = %s, department_id = %s,
+                contact_number = %s, email = %s
+            WHERE staff_id = %s
+            """
+            staff_params = (
+                doctor.name, doctor.department_id,
+                doctor.contact_number, doctor.email,
+                doctor.staff_id
+            )
             
-        # Update doctor information
-        doctor_query = """
-        UPDATE doctors 
-        SET specialization = %s, qualification = %s,
-            consultation_fee = %s
-        WHERE doctor_id = %s
-        """
-        doctor_params = (
-            doctor.specialization,
-            ','.join(doctor.qualifications),
-            doctor.consultation_fee,
-            doctor.doctor_id
-        )
-        
-        return self._execute_query(doctor_query, doctor_params) is not None
+            if self._execute_query(staff_query, staff_params) is None:
+                self._rollback()
+                return False
+                
+            # Update doctor information
+            doctor_query = """
+            UPDATE doctors 
+            SET specialization = %s, qualification = %s,
+                consultation_fee = %s
+            WHERE doctor_id = %s
+            """
+            doctor_params = (
+                doctor.specialization,
+                ','.join(doctor.qualifications),
+                doctor.consultation_fee,
+                doctor.doctor_id
+            )
+            
+            if self._execute_query(doctor_query, doctor_params) is None:
+                self._rollback()
+                return False
+
+            self._invalidate("doctors", doctor.doctor_id)
+        return True
 
     def delete_doctor(self, doctor_id: str) -> bool:
-        # Get staff_id first
-        query = "SELECT staff_id FROM doctors WHERE doctor_id = %s"
-        result = self._execute_query(query, (doctor_id,))
-        
-        if not result:
-            return False
+        with self._transaction():
+            # Get staff_id first
+            query = "SELECT staff_id FROM doctors WHERE doctor_id = %s FOR UPDATE"
+            result = self._execute_query(query, (doctor_id,))
             
-        staff_id = result[0]['staff_id']
-        
-        # Delete doctor record
-        doctor_query = "DELETE FROM doctors WHERE doctor_id = %s"
-        if self._execute_query(doctor_query, (doctor_id,)) is None:
-            return False
+            if not result:
+                self._rollback()
+                return False
+                
+            staff_id = result[0]['staff_id']
             
-        # Delete staff record
-        staff_query = "DELETE FROM staff WHERE staff_id = %s"
-        return self._execute_query(staff_query, (staff_id,)) is not None
+            # Delete doctor record
+            doctor_query = "DELETE FROM doctors WHERE doctor_id = %s"
+            if self._execute_query(doctor_query, (doctor_id,)) is None:
+                self._rollback()
+                return False
+                
+            # Delete staff record
+            staff_query = "DELETE FROM staff WHERE staff_id = %s"
+            if self._execute_query(staff_query, (staff_id,)) is None:
+                self._rollback()
+                return False
+
+            self._invalidate("doctors", doctor_id)
+        return True
 
     def get_doctor_schedule(self, doctor_id: str, date: date) -> List[Dict]:
         query = """
         SELECT * FROM appointments 
         WHERE doctor_id = %s 
-        AND DATE(appointment_date) = %s
+        AND appointment_date >= %s AND appointment_date < %s
         """
-        result = self._execute_query(query, (doctor_id, date))
+        result = self._execute_query(query, (doctor_id, *self._day_range(date)))
         return result or []
         
     def get_departments(self) -> List[Dict]:
         """Get all departments from the database"""
+        return self._cached("departments", "all", self._load_departments) or []
+
+    def _load_departments(self) -> List[Dict]:
         query = "SELECT department_id, name FROM departments"
-        result = self._execute_query(query)
-        return result or []
+        return self._execute_query(query)
 
-    def search_doctors(self, search_term: str) -> List[Doctor]:
-        query = """
-        SELECT d.*, s.name, s.contact_number, s.email, s.department_id
-        FROM doctors d
+    def search_doctors(self, search_term: str, limit: int = 100) -> List[Doctor]:
+        """Best matches first for a doctor's name or specialization"""
+        name_condition, name_params = match_condition(("s.name",), search_term)
+        spec_condition, spec_params = match_condition(("d.specialization",), search_term)
+        name_score, name_score_params = relevance_expression(("s.name",), search_term)
+        spec_score, spec_score_params = relevance_expression(("d.specialization",), search_term)
+        # MATCH can only use one table's FULLTEXT index, so each index is
+        # searched on its own and the hits are merged per doctor
+        query = f"""
+        SELECT d.*, s.name, s.contact_number, s.email, s.department_id,
+               s.date_joined, hits.relevance
+        FROM (
+            SELECT doctor_id, SUM(relevance) AS relevance
+            FROM (
+                SELECT d.doctor_id, {name_score} AS relevance
+                FROM doctors d
+                JOIN staff s ON d.staff_id = s.staff_id
+                WHERE {name_condition}
+                UNION ALL
+                SELECT d.doctor_id, {spec_score} AS relevance
+                FROM doctors d
+                WHERE {spec_condition}
+            ) matches
+            GROUP BY doctor_id
+        ) hits
+        JOIN doctors d ON d.doctor_id = hits.doctor_id
         JOIN staff s ON d.staff_id = s.staff_id
-        WHERE s.name LIKE %s 
-        OR d.specialization LIKE %s
+        ORDER BY hits.relevance DESC, d.doctor_id
+        LIMIT %s
         """
-        search_pattern = f"%{search_term}%"
-        params = (search_pattern, search_pattern)
-        
+        params = tuple(name_score_params + name_params +
+                       spec_score_params + spec_params + [limit])
+
         result = self._execute_query(query, params)
-        return [Doctor(**row) for row in result] if result else []
+        return [Doctor.from_db_dict(row) for row in result] if result else []
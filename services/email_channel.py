@@ -0,0 +1,265 @@
+import smtplib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from string import Formatter
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from ..config import SMTP_CONFIG
+from ..patterns.observer import EmailNotifier, PartialDeliveryError
+
+def _is_transient(error: Exception) -> bool:
+    """True for failures worth retrying: 4xx replies, dropped sessions, socket errors"""
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtplib.SMTPException):
+        return False
+    return isinstance(error, OSError)
+
+def _session_usable(error: Exception) -> bool:
+    """Whether the SMTP session survives the error (the server merely said no).
+
+    A 421 reply means the server is closing the connection, and smtplib
+    has already closed its end.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code != 421 for code, _ in error.recipients.values())
+    return isinstance(error, smtplib.SMTPResponseException) \
+        and not isinstance(error, smtplib.SMTPConnectError) and error.smtp_code != 421
+
+class SMTPConnectionPool:
+    """Up to ``pool_size`` persistent, logged-in SMTP sessions reused across sends"""
+
+    def __init__(self, host: str, port: int, username: Optional[str] = None,
+                 password: Optional[str] = None, use_tls: bool = False,
+                 pool_size: int = 4, timeout: float = 10.0):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle: Deque[smtplib.SMTP] = deque()
+        self._cond = threading.Condition()
+        self._open = 0
+        self.connects = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.use_tls:
+                smtp.starttls()
+                smtp.ehlo()
+            if self.username:
+                smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    def acquire(self) -> smtplib.SMTP:
+        with self._cond:
+            while not self._idle and self._open >= self.pool_size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._open += 1
+            self.connects += 1
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, smtp: smtplib.SMTP, broken: bool = False):
+        if broken:
+            smtp.close()
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            self._idle.append(smtp)
+            self._cond.notify()
+
+    def close_all(self):
+        with self._cond:
+            while self._idle:
+                smtp = self._idle.popleft()
+                self._open -= 1
+                try:
+                    smtp.quit()
+                except (smtplib.SMTPException, OSError):
+                    smtp.close()
+
+class SMTPEmailNotifier(EmailNotifier):
+    """EmailNotifier that really sends mail over SMTP.
+
+    A batch is split across the pooled sessions and each session sends its
+    share back to back without reconnecting. Message bodies come from
+    EmailNotifier.TEMPLATES, parsed once per event type. Transient failures
+    (4xx replies, dropped connections) are retried with exponential backoff
+    on a fresh session if needed; permanent rejections are logged and
+    dropped. If transient failures remain after ``max_retries`` the batch
+    raises PartialDeliveryError naming those events, so the caller (the
+    outbox) retries only them later.
+    """
+
+    def __init__(self, pool: Optional[SMTPConnectionPool] = None,
+                 sender: str = SMTP_CONFIG['sender'],
+                 max_retries: int = SMTP_CONFIG['max_retries'],
+                 retry_delay: float = SMTP_CONFIG['retry_delay']):
+        self.pool = pool or SMTPConnectionPool(
+            SMTP_CONFIG['host'], SMTP_CONFIG['port'],
+            SMTP_CONFIG['username'], SMTP_CONFIG['password'],
+            SMTP_CONFIG['use_tls'], SMTP_CONFIG['pool_size'], SMTP_CONFIG['timeout']
+        )
+        self.sender = sender
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._templates: Dict[str, Tuple[str, Callable[[dict], str]]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.rejected = 0
+        self.undelivered = 0
+        self.retries = 0
+        self.skipped = 0
+
+    def _template(self, event_type: str) -> Tuple[str, Callable[[dict], str]]:
+        """(subject, render) for an event type, compiled on first use"""
+        compiled = self._templates.get(event_type)
+        if compiled is not None:
+            return compiled
+
+        subject = f"Hospital Management System - {event_type}"
+        template = self.TEMPLATES.get(event_type)
+        if template is None:
+            def render(data: dict) -> str:
+                return self._generate_message(event_type, data)
+        else:
+            pieces = [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+            def render(data: dict) -> str:
+                parts = []
+                for literal, field in pieces:
+                    parts.append(literal)
+                    if field is not None:
+                        parts.append(str(data.get(field)))
+                return ''.join(parts)
+
+        compiled = self._templates[event_type] = (subject, render)
+        return compiled
+
+    def _build_message(self, event_type: str, data: dict) -> Optional[EmailMessage]:
+        recipient = data.get('email')
+        if not recipient:
+            return None
+        subject, render = self._template(event_type)
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = recipient
+        message['Subject'] = subject
+        message.set_content(render(data))
+        return message
+
+    def update(self, event_type: str, data: dict):
+        self.update_batch([(event_type, data)])
+
+    def update_batch(self, events: List[Tuple[str, dict]]):
+        # (position in the batch, message) so failures can be reported per event
+        messages = [(position, self._build_message(event_type, data))
+                    for position, (event_type, data) in enumerate(events)]
+        sendable = [(position, message) for position, message in messages
+                    if message is not None]
+        with self._lock:
+            self.skipped += len(messages) - len(sendable)
+        if not sendable:
+            return
+
+        sessions = min(self.pool.pool_size, len(sendable))
+        runs = [sendable[i::sessions] for i in range(sessions)]
+        if sessions == 1:
+            undelivered = self._send_run(runs[0])
+        else:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.pool.pool_size,
+                                                        thread_name_prefix="smtp")
+            undelivered = [position for failed in self._executor.map(self._send_run, runs)
+                           for position in failed]
+
+        if undelivered:
+            raise PartialDeliveryError(
+                undelivered,
+                f"{len(undelivered)} of {len(events)} email(s) not delivered "
+                f"after {self.max_retries} retries")
+
+    def _send_run(self, messages: List[Tuple[int, EmailMessage]]) -> List[int]:
+        """Send messages over one pooled session; returns the positions still undelivered"""
+        undelivered: List[int] = []
+        smtp = None
+        try:
+            for position, message in messages:
+                attempt = 0
+                while True:
+                    try:
+                        if smtp is None:
+                            smtp = self.pool.acquire()
+                        smtp.send_message(message)
+                        with self._lock:
+                            self.sent += 1
+                        break
+                    except Exception as e:
+                        if smtp is not None and not _session_usable(e):
+                            self.pool.release(smtp, broken=True)
+                            smtp = None
+                        if not _is_transient(e):
+                            print(f"Email to {message['To']} rejected: {e}")
+                            with self._lock:
+                                self.rejected += 1
+                            break
+                        if attempt >= self.max_retries:
+                            print(f"Email to {message['To']} failed: {e}")
+                            with self._lock:
+                                self.undelivered += 1
+                            undelivered.append(position)
+                            break
+                        time.sleep(self.retry_delay * 2 ** attempt)
+                        attempt += 1
+                        with self._lock:
+                            self.retries += 1
+        finally:
+            if smtp is not None:
+                self.pool.release(smtp)
+        return undelivered
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'sent': self.sent,
+                'rejected': self.rejected,
+                'undelivered': self.undelivered,
+                'retries': self.retries,
+                'skipped': self.skipped,
+                'connects': self.pool.connects
+            }
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown()
+        self.pool.close_all()
@@ -0,0 +1,130 @@
+import threading
+from typing import Dict, List, Tuple
+from mysql.connector import Error
+from ..config import DB_CONFIG, DB_POOL_CONFIG, ID_ALLOCATOR_CONFIG
+from ..patterns.connection_pool import ConnectionPool
+
+# Primary key column of each table that uses prefixed IDs
+ID_COLUMNS = {
+    'patients': 'patient_id',
+    'doctors': 'doctor_id',
+    'staff': 'staff_id',
+    'appointments': 'appointment_id',
+    'medical_records': 'record_id'
+}
+
+class IdAllocator:
+    """Process-wide hi/lo allocator for prefixed IDs such as ``PAT0001``.
+
+    Blocks of ``block_size`` numbers are reserved per prefix in the
+    ``id_sequences`` table with one short transaction, then handed out from
+    memory. Reservations run on a dedicated connection of their own, so the
+    sequence row lock is released at once and a caller already holding a
+    pooled connection inside a transaction never waits for a second one.
+    Numbers are never reused, so deletes and concurrent processes
+    cannot produce duplicate IDs; unused numbers in a block are skipped when
+    the process exits.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super(IdAllocator, cls).__new__(cls)
+                    cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self._pool = ConnectionPool(pool_size=1,
+                                    validate_after=DB_POOL_CONFIG['validate_after'],
+                                    checkout_timeout=DB_POOL_CONFIG['checkout_timeout'],
+                                    **DB_CONFIG)
+        self.block_size = ID_ALLOCATOR_CONFIG['block_size']
+        self._blocks: Dict[str, Tuple[int, int]] = {}  # prefix -> (next, limit)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, prefix: str) -> threading.Lock:
+        with self._locks_guard:
+            if prefix not in self._locks:
+                self._locks[prefix] = threading.Lock()
+            return self._locks[prefix]
+
+    @staticmethod
+    def format_id(prefix: str, number: int) -> str:
+        return f"{prefix}{str(number).zfill(4)}"
+
+    def next_id(self, prefix: str, table: str) -> str:
+        return self.next_ids(prefix, table, 1)[0]
+
+    def next_ids(self, prefix: str, table: str, count: int) -> List[str]:
+        """Hand out ``count`` IDs, reserving a new block only when needed"""
+        numbers: List[int] = []
+        with self._lock_for(prefix):
+            next_value, limit = self._blocks.get(prefix, (0, 0))
+            take = min(count, limit - next_value)
+            numbers.extend(range(next_value, next_value + take))
+            next_value += take
+
+            remaining = count - take
+            if remaining:
+                # Reserve everything still needed plus a fresh block in one go
+                reserve = remaining + self.block_size
+                start = self._reserve(prefix, table, reserve)
+                numbers.extend(range(start, start + remaining))
+                next_value, limit = start + remaining, start + reserve
+
+            self._blocks[prefix] = (next_value, limit)
+        return [self.format_id(prefix, number) for number in numbers]
+
+    def _reserve(self, prefix: str, table: str, size: int) -> int:
+        """Atomically advance the sequence for ``prefix`` and return the old value"""
+        # Callers hold the per-prefix lock, so at most one reservation per
+        # prefix is in flight; other prefixes queue for the connection briefly
+        with self._pool.connection() as pooled:
+            cursor = pooled.cursor(dictionary=True)
+            try:
+                pooled.queries += 1
+                pooled.connection.start_transaction()
+                select = "SELECT next_value FROM id_sequences WHERE prefix = %s FOR UPDATE"
+                cursor.execute(select, (prefix,))
+                row = cursor.fetchone()
+                if row is None:
+                    # First use of this prefix; INSERT IGNORE lets a concurrent
+                    # seeder win without failing this transaction
+                    cursor.execute(
+                        "INSERT IGNORE INTO id_sequences (prefix, next_value) VALUES (%s, %s)",
+                        (prefix, self._seed_value(cursor, prefix, table))
+                    )
+                    cursor.execute(select, (prefix,))
+                    row = cursor.fetchone()
+
+                start = row['next_value']
+                cursor.execute(
+                    "UPDATE id_sequences SET next_value = %s WHERE prefix = %s",
+                    (start + size, prefix)
+                )
+                pooled.connection.commit()
+                return start
+            except Error:
+                pooled.errors += 1
+                try:
+                    pooled.connection.rollback()
+                except Error:
+                    pooled.broken = True
+                raise
+            finally:
+                cursor.close()
+
+    def _seed_value(self, cursor, prefix: str, table: str) -> int:
+        """First free number for a prefix, derived from the IDs already in use"""
+        column = ID_COLUMNS[table]
+        cursor.execute(
+            f"SELECT COALESCE(MAX(CAST(SUBSTRING({column}, %s) AS UNSIGNED)), 0) AS max_id "
+            f"FROM {table} WHERE {column} LIKE %s",
+            (len(prefix) + 1, f"{prefix}%")
+        )
+        row = cursor.fetchone()
+        return int(row['max_id']) + 1 if row else 1
@@ -1,7 +1,9 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Iterator, Tuple
 from datetime import date
 from ..models import MedicalRecord
 from .base_service import BaseService
+from .pagination import Page
+from .search import match_condition
 
 class MedicalRecordService(BaseService[MedicalRecord]):
     def create_record(self,
@@ -28,31 +30,81 @@ class MedicalRecordService(BaseService[MedicalRecord]):
         return None
 
     def get_record_by_id(self, record_id: str) -> Optional[MedicalRecord]:
-        query = """
-        SELECT * FROM medical_records WHERE record_id = %s
+        scope, scope_params = self._row_scope("medical_records")
+        query = f"""
+        SELECT * FROM medical_records WHERE record_id = %s AND {scope}
         """
-        result = self._execute_query(query, (record_id,))
+        result = self._execute_query(query, (record_id, *scope_params))
         
         if result and len(result) > 0:
             return MedicalRecord.from_db_dict(result[0])
         return None
 
     def get_patient_records(self, patient_id: str) -> List[MedicalRecord]:
-        query = """
+        scope, scope_params = self._row_scope("medical_records", "mr")
+        query = f"""
         SELECT mr.*, d.name as doctor_name
         FROM medical_records mr
         JOIN doctors doc ON mr.doctor_id = doc.doctor_id
         JOIN staff d ON doc.staff_id = d.staff_id
-        WHERE mr.patient_id = %s
+        WHERE mr.patient_id = %s AND {scope}
         ORDER BY mr.visit_date DESC
         """
-        result = self._execute_query(query, (patient_id,))
+        result = self._execute_query(query, (patient_id, *scope_params))
         return [MedicalRecord.from_db_dict(row) for row in (result or [])]
 
     def search_records(self, patient_search: Optional[str] = None,
                       doctor_search: Optional[str] = None,
                       start_date: Optional[date] = None,
-                      end_date: Optional[date] = None) -> List[MedicalRecord]:
+                      end_date: Optional[date] = None,
+                      text_search: Optional[str] = None) -> List[MedicalRecord]:
+        query, params = self._build_records_query(patient_search, doctor_search, start_date,
+                                                  end_date, text_search)
+        query += " ORDER BY mr.visit_date DESC"
+        result = self._execute_query(query, params)
+        return [MedicalRecord.from_db_dict(row) for row in (result or [])]
+
+    def search_records_page(self, patient_search: Optional[str] = None,
+                            doctor_search: Optional[str] = None,
+                            start_date: Optional[date] = None,
+                            end_date: Optional[date] = None,
+                            text_search: Optional[str] = None,
+                            page_size: int = 100,
+                            cursor: Optional[str] = None) -> Page[MedicalRecord]:
+        """Newest-first page of records matching the search_records filters"""
+        query, params = self._build_records_query(patient_search, doctor_search, start_date,
+                                                  end_date, text_search)
+        return self._fetch_page(query, params, ["mr.visit_date", "mr.record_id"],
+                                MedicalRecord.from_db_dict, page_size, cursor,
+                                descending=True)
+
+    def count_records(self, patient_search: Optional[str] = None,
+                      doctor_search: Optional[str] = None,
+                      start_date: Optional[date] = None,
+                      end_date: Optional[date] = None,
+                      text_search: Optional[str] = None) -> int:
+        query, params = self._build_records_query(patient_search, doctor_search, start_date,
+                                                  end_date, text_search)
+        return self._count(query, params)
+
+    def iter_records(self, patient_search: Optional[str] = None,
+                     doctor_search: Optional[str] = None,
+                     start_date: Optional[date] = None,
+                     end_date: Optional[date] = None,
+                     text_search: Optional[str] = None,
+                     batch_size: int = 1000) -> Iterator[MedicalRecord]:
+        """Stream records matching the same filters as search_records"""
+        query, params = self._build_records_query(patient_search, doctor_search, start_date,
+                                                  end_date, text_search)
+        query += " ORDER BY mr.visit_date DESC"
+        for row in self._iter_query(query, params, batch_size):
+            yield MedicalRecord.from_db_dict(row)
+
+    def _build_records_query(self, patient_search: Optional[str],
+                             doctor_search: Optional[str],
+                             start_date: Optional[date],
+                             end_date: Optional[date],
+                             text_search: Optional[str] = None) -> Tuple[str, Optional[tuple]]:
         query = """
         SELECT mr.*, p.name as patient_name, d.name as doctor_name
         FROM medical_records mr
@@ -61,46 +113,56 @@ class MedicalRecordService(BaseService[MedicalRecord]):
         JOIN patients p ON mr.patient_id = p.patient_id
         WHERE 1=1
         """
-        params = []
+        scope, params = self._row_scope("medical_records", "mr")
+        query += f" AND {scope}"
 
         if patient_search:
-            query += " AND p.name LIKE %s"
-            params.append(f"%{patient_search}%")
+            condition, condition_params = match_condition(("p.name",), patient_search)
+            query += f" AND {condition}"
+            params.extend(condition_params)
 
         if doctor_search:
-            query += " AND d.name LIKE %s"
-            params.append(f"%{doctor_search}%")
+            condition, condition_params = match_condition(("d.name",), doctor_search)
+            query += f" AND {condition}"
+            params.extend(condition_params)
+
+        if text_search:
+            condition, condition_params = match_condition(("mr.diagnosis", "mr.notes"), text_search)
+            query += f" AND {condition}"
+            params.extend(condition_params)
 
         if start_date and end_date:
-            query += " AND mr.visit_date BETWEEN %s AND %s"
-            params.extend([start_date, end_date])
+            query += " AND mr.visit_date >= %s AND mr.visit_date < %s"
+            # visit_date is a DATE column, so compare against plain dates
+            params.extend(bound.date() for bound in self._day_range(start_date, end_date))
 
-        query += " ORDER BY mr.visit_date DESC"
-        result = self._execute_query(query, tuple(params) if params else None)
-        return [MedicalRecord.from_db_dict(row) for row in (result or [])]
+        return query, tuple(params) if params else None
 
     def get_doctor_records(self, doctor_id: str) -> List[MedicalRecord]:
-        query = """
+        scope, scope_params = self._row_scope("medical_records", "mr")
+        query = f"""
         SELECT mr.*, p.name as patient_name
         FROM medical_records mr
         JOIN patients p ON mr.patient_id = p.patient_id
-        WHERE mr.doctor_id = %s
+        WHERE mr.doctor_id = %s AND {scope}
         ORDER BY mr.visit_date DESC
         """
-        result = self._execute_query(query, (doctor_id,))
+        result = self._execute_query(query, (doctor_id, *scope_params))
         return [MedicalRecord.from_db_dict(row) for row in (result or [])]
 
     def update_record(self, record: MedicalRecord) -> bool:
-        query = """
+        scope, scope_params = self._row_scope("medical_records")
+        query = f"""
         UPDATE medical_records 
         SET diagnosis = %s, prescription = %s, notes = %s
-        WHERE record_id = %s
+        WHERE record_id = %s AND {scope}
         """
         params = (
             record.diagnosis,
             str(record.prescriptions),
             record.notes,
-            record.record_id
+            record.record_id,
+            *scope_params
         )
         return self._execute_query(query, params) is not None
 
@@ -0,0 +1,342 @@
+import json
+import os
+import queue
+import socket
+import threading
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from mysql.connector import Error
+from ..config import OUTBOX_CONFIG, SMTP_CONFIG
+from ..patterns.observer import Observer, EmailNotifier, SMSNotifier, PartialDeliveryError
+from ..patterns.notification_coalescer import CoalescingNotifier
+from ..patterns.singleton import DatabaseManager
+from .email_channel import SMTPEmailNotifier
+
+class NotificationOutbox(Observer):
+    """Observer that records events in ``notification_outbox`` instead of sending them.
+
+    Rows go through DatabaseManager, so an event raised inside a transaction
+    is committed or rolled back together with the change it describes. One
+    row is written per channel so each channel is retried independently;
+    OutboxDrainer delivers them. Each row records its recipient, the
+    payload field named in RECIPIENT_KEYS for its channel.
+    """
+
+    # channel -> payload field holding the address it delivers to
+    RECIPIENT_KEYS = {'email': 'email', 'sms': 'phone'}
+
+    INSERT = """
+    INSERT INTO notification_outbox (event_type, channel, recipient, payload, created_at)
+    VALUES (%s, %s, %s, %s, %s)
+    """
+
+    def __init__(self, channels: Sequence[str] = OUTBOX_CONFIG['channels']):
+        self.channels = list(channels)
+        self.db = DatabaseManager.get_instance()
+
+    def update(self, event_type: str, data: dict):
+        self.update_batch([(event_type, data)])
+
+    def update_batch(self, events: List[Tuple[str, dict]]):
+        now = datetime.now()
+        rows = [
+            (event_type, channel, data.get(self.RECIPIENT_KEYS.get(channel)) or '',
+             json.dumps(data, default=str), now)
+            for event_type, data in events
+            for channel in self.channels
+        ]
+        if rows:
+            self.db.execute_many(self.INSERT, rows)
+
+class OutboxDrainer:
+    """Process-wide background worker delivering pending outbox rows.
+
+    Rows are claimed per recipient: once a recipient's oldest due row is
+    ``coalesce_window`` seconds old, all of that recipient's due rows on the
+    channel are claimed together, however many polls the burst arrived over,
+    and CoalescingNotifier merges them into one message. Each pass takes up
+    to ``batch_size`` recipients with ``SELECT ... FOR UPDATE SKIP LOCKED``
+    and stamps the rows with a lease, so concurrent drainers never share a
+    row and rows held by a crashed drainer become due again once the lease
+    expires. Claimed rows are handed to their channel in one
+    ``update_batch`` call and marked sent in a single UPDATE. Failed rows are
+    retried with exponential backoff until ``max_attempts``; a retried row
+    is due at once, so it goes out with anything newer for its recipient.
+    Delivery is at-least-once: a crash after sending but before marking sent
+    repeats that batch.
+
+    Once started, one thread claims and each channel has its own bounded
+    queue of claimed batches and ``channel_workers`` threads delivering
+    them, so a slow channel never holds up the others. When a channel has
+    ``max_pending_batches`` waiting, its rows are left in the table (nothing
+    is dropped) until a worker catches up. flush() waits for the queued
+    batches and delivers whatever else is due.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super(OutboxDrainer, cls).__new__(cls)
+                    cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self.db = DatabaseManager.get_instance()
+        email = SMTPEmailNotifier() if SMTP_CONFIG['enabled'] else EmailNotifier()
+        keys = NotificationOutbox.RECIPIENT_KEYS
+        self.channels: Dict[str, Observer] = {
+            'email': CoalescingNotifier(email, keys['email']),
+            'sms': CoalescingNotifier(SMSNotifier(), keys['sms'])
+        }
+        self.batch_size = OUTBOX_CONFIG['batch_size']
+        self.lease_seconds = OUTBOX_CONFIG['lease_seconds']
+        self.poll_interval = OUTBOX_CONFIG['poll_interval']
+        self.max_attempts = OUTBOX_CONFIG['max_attempts']
+        self.retry_delay = OUTBOX_CONFIG['retry_delay']
+        self.coalesce_window = OUTBOX_CONFIG['coalesce_window']
+        self.channel_workers = OUTBOX_CONFIG['channel_workers']
+        self.max_pending_batches = OUTBOX_CONFIG['max_pending_batches']
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._thread: Optional[threading.Thread] = None
+        self._workers: List[Tuple["queue.Queue", threading.Thread]] = []
+        # channel -> claimed batches waiting for that channel's workers
+        self._queues: Dict[str, "queue.Queue[Optional[List[Dict]]]"] = {}
+        self._room = threading.Event()  # set whenever a worker finishes a batch
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        """Start the claim loop and channel workers; returns False if already running"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return False
+            self._stop.clear()
+            self._queues = {name: queue.Queue(maxsize=self.max_pending_batches)
+                            for name in self.channels}
+            self._workers = [
+                (batches, threading.Thread(target=self._work, args=(name, batches),
+                                           name=f"outbox-{name}-{i}", daemon=True))
+                for name, batches in self._queues.items()
+                for i in range(self.channel_workers)
+            ]
+            for _, worker in self._workers:
+                worker.start()
+            self._thread = threading.Thread(target=self._run, name="outbox-drainer",
+                                            daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop claiming; the workers deliver what is already queued, then exit"""
+        self._stop.set()
+        with self._lock:
+            thread, workers = self._thread, self._workers
+            self._workers = []
+        if thread:
+            thread.join(timeout)
+        for batches, _ in workers:
+            batches.put(None)
+        for _, worker in workers:
+            worker.join(timeout)
+
+    def flush(self):
+        """Wait for every queued batch, then deliver whatever else is due.
+
+        Rows still inside their coalesce window are not due and are left
+        for the drain loop.
+        """
+        with self._lock:
+            queues = list(self._queues.values())
+        for batches in queues:
+            batches.join()
+        while self.drain_once():
+            pass
+
+    def _run(self):
+        while not self._stop.is_set():
+            backed_up = [name for name, batches in self._queues.items() if batches.full()]
+            if backed_up and len(backed_up) == len(self._queues):
+                # Every channel is behind: leave rows in the table for now
+                self._room.wait(self.poll_interval)
+                self._room.clear()
+                continue
+            try:
+                rows, claimed = self._claim(exclude=backed_up)
+                for name, channel_rows in self._by_channel(rows).items():
+                    if name in self._queues:
+                        self._queues[name].put(channel_rows)
+                    else:
+                        self._settle(*self._deliver(name, channel_rows))
+            except Error as e:
+                print(f"Error draining notification outbox: {e}")
+                claimed = 0
+            # A full batch of recipients means more is probably waiting
+            if claimed < self.batch_size:
+                self._stop.wait(self.poll_interval)
+
+    def _work(self, name: str, batches: "queue.Queue[Optional[List[Dict]]]"):
+        while True:
+            rows = batches.get()
+            try:
+                if rows is None:
+                    return
+                self._settle(*self._deliver(name, rows))
+            except Error as e:
+                print(f"Error settling {name} notifications: {e}")
+            finally:
+                batches.task_done()
+                self._room.set()
+
+    def drain_once(self) -> int:
+        """Claim, deliver and settle one batch on the calling thread.
+
+        Returns the number of recipients claimed.
+        """
+        rows, recipients = self._claim()
+        if not rows:
+            return 0
+
+        sent: List[int] = []
+        failed: List[Tuple[Dict, str]] = []
+        for name, channel_rows in self._by_channel(rows).items():
+            channel_sent, channel_failed = self._deliver(name, channel_rows)
+            sent.extend(channel_sent)
+            failed.extend(channel_failed)
+        self._settle(sent, failed)
+        return recipients
+
+    @staticmethod
+    def _by_channel(rows: List[Dict]) -> Dict[str, List[Dict]]:
+        by_channel: Dict[str, List[Dict]] = defaultdict(list)
+        for row in rows:
+            by_channel[row['channel']].append(row)
+        return by_channel
+
+    def _deliver(self, name: str,
+                 rows: List[Dict]) -> Tuple[List[int], List[Tuple[Dict, str]]]:
+        """Hand one channel its rows; returns the sent IDs and the failed rows"""
+        channel = self.channels.get(name)
+        if channel is None:
+            return [], [(row, f"Unknown channel: {name}") for row in rows]
+        try:
+            channel.update_batch([(row['event_type'], json.loads(row['payload']))
+                                  for row in rows])
+            return [row['id'] for row in rows], []
+        except PartialDeliveryError as e:
+            # Only retry what did not go out, or delivered rows repeat
+            undelivered = set(e.failed)
+            sent = [row['id'] for position, row in enumerate(rows)
+                    if position not in undelivered]
+            return sent, [(rows[position], str(e)) for position in sorted(undelivered)]
+        except Exception as e:
+            return [], [(row, str(e)) for row in rows]
+
+    def _settle(self, sent: List[int], failed: List[Tuple[Dict, str]]):
+        self._mark_sent(sent)
+        self._mark_failed(failed)
+
+    def _claim(self, exclude: Sequence[str] = ()) -> Tuple[List[Dict], int]:
+        """Lease the due rows of up to batch_size ready recipients.
+
+        Channels in ``exclude`` (those whose workers are behind) are skipped.
+        """
+        now = datetime.now()
+        skip = ""
+        if exclude:
+            skip = "AND channel NOT IN (" + ", ".join(["%s"] * len(exclude)) + ")"
+        with self.db.transaction():
+            groups = self.db.execute_query(
+                f"""
+                SELECT channel, recipient
+                FROM notification_outbox
+                WHERE status = 'pending'
+                AND (lease_until IS NULL OR lease_until < %s)
+                {skip}
+                GROUP BY channel, recipient
+                HAVING MIN(created_at) <= %s
+                ORDER BY MIN(id)
+                LIMIT %s
+                """,
+                (now, *exclude, now - timedelta(seconds=self.coalesce_window),
+                 self.batch_size)
+            )
+            if not groups:
+                return [], 0
+
+            matches = " OR ".join(["(channel = %s AND recipient = %s)"] * len(groups))
+            rows = self.db.execute_query(
+                f"""
+                SELECT id, event_type, channel, payload, attempts
+                FROM notification_outbox
+                WHERE status = 'pending'
+                AND (lease_until IS NULL OR lease_until < %s)
+                AND ({matches})
+                ORDER BY id
+                FOR UPDATE SKIP LOCKED
+                """,
+                (now, *[value for group in groups
+                        for value in (group['channel'], group['recipient'])])
+            )
+            if not rows:
+                return [], 0
+
+            ids = [row['id'] for row in rows]
+            placeholders = ", ".join(["%s"] * len(ids))
+            self.db.execute_query(
+                f"""
+                UPDATE notification_outbox
+                SET lease_owner = %s, lease_until = %s, attempts = attempts + 1
+                WHERE id IN ({placeholders})
+                """,
+                (self.owner, now + timedelta(seconds=self.lease_seconds), *ids)
+            )
+        for row in rows:
+            row['attempts'] += 1
+        return rows, len(groups)
+
+    def _mark_sent(self, ids: List[int]):
+        if not ids:
+            return
+        placeholders = ", ".join(["%s"] * len(ids))
+        # Only settle rows we still hold; an expired lease may have moved on
+        self.db.execute_query(
+            f"""
+            UPDATE notification_outbox
+            SET status = 'sent', sent_at = %s, lease_until = NULL, last_error = NULL
+            WHERE id IN ({placeholders}) AND lease_owner = %s
+            """,
+            (datetime.now(), *ids, self.owner)
+        )
+
+    def _mark_failed(self, failed: List[Tuple[Dict, str]]):
+        if not failed:
+            return
+        now = datetime.now()
+        params_list = []
+        for row, error in failed:
+            if row['attempts'] >= self.max_attempts:
+                params_list.append(('failed', None, error, row['id'], self.owner))
+            else:
+                retry_at = now + timedelta(
+                    seconds=self.retry_delay * 2 ** (row['attempts'] - 1))
+                params_list.append(('pending', retry_at, error, row['id'], self.owner))
+        self.db.execute_many(
+            """
+            UPDATE notification_outbox
+            SET status = %s, lease_until = %s, last_error = %s
+            WHERE id = %s AND lease_owner = %s
+            """,
+            params_list
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Row counts per outbox status"""
+        result = self.db.execute_query(
+            "SELECT status, COUNT(*) AS total FROM notification_outbox GROUP BY status"
+        )
+        return {row['status']: row['total'] for row in result or []}
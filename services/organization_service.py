@@ -0,0 +1,152 @@
+import threading
+from typing import Dict, Iterable, List, Optional
+from ..auth.rbac import Permission, require_permission
+from ..patterns.composite import HospitalComposite, Hospital, Department, Staff, Resource
+from ..patterns.composite_report import Target, write_csv, write_json
+from .base_service import BaseService
+
+ORGANIZATION_ID = "ORG"
+# Branch and department keys are both plain integers, so their node IDs
+# carry a prefix to stay unique within the tree
+BRANCH_PREFIX = "BR"
+DEPARTMENT_PREFIX = "DEP"
+
+class OrganizationService(BaseService[HospitalComposite]):
+    """Builds the branch/department/staff/resource composite from the database.
+
+    Each table is read with one query (staff and resources are streamed)
+    and nodes are linked through dicts keyed by their parent's ID, so a load
+    is O(n) with a fixed number of round trips. The tree is shared by all
+    instances; refresh_branch() rebuilds a single branch in place. Node IDs
+    are the table keys with BRANCH_PREFIX/DEPARTMENT_PREFIX in front. Rows
+    whose parent is missing (e.g. staff without a department) are skipped.
+    """
+    _root: Optional[HospitalComposite] = None
+    _branches: Dict[int, Hospital] = {}
+    _lock = threading.Lock()
+
+    BRANCHES_QUERY = "SELECT branch_id, name, location FROM branches"
+    DEPARTMENTS_QUERY = "SELECT department_id, branch_id, name, description FROM departments"
+    STAFF_QUERY = """
+    SELECT s.staff_id, s.department_id, s.name, s.role, s.salary, d.specialization
+    FROM staff s
+    LEFT JOIN doctors d ON d.staff_id = s.staff_id
+    """
+    RESOURCES_QUERY = "SELECT resource_id, branch_id, name, type, cost FROM resources"
+
+    @require_permission(Permission.VIEW_ORGANIZATION_REPORTS)
+    def get_organization(self) -> HospitalComposite:
+        """The organisation tree, loaded on first use"""
+        if OrganizationService._root is None:
+            self.load_organization()
+        return OrganizationService._root
+
+    @require_permission(Permission.VIEW_ORGANIZATION_REPORTS)
+    def load_organization(self) -> HospitalComposite:
+        """(Re)load every branch"""
+        branches = self._build_branches(
+            self._execute_query(self.BRANCHES_QUERY) or [],
+            self._execute_query(self.DEPARTMENTS_QUERY) or [],
+            self._iter_query(self.STAFF_QUERY),
+            self._iter_query(self.RESOURCES_QUERY)
+        )
+        root = HospitalComposite(ORGANIZATION_ID, "Serenity Health")
+        for hospital in branches.values():
+            root.add(hospital)
+
+        with OrganizationService._lock:
+            OrganizationService._root = root
+            OrganizationService._branches = branches
+        return root
+
+    @require_permission(Permission.VIEW_ORGANIZATION_REPORTS)
+    def refresh_branch(self, branch_id: int) -> Optional[Hospital]:
+        """Reload one branch and swap it into the tree; None if it no longer exists"""
+        root = self.get_organization()
+        branches = self._build_branches(
+            self._execute_query(self.BRANCHES_QUERY + " WHERE branch_id = %s",
+                                (branch_id,)) or [],
+            self._execute_query(self.DEPARTMENTS_QUERY + " WHERE branch_id = %s",
+                                (branch_id,)) or [],
+            self._iter_query(self.STAFF_QUERY + """
+                JOIN departments dep ON dep.department_id = s.department_id
+                WHERE dep.branch_id = %s
+                """, (branch_id,)),
+            self._iter_query(self.RESOURCES_QUERY + " WHERE branch_id = %s", (branch_id,))
+        )
+        hospital = branches.get(branch_id)
+
+        with OrganizationService._lock:
+            old = OrganizationService._branches.pop(branch_id, None)
+            if old is not None and hospital is not None:
+                root.replace(old, hospital)
+            elif old is not None:
+                root.remove(old)
+            elif hospital is not None:
+                root.add(hospital)
+            if hospital is not None:
+                OrganizationService._branches[branch_id] = hospital
+        return hospital
+
+    def _build_branches(self, branch_rows: Iterable[Dict], department_rows: Iterable[Dict],
+                        staff_rows: Iterable[Dict],
+                        resource_rows: Iterable[Dict]) -> Dict[int, Hospital]:
+        branches: Dict[int, Hospital] = {
+            row['branch_id']: Hospital(f"{BRANCH_PREFIX}{row['branch_id']}", row['name'],
+                                       row['location'])
+            for row in branch_rows
+        }
+
+        departments: Dict[int, Department] = {}
+        for row in department_rows:
+            hospital = branches.get(row['branch_id'])
+            if hospital is None:
+                continue
+            department = Department(f"{DEPARTMENT_PREFIX}{row['department_id']}", row['name'],
+                                    row.get('description') or '')
+            departments[row['department_id']] = department
+            hospital.add(department)
+
+        for row in staff_rows:
+            department = departments.get(row['department_id'])
+            if department is not None:
+                department.add(Staff(row['staff_id'], row['name'], float(row['salary'] or 0),
+                                     row['role'], row.get('specialization')))
+
+        for row in resource_rows:
+            hospital = branches.get(row['branch_id'])
+            if hospital is not None:
+                hospital.add(Resource(row['resource_id'], row['name'],
+                                      float(row['cost'] or 0), row['type']))
+        return branches
+
+    @require_permission(Permission.VIEW_ORGANIZATION_REPORTS)
+    def get_branch(self, branch_id: int) -> Optional[Hospital]:
+        self.get_organization()
+        return OrganizationService._branches.get(branch_id)
+
+    @require_permission(Permission.VIEW_ORGANIZATION_REPORTS)
+    def get_branch_summaries(self) -> List[Dict]:
+        """Cost and headcount per branch, from the cached subtree totals"""
+        root = self.get_organization()
+        return [
+            {
+                'branch_id': hospital.id,
+                'name': hospital.name,
+                'location': hospital.location,
+                'total_cost': hospital.get_cost(),
+                'total_staff': hospital.get_staff_count()
+            }
+            for hospital in root.get_children()
+        ]
+
+    @require_permission(Permission.VIEW_ORGANIZATION_REPORTS)
+    def export_report(self, target: Target, format: str = 'json', max_depth: Optional[int] = None,
+                      branch_ids: Optional[Iterable[int]] = None) -> int:
+        """Stream the organisation report as JSON or CSV to a path, file or socket"""
+        writers = {'json': write_json, 'csv': write_csv}
+        if format not in writers:
+            raise ValueError(f"Unsupported report format: {format}")
+        if branch_ids is not None:
+            branch_ids = [f"{BRANCH_PREFIX}{branch_id}" for branch_id in branch_ids]
+        return writers[format](self.get_organization(), target, max_depth, branch_ids)
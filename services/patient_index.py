@@ -0,0 +1,207 @@
+import contextvars
+import heapq
+import re
+import threading
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+from ..models import Patient
+
+_NON_DIGITS = re.compile(r'\D')
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _padded_trigrams(text: str) -> Set[str]:
+    """Trigrams of every word padded with spaces, so word edges count too"""
+    grams: Set[str] = set()
+    for word in text.split():
+        grams |= _trigrams(f"  {word} ")
+    return grams
+
+class TrigramIndex:
+    """In-memory trigram index answering substring and fuzzy lookups.
+
+    Each document is a list of text fields. Besides the plain trigrams used
+    for substring matches, every word is padded with spaces so its start and
+    end produce trigrams of their own; those let a misspelt query still share
+    enough trigrams with the intended word to be found.
+    """
+
+    def __init__(self, fuzzy_threshold: float = 0.3):
+        self.fuzzy_threshold = fuzzy_threshold
+        self._texts: Dict[Hashable, List[str]] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return ' '.join(text.lower().split())
+
+    def _document_trigrams(self, fields: List[str]) -> Set[str]:
+        grams: Set[str] = set()
+        for field in fields:
+            grams |= _trigrams(field)
+            grams |= _padded_trigrams(field)
+        return grams
+
+    def add(self, key: Hashable, fields: Iterable[Optional[str]]):
+        self.remove(key)
+        texts = [self._normalize(f) for f in fields if f]
+        self._texts[key] = texts
+        for gram in self._document_trigrams(texts):
+            self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: Hashable):
+        texts = self._texts.pop(key, None)
+        if texts is None:
+            return
+        for gram in self._document_trigrams(texts):
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._texts
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def keys(self) -> List[Hashable]:
+        return list(self._texts)
+
+    def search(self, query: str, limit: int = 50) -> List[Hashable]:
+        """Keys whose fields contain ``query``, then the closest fuzzy matches"""
+        query = self._normalize(query)
+        if not query:
+            return []
+
+        results: List[Hashable] = []
+        if len(query) < 3:
+            # Too short for trigrams; scan until enough word-prefix matches
+            for key, texts in self._texts.items():
+                if any(text.startswith(query) or f" {query}" in text for text in texts):
+                    results.append(key)
+                    if len(results) >= limit:
+                        break
+            return results
+
+        # Exact substring: intersect postings starting from the rarest trigram
+        grams = sorted(_trigrams(query), key=lambda g: len(self._postings.get(g, ())))
+        candidates = set(self._postings.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= self._postings.get(gram, set())
+        exact = [key for key in candidates
+                 if any(query in text for text in self._texts[key])]
+        if exact:
+            return sorted(exact, key=str)[:limit]
+
+        # No exact hit, so assume a typo: rank documents by how many of the
+        # query's padded word trigrams they share
+        padded = _padded_trigrams(query)
+        scores: Counter = Counter()
+        for gram in padded:
+            for key in self._postings.get(gram, ()):
+                scores[key] += 1
+        minimum = self.fuzzy_threshold * len(padded)
+        for key, score in scores.most_common(limit):
+            if score < minimum:
+                break
+            results.append(key)
+        return results
+
+class PatientIndex:
+    """Process-wide trigram index over patient name, phone and email.
+
+    build_async() loads every patient once on a background thread;
+    PatientService keeps the index current on create, update and delete.
+    Until the build finishes ``ready`` is False and callers should fall back
+    to the database.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super(PatientIndex, cls).__new__(cls)
+                    cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self._index = TrigramIndex()
+        self._patients: Dict[str, Patient] = {}
+        self._lock = threading.RLock()
+        self._building = False
+        self._touched: Set[str] = set()  # changed live while the build runs
+        self.ready = False
+
+    @staticmethod
+    def _fields(patient: Patient) -> List[Optional[str]]:
+        phone = patient.contact_number or ''
+        return [patient.name, phone, _NON_DIGITS.sub('', phone), patient.email]
+
+    def build_async(self, patient_service) -> Optional[threading.Thread]:
+        """Start loading the index unless it is already built or building"""
+        with self._lock:
+            if self.ready or self._building:
+                return None
+            self._building = True
+            self._touched.clear()
+
+        # Run in a copy of the caller's context so the load acts as the same user
+        thread = threading.Thread(target=contextvars.copy_context().run,
+                                  args=(self._build, patient_service),
+                                  name="patient-index-build", daemon=True)
+        thread.start()
+        return thread
+
+    def _build(self, patient_service):
+        try:
+            for patient in patient_service.iter_all_patients():
+                with self._lock:
+                    # A live change is newer than the row we just streamed
+                    if patient.patient_id not in self._touched:
+                        self._put(patient)
+            with self._lock:
+                self.ready = True
+                self._touched.clear()
+        except Exception as e:
+            print(f"Error building patient index: {e}")
+        finally:
+            with self._lock:
+                self._building = False
+
+    def _put(self, patient: Patient):
+        self._patients[patient.patient_id] = patient
+        self._index.add(patient.patient_id, self._fields(patient))
+
+    def add(self, patient: Patient):
+        with self._lock:
+            if not (self.ready or self._building):
+                return
+            if self._building:
+                self._touched.add(patient.patient_id)
+            self._put(patient)
+
+    update = add
+
+    def remove(self, patient_id: str):
+        with self._lock:
+            if not (self.ready or self._building):
+                return
+            if self._building:
+                self._touched.add(patient_id)
+            self._patients.pop(patient_id, None)
+            self._index.remove(patient_id)
+
+    def search(self, query: str, limit: int = 50) -> List[Patient]:
+        with self._lock:
+            return [self._patients[key] for key in self._index.search(query, limit)]
+
+    def all(self, limit: int = 100) -> List[Patient]:
+        with self._lock:
+            return [self._patients[key] for key in heapq.nsmallest(limit, self._patients)]
@@ -1,6 +1,10 @@
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
+from ..auth.row_scope import is_unrestricted
 from ..models import Patient
 from .base_service import BaseService
+from .pagination import Page
+from .search import match_condition, relevance_expression
+from .patient_index import PatientIndex
 from datetime import date
 
 class PatientService(BaseService[Patient]):
@@ -27,23 +31,104 @@ class PatientService(BaseService[Patient]):
         )
         
         if self._execute_query(query, params) is not None:
-            return self.get_patient_by_id(patient_id)
+            self._invalidate("patients", patient_id)
+            patient = self.get_patient_by_id(patient_id)
+            if patient:
+                PatientIndex().add(patient)
+            return patient
         return None
 
+    def create_patients_bulk(self, patients: List[Dict], chunk_size: int = 500) -> List[str]:
+        """Insert many patients at once and return their new IDs in input order.
+
+        Each dict takes the same keys as create_patient's arguments.
+        """
+        if not patients:
+            return []
+
+        query = """
+        INSERT INTO patients (
+            patient_id, name, date_of_birth, gender, blood_group,
+            contact_number, email, address, insurance_details
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        with self._transaction():
+            patient_ids = self._generate_ids("PAT", "patients", len(patients))
+            params_list = [
+                (
+                    patient_id, data['name'], data['date_of_birth'], data['gender'],
+                    data['blood_group'], data['contact_number'], data['email'],
+                    data['address'], str(data.get('insurance_details'))
+                )
+                for patient_id, data in zip(patient_ids, patients)
+            ]
+            self._execute_many(query, params_list, chunk_size)
+            for patient_id in patient_ids:
+                self._invalidate("patients", patient_id)
+
+        index = PatientIndex()
+        for patient_id, data in zip(patient_ids, patients):
+            index.add(Patient(
+                patient_id=patient_id,
+                name=data['name'],
+                date_of_birth=data['date_of_birth'],
+                gender=data['gender'],
+                blood_group=data['blood_group'],
+                contact_number=data['contact_number'],
+                email=data['email'],
+                address=data['address'],
+                insurance_details=data.get('insurance_details')
+            ))
+        return patient_ids
+
     def get_patient_by_id(self, patient_id: str) -> Optional[Patient]:
-        query = "SELECT * FROM patients WHERE patient_id = %s"
-        result = self._execute_query(query, (patient_id,))
+        """The patient, if the current user may see them.
+
+        Like every row-scoped read this needs a bound user (``as_user`` or
+        ``AuthenticationManager().current_user``) and raises PermissionError
+        without one; internal callers such as AppointmentService inherit the
+        caller's user and scope.
+        """
+        if not is_unrestricted():
+            # The cache is shared by every user, so scoped reads go to the DB
+            return self._load_patient(patient_id)
+        return self._cached("patients", patient_id, lambda: self._load_patient(patient_id))
+
+    def _load_patient(self, patient_id: str) -> Optional[Patient]:
+        scope, scope_params = self._row_scope("patients")
+        query = f"SELECT * FROM patients WHERE patient_id = %s AND {scope}"
+        result = self._execute_query(query, (patient_id, *scope_params))
         
         if result and len(result) > 0:
             return Patient.from_db_dict(result[0])
         return None
 
     def get_all_patients(self) -> List[Patient]:
-        query = "SELECT * FROM patients"
-        result = self._execute_query(query)
+        scope, scope_params = self._row_scope("patients")
+        query = f"SELECT * FROM patients WHERE {scope}"
+        result = self._execute_query(query, tuple(scope_params) or None)
         
         return [Patient.from_db_dict(row) for row in (result or [])]
 
+    def get_patients_page(self, page_size: int = 100,
+                          cursor: Optional[str] = None) -> Page[Patient]:
+        scope, scope_params = self._row_scope("patients")
+        query = f"SELECT * FROM patients WHERE {scope}"
+        return self._fetch_page(query, tuple(scope_params), ["patient_id"], Patient.from_db_dict,
+                                page_size, cursor)
+
+    def count_patients(self) -> int:
+        scope, scope_params = self._row_scope("patients")
+        return self._count(f"SELECT patient_id FROM patients WHERE {scope}",
+                           tuple(scope_params) or None)
+
+    def iter_all_patients(self, batch_size: int = 1000) -> Iterator[Patient]:
+        """Stream every patient without loading the whole table into memory"""
+        scope, scope_params = self._row_scope("patients")
+        query = f"SELECT * FROM patients WHERE {scope}"
+        for row in self._iter_query(query, tuple(scope_params) or None, batch_size):
+            yield Patient.from_db_dict(row)
+
     def update_patient(self, patient: Patient) -> bool:
         query = """
         UPDATE patients 
@@ -57,32 +142,68 @@ class PatientService(BaseService[Patient]):
             str(patient.insurance_details), patient.patient_id
         )
         
-        return self._execute_query(query, params) is not None
+        if self._execute_query(query, params) is None:
+            return False
+        self._invalidate("patients", patient.patient_id)
+        PatientIndex().update(patient)
+        return True
 
     def delete_patient(self, patient_id: str) -> bool:
         query = "DELETE FROM patients WHERE patient_id = %s"
-        return self._execute_query(query, (patient_id,)) is not None
+        if self._execute_query(query, (patient_id,)) is None:
+            return False
+        self._invalidate("patients", patient_id)
+        PatientIndex().remove(patient_id)
+        return True
 
-    def search_patients(self, search_term: str) -> List[Patient]:
-        query = """
-        SELECT * FROM patients 
-        WHERE name LIKE %s 
-        OR contact_number LIKE %s 
-        OR email LIKE %s
+    def build_search_index(self):
+        """Start loading the in-memory patient index in the background"""
+        if not is_unrestricted():
+            return None  # only users who may see every patient use the index
+        return PatientIndex().build_async(self)
+
+    def quick_search(self, search_term: str, limit: int = 50) -> List[Patient]:
+        """Instant lookup for pickers: in-memory index once built, else the DB"""
+        index = PatientIndex()
+        if not is_unrestricted():
+            # The index holds every patient; scoped users search in SQL
+            if search_term.strip():
+                return self.search_patients(search_term, limit)
+            return self.get_patients_page(limit).items
+        if not index.ready:
+            self.build_search_index()
+            if search_term.strip():
+                return self.search_patients(search_term, limit)
+            return self.get_patients_page(limit).items
+        if search_term.strip():
+            return index.search(search_term, limit)
+        return index.all(limit)
+
+    def search_patients(self, search_term: str, limit: int = 100) -> List[Patient]:
+        """Best matches first for a name, phone or email (prefixes match too)"""
+        columns = ("name", "contact_number", "email")
+        condition, condition_params = match_condition(columns, search_term)
+        relevance, relevance_params = relevance_expression(columns, search_term)
+        scope, scope_params = self._row_scope("patients")
+        query = f"""
+        SELECT *, {relevance} AS relevance FROM patients 
+        WHERE {condition} AND {scope}
+        ORDER BY relevance DESC, patient_id
+        LIMIT %s
         """
-        search_pattern = f"%{search_term}%"
-        params = (search_pattern, search_pattern, search_pattern)
+        params = tuple(relevance_params + condition_params + scope_params + [limit])
         
         result = self._execute_query(query, params)
         return [Patient.from_db_dict(row) for row in (result or [])]
 
     def get_patient_medical_history(self, patient_id: str) -> List[dict]:
-        query = """
+        scope, scope_params = self._row_scope("medical_records", "mr")
+        query = f"""
         SELECT mr.*, d.name as doctor_name 
         FROM medical_records mr
         JOIN doctors d ON mr.doctor_id = d.doctor_id
-        WHERE mr.patient_id = %s
+        WHERE mr.patient_id = %s AND {scope}
         ORDER BY mr.visit_date DESC
         """
-        result = self._execute_query(query, (patient_id,))
+        result = self._execute_query(query, (patient_id, *scope_params))
         return result or []
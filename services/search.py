@@ -0,0 +1,60 @@
+import re
+from typing import List, Optional, Sequence, Tuple
+
+# InnoDB ignores tokens shorter than innodb_ft_min_token_size (default 3)
+MIN_TOKEN_LENGTH = 3
+
+# Characters with a meaning in MATCH ... AGAINST boolean mode
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+def _words(term: str) -> List[str]:
+    return _BOOLEAN_OPERATORS.sub(' ', term).split()
+
+def escape_like(text: str) -> str:
+    """Escape LIKE's wildcards so ``text`` matches literally"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def boolean_query(term: str) -> Optional[str]:
+    """Turn free text into a boolean-mode query requiring every word as a prefix.
+
+    ``"jo smith"`` becomes ``"+smith*"``; words below MIN_TOKEN_LENGTH are
+    left out because the FULLTEXT index never stores them (match_condition
+    filters on them with LIKE instead). Returns None when no word is long
+    enough to be searched through the index.
+    """
+    words = [word for word in _words(term) if len(word) >= MIN_TOKEN_LENGTH]
+    if not words:
+        return None
+    return ' '.join(f'+{word}*' for word in words)
+
+def _any_column_like(columns: Sequence[str], pattern: str) -> Tuple[str, List]:
+    return "(" + " OR ".join(f"{column} LIKE %s" for column in columns) + ")", \
+        [pattern] * len(columns)
+
+def match_condition(columns: Sequence[str], term: str) -> Tuple[str, List]:
+    """WHERE condition matching ``term`` against a FULLTEXT index on ``columns``.
+
+    ``columns`` must be exactly the column list of one FULLTEXT index. Words
+    too short for the index must still appear in one of the columns: they
+    filter the index matches with LIKE. A term with no word long enough
+    falls back to a prefix LIKE on each column.
+    """
+    query = boolean_query(term)
+    if query is None:
+        return _any_column_like(columns, f"{escape_like(term.strip())}%")
+
+    conditions = [f"MATCH({', '.join(columns)}) AGAINST (%s IN BOOLEAN MODE)"]
+    params = [query]
+    for word in _words(term):
+        if len(word) < MIN_TOKEN_LENGTH:
+            condition, condition_params = _any_column_like(columns, f"%{escape_like(word)}%")
+            conditions.append(condition)
+            params.extend(condition_params)
+    return "(" + " AND ".join(conditions) + ")", params
+
+def relevance_expression(columns: Sequence[str], term: str) -> Tuple[str, List]:
+    """SELECT expression scoring rows for ORDER BY relevance DESC"""
+    query = boolean_query(term)
+    if query is None:
+        return "0", []
+    return f"MATCH({', '.join(columns)}) AGAINST (%s IN BOOLEAN MODE)", [query]
@@ -0,0 +1,235 @@
+"""Shared fixtures.
+
+The services run against a throwaway SQLite file: ``mysql.connector.connect``
+is replaced with ``SqliteConnection``, which rewrites the little MySQL-only
+syntax the services use. Run from the directory that contains the
+``hospital_management_system`` package, e.g. ``python -m pytest
+hospital_management_system/tests``.
+"""
+import re
+import sqlite3
+from datetime import date, datetime
+import mysql.connector
+import pytest
+from mysql.connector import Error
+from hospital_management_system.auth.rbac import User, UserRole, as_user
+from hospital_management_system.patterns.singleton import DatabaseManager
+from hospital_management_system.services.base_service import BaseService
+from hospital_management_system.services.id_allocator import IdAllocator
+
+SCHEMA = """
+CREATE TABLE branches (
+    branch_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(100) NOT NULL,
+    location VARCHAR(100) NOT NULL,
+    contact_number VARCHAR(20),
+    email VARCHAR(100)
+);
+CREATE TABLE departments (
+    department_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    branch_id INT,
+    name VARCHAR(100) NOT NULL,
+    description TEXT
+);
+CREATE TABLE staff (
+    staff_id VARCHAR(10) PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    role VARCHAR(50) NOT NULL,
+    department_id INT,
+    contact_number VARCHAR(20),
+    email VARCHAR(100),
+    date_joined DATE,
+    salary DECIMAL(12,2) NOT NULL DEFAULT 0
+);
+CREATE TABLE doctors (
+    doctor_id VARCHAR(10) PRIMARY KEY,
+    staff_id VARCHAR(10) NOT NULL,
+    specialization VARCHAR(100),
+    qualification TEXT,
+    consultation_fee DECIMAL(10,2),
+    is_active BOOLEAN DEFAULT TRUE
+);
+CREATE TABLE resources (
+    resource_id VARCHAR(10) PRIMARY KEY,
+    branch_id INT,
+    name VARCHAR(100) NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    cost DECIMAL(12,2) NOT NULL DEFAULT 0
+);
+CREATE TABLE patients (
+    patient_id VARCHAR(10) PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    date_of_birth DATE,
+    gender VARCHAR(10),
+    contact_number VARCHAR(20),
+    email VARCHAR(100),
+    address TEXT,
+    blood_group VARCHAR(5),
+    insurance_details TEXT,
+    registration_date DATE
+);
+CREATE TABLE appointments (
+    appointment_id VARCHAR(10) PRIMARY KEY,
+    patient_id VARCHAR(10),
+    doctor_id VARCHAR(10),
+    appointment_date DATETIME,
+    department VARCHAR(100),
+    status VARCHAR(20) DEFAULT 'scheduled',
+    notes TEXT
+);
+CREATE TABLE medical_records (
+    record_id VARCHAR(10) PRIMARY KEY,
+    patient_id VARCHAR(10),
+    doctor_id VARCHAR(10),
+    visit_date DATE,
+    diagnosis TEXT,
+    prescription TEXT,
+    notes TEXT
+);
+CREATE TABLE id_sequences (
+    prefix VARCHAR(10) PRIMARY KEY,
+    next_value BIGINT NOT NULL
+);
+CREATE TABLE notification_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type VARCHAR(50) NOT NULL,
+    channel VARCHAR(20) NOT NULL,
+    recipient VARCHAR(255) NOT NULL DEFAULT '',
+    payload TEXT NOT NULL,
+    status VARCHAR(10) NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    lease_owner VARCHAR(100),
+    lease_until DATETIME,
+    last_error TEXT,
+    created_at DATETIME NOT NULL,
+    sent_at DATETIME
+);
+CREATE TABLE rbac_auth (
+    username VARCHAR(50) PRIMARY KEY,
+    password VARCHAR(60) NOT NULL,
+    role VARCHAR(20) NOT NULL,
+    reference_id VARCHAR(10)
+);
+"""
+
+# MySQL syntax used by the services, and its SQLite equivalent
+_REWRITES = [
+    (re.compile(r"\s+FOR UPDATE(\s+SKIP LOCKED)?", re.IGNORECASE), ""),
+    (re.compile(r"\bINSERT IGNORE\b", re.IGNORECASE), "INSERT OR IGNORE"),
+]
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+def _translate(query: str) -> str:
+    for pattern, replacement in _REWRITES:
+        query = pattern.sub(replacement, query)
+    return query.replace("%s", "?")
+
+class SqliteCursor:
+    def __init__(self, connection: sqlite3.Connection, dictionary: bool):
+        self._cursor = connection.cursor()
+        self._dictionary = dictionary
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def execute(self, query: str, params=None):
+        try:
+            self._cursor.execute(_translate(query), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise Error(str(e))
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+
+    def executemany(self, query: str, params_list):
+        try:
+            self._cursor.executemany(_translate(query), [tuple(p) for p in params_list])
+        except sqlite3.Error as e:
+            raise Error(str(e))
+        self.rowcount = self._cursor.rowcount
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip([column[0] for column in self._cursor.description], row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def fetchmany(self, size: int = 1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+class SqliteConnection:
+    """The subset of a mysql.connector connection the pool and services use"""
+
+    def __init__(self, path: str, autocommit: bool = True, **_):
+        self._connection = sqlite3.connect(path, timeout=10, check_same_thread=False,
+                                           isolation_level=None,
+                                           detect_types=sqlite3.PARSE_DECLTYPES)
+        self.open = True
+
+    def cursor(self, dictionary: bool = False, buffered=None, **_):
+        return SqliteCursor(self._connection, dictionary)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._connection.in_transaction
+
+    def is_connected(self) -> bool:
+        return self.open
+
+    def start_transaction(self, **_):
+        if self._connection.in_transaction:
+            raise Error("Transaction already in progress")
+        self._connection.execute("BEGIN")
+
+    def commit(self):
+        if self._connection.in_transaction:
+            self._connection.execute("COMMIT")
+
+    def rollback(self):
+        if self._connection.in_transaction:
+            self._connection.execute("ROLLBACK")
+
+    def close(self):
+        self.open = False
+        self._connection.close()
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """DatabaseManager backed by a fresh SQLite database holding SCHEMA"""
+    path = str(tmp_path / "hospital.db")
+    setup = sqlite3.connect(path)
+    setup.executescript(SCHEMA)
+    setup.close()
+
+    monkeypatch.setattr(mysql.connector, "connect",
+                        lambda **kwargs: SqliteConnection(path, **kwargs))
+
+    # Process-wide state from earlier tests must not leak into this one
+    IdAllocator._instance = None
+    BaseService._caches.clear()
+    DatabaseManager.configure_pool(pool_size=5, checkout_timeout=2.0)
+    yield DatabaseManager.get_instance()
+    DatabaseManager._pool.close_all()
+    if IdAllocator._instance is not None:
+        IdAllocator._instance._pool.close_all()
+    IdAllocator._instance = None
+    BaseService._caches.clear()
+
+@pytest.fixture
+def admin():
+    with as_user(User.for_login("admin", UserRole.ADMIN)) as user:
+        yield user
@@ -0,0 +1,89 @@
+import pytest
+from hospital_management_system.benchmarks.columnar_rollups import check_parity
+from hospital_management_system.benchmarks.composite_tree import build_tree
+from hospital_management_system.patterns.composite import (
+    HospitalComposite, Hospital, Department, Staff)
+from hospital_management_system.services.organization_service import OrganizationService
+
+np = pytest.importorskip("numpy")
+from hospital_management_system.patterns.columnar_composite import ColumnarOrganization
+
+@pytest.fixture
+def tree():
+    return build_tree(hospitals=3, departments=4, leaves=10)
+
+def test_matches_the_object_tree(tree):
+    check_parity(tree, ColumnarOrganization.from_tree(tree))
+
+def test_salary_change(tree):
+    columnar = ColumnarOrganization.from_tree(tree)
+    columnar.get_cost()  # totals cached before the change
+    leaf = tree.get_child(1).get_child(2).get_child(0)
+    leaf.salary += 12345
+    columnar.set_cost(leaf.id, leaf.salary)
+
+    check_parity(tree, columnar)
+
+def test_move_between_branches(tree):
+    before = ColumnarOrganization.from_tree(tree)
+    leaf = tree.get_child(0).get_child(0).get_child(0)
+    tree.get_child(2).get_child(3).add(leaf)
+    columnar = ColumnarOrganization.from_tree(tree)
+
+    check_parity(tree, columnar)
+    assert columnar.get_cost("H2") == pytest.approx(before.get_cost("H2") + leaf.salary)
+    assert columnar.get_staff_count("H0") == before.get_staff_count("H0") - 1
+
+def test_duplicate_ids_are_refused():
+    root = HospitalComposite("ORG", "Serenity Health")
+    branch = Hospital("1", "Colombo", "Colombo 07")
+    department = Department("1", "Cardiology", "")
+    department.add(Staff("STF0001", "Silva", 1000.0, "Nurse"))
+    branch.add(department)
+    root.add(branch)
+
+    with pytest.raises(ValueError):
+        ColumnarOrganization.from_tree(root).get_cost("1")
+
+@pytest.fixture
+def organization(db, admin):
+    # Branch and department keys overlap, as they do in any real database
+    db.execute_many("INSERT INTO branches (branch_id, name, location) VALUES (%s, %s, %s)",
+                    [(1, "Colombo", "Colombo 07"), (2, "Kandy", "Kandy")])
+    db.execute_many("INSERT INTO departments (department_id, branch_id, name) VALUES (%s, %s, %s)",
+                    [(1, 2, "Cardiology"), (2, 1, "Radiology"), (3, 1, "Oncology")])
+    db.execute_many("INSERT INTO staff (staff_id, name, role, department_id, salary) "
+                    "VALUES (%s, %s, %s, %s, %s)",
+                    [("STF0001", "Silva", "Nurse", 1, 1000), ("STF0002", "Perera", "Doctor", 2, 5000),
+                     ("STF0003", "Fernando", "Nurse", 3, 1200)])
+    db.execute_many("INSERT INTO resources (resource_id, branch_id, name, type, cost) "
+                    "VALUES (%s, %s, %s, %s, %s)",
+                    [("RES0001", 1, "MRI", "Equipment", 20000)])
+    OrganizationService._root = None
+    OrganizationService._branches = {}
+    yield OrganizationService()
+    OrganizationService._root = None
+    OrganizationService._branches = {}
+
+def test_organization_from_the_database(organization):
+    root = organization.get_organization()
+    columnar = ColumnarOrganization.from_tree(root)
+
+    check_parity(root, columnar)
+    assert columnar.get_cost("BR1") == 26200
+    assert columnar.get_cost("DEP1") == 1000
+    assert {row['department_id']: row['branch_id']
+            for row in columnar.get_department_breakdown()} == {
+        "DEP1": "BR2", "DEP2": "BR1", "DEP3": "BR1"}
+
+def test_organization_after_refresh(organization, db):
+    root = organization.get_organization()
+    db.execute_query("UPDATE staff SET salary = 7000 WHERE staff_id = 'STF0002'")
+    db.execute_query("UPDATE staff SET department_id = 1 WHERE staff_id = 'STF0003'")
+    organization.refresh_branch(1)
+    organization.refresh_branch(2)
+    columnar = ColumnarOrganization.from_tree(root)
+
+    check_parity(root, columnar)
+    assert columnar.get_cost("BR1") == 27000
+    assert columnar.get_staff_count("DEP1") == 2
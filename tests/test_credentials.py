@@ -0,0 +1,55 @@
+import pytest
+from hospital_management_system.auth.credentials import Authenticator, hash_password
+from hospital_management_system.auth.rbac import UserRole
+from hospital_management_system.config import AUTH_CONFIG
+
+@pytest.fixture
+def authenticator(db, monkeypatch):
+    monkeypatch.setitem(AUTH_CONFIG, 'bcrypt_rounds', 4)
+    Authenticator._instance = None
+    authenticator = Authenticator()
+    db.execute_query(
+        "INSERT INTO rbac_auth (username, password, role, reference_id) VALUES (%s, %s, %s, %s)",
+        ("silva", hash_password("secret"), "Doctor", "DOC0001"))
+    yield authenticator
+    authenticator._executor.shutdown()
+    Authenticator._instance = None
+
+def test_repeat_login_skips_bcrypt(authenticator):
+    assert authenticator.authenticate("silva", "secret")
+    session = authenticator.authenticate("silva", "secret")
+
+    assert session.user.role == UserRole.DOCTOR
+    assert authenticator.get_stats()['hash_checks'] == 1
+    assert authenticator.get_stats()['cache_hits'] == 1
+    assert authenticator.authenticate("silva", "wrong") is None
+
+def test_deleted_user_cannot_log_in_from_the_cache(authenticator, db):
+    assert authenticator.authenticate("silva", "secret")
+    db.execute_query("DELETE FROM rbac_auth WHERE username = 'silva'")
+
+    assert authenticator.authenticate("silva", "secret") is None
+
+def test_role_change_applies_to_the_next_login(authenticator, db):
+    assert authenticator.authenticate("silva", "secret")
+    db.execute_query("UPDATE rbac_auth SET role = 'Admin', reference_id = NULL "
+                     "WHERE username = 'silva'")
+
+    session = authenticator.authenticate("silva", "secret")
+    assert (session.user.role, session.user.reference_id) == (UserRole.ADMIN, None)
+    assert authenticator.get_stats()['cache_hits'] == 1
+
+def test_password_reset_elsewhere_retires_the_cached_password(authenticator, db):
+    assert authenticator.authenticate("silva", "secret")
+    # Another process resets the password; this one's cache is not told
+    db.execute_query("UPDATE rbac_auth SET password = %s WHERE username = 'silva'",
+                     (hash_password("changed"),))
+
+    assert authenticator.authenticate("silva", "secret") is None
+    assert authenticator.authenticate("silva", "changed")
+
+def test_unknown_role_raises(authenticator, db):
+    db.execute_query("UPDATE rbac_auth SET role = 'Janitor' WHERE username = 'silva'")
+
+    with pytest.raises(ValueError):
+        authenticator.authenticate("silva", "secret")
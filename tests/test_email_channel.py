@@ -0,0 +1,84 @@
+import pytest
+from hospital_management_system.benchmarks.smtp_channel import SMTPStandIn
+from hospital_management_system.patterns.observer import PartialDeliveryError
+from hospital_management_system.services.email_channel import (
+    SMTPConnectionPool, SMTPEmailNotifier)
+
+@pytest.fixture
+def smtp_server(request):
+    replies = getattr(request, 'param', None)
+    server = SMTPStandIn(latency=0, replies=replies)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _notifier(server, pool_size=1, max_retries=2):
+    pool = SMTPConnectionPool("127.0.0.1", server.port, pool_size=pool_size)
+    return SMTPEmailNotifier(pool, max_retries=max_retries, retry_delay=0.001)
+
+def _events(*recipients):
+    return [("APPOINTMENT_SCHEDULED", {"email": recipient, "date_time": "2024-01-01 09:00",
+                                       "doctor_name": "Perera"})
+            for recipient in recipients]
+
+def test_sessions_are_reused_across_messages_and_batches(smtp_server):
+    notifier = _notifier(smtp_server, pool_size=2)
+    recipients = [f"patient{i}@example.com" for i in range(10)]
+    notifier.update_batch(_events(*recipients))
+    notifier.update_batch(_events(*recipients))
+    notifier.close()
+
+    assert smtp_server.received == 20
+    assert smtp_server.sessions == notifier.pool.connects == 2
+
+@pytest.mark.parametrize("smtp_server", [{"b@example.com": ["451 Try again later"]}],
+                         indirect=True)
+def test_transient_reply_is_retried_on_the_same_session(smtp_server):
+    notifier = _notifier(smtp_server)
+    notifier.update_batch(_events("a@example.com", "b@example.com", "c@example.com"))
+    notifier.close()
+
+    assert smtp_server.received_by["b@example.com"] == 1
+    assert notifier.get_stats()['retries'] == 1
+    assert smtp_server.sessions == 1
+
+@pytest.mark.parametrize("smtp_server", [{"b@example.com": ["421 Closing connection"]}],
+                         indirect=True)
+def test_421_reply_is_retried_on_a_fresh_session(smtp_server):
+    notifier = _notifier(smtp_server)
+    notifier.update_batch(_events("a@example.com", "b@example.com", "c@example.com"))
+
+    assert smtp_server.received == 3
+    assert smtp_server.sessions == notifier.pool.connects == 2
+    # One retry, on a new session; the closed one is never tried again
+    assert notifier.get_stats()['retries'] == 1
+    # The closed session was dropped, not handed back to the pool
+    assert len(notifier.pool._idle) == 1
+    notifier.update_batch(_events("d@example.com"))
+    assert smtp_server.sessions == 2
+    notifier.close()
+
+@pytest.mark.parametrize("smtp_server", [{"b@example.com": ["451 Try again later"] * 3}],
+                         indirect=True)
+def test_partial_failure_names_only_the_undelivered_events(smtp_server):
+    notifier = _notifier(smtp_server, pool_size=2, max_retries=2)
+    events = [("APPOINTMENT_SCHEDULED", {"date_time": "2024-01-01 09:00"})]  # no address
+    events += _events("a@example.com", "b@example.com", "c@example.com")
+
+    with pytest.raises(PartialDeliveryError) as raised:
+        notifier.update_batch(events)
+    notifier.close()
+
+    assert raised.value.failed == [2]
+    assert smtp_server.received_by == {"a@example.com": 1, "c@example.com": 1}
+    assert notifier.get_stats()['undelivered'] == 1
+
+@pytest.mark.parametrize("smtp_server", [{"b@example.com": ["550 No such user"]}],
+                         indirect=True)
+def test_permanent_rejection_is_dropped_without_retrying(smtp_server):
+    notifier = _notifier(smtp_server)
+    notifier.update_batch(_events("a@example.com", "b@example.com"))
+    notifier.close()
+
+    stats = notifier.get_stats()
+    assert (stats['sent'], stats['rejected'], stats['retries']) == (1, 1, 0)
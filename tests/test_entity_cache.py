@@ -0,0 +1,96 @@
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from hospital_management_system.config import CACHE_CONFIG
+from hospital_management_system.services import cache
+from hospital_management_system.services.appointment_service import AppointmentService
+from hospital_management_system.services.doctor_service import DoctorService
+
+def _add_department(db, name):
+    db.execute_query("INSERT INTO departments (name) VALUES (%s)", (name,))
+
+def _create_doctor(service, name="Dr One"):
+    return service.create_doctor(name, 1, "0771234567", "one@example.com",
+                                 "Cardiology", ["MBBS"], 2500.0)
+
+def _department_names(service):
+    return [row['name'] for row in service.get_departments()]
+
+def test_department_list_is_reread_after_its_ttl(db, monkeypatch):
+    service = DoctorService()
+    _add_department(db, "Cardiology")
+    assert _department_names(service) == ["Cardiology"]
+
+    # Nothing in the app writes departments, so only the TTL refreshes them
+    _add_department(db, "Neurology")
+    _create_doctor(service)
+    assert _department_names(service) == ["Cardiology"]
+
+    later = time.monotonic() + CACHE_CONFIG['ttl'] + 1
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: later))
+    assert _department_names(service) == ["Cardiology", "Neurology"]
+
+def test_second_booking_reads_the_doctor_from_the_cache(db, admin, monkeypatch):
+    service = AppointmentService()
+    _add_department(db, "Cardiology")
+    doctor = _create_doctor(service.doctor_service)
+    db.execute_query("INSERT INTO patients (patient_id, name) VALUES ('PAT0001', 'Ann')")
+    service._get_cache("doctors").clear()
+
+    doctor_reads = []
+    execute_query = db.execute_query
+    def counting(query, params=None):
+        if "WHERE d.doctor_id = %s" in query:
+            doctor_reads.append(params)
+        return execute_query(query, params)
+    monkeypatch.setattr(db, "execute_query", counting)
+
+    when = datetime(2030, 1, 1, 9, 0)
+    assert service.create_appointment("PAT0001", doctor.doctor_id, when, "Cardiology")
+    assert len(doctor_reads) == 1
+    assert service.create_appointment("PAT0001", doctor.doctor_id,
+                                      when + timedelta(hours=1), "Cardiology")
+    assert len(doctor_reads) == 1
+
+def test_rows_written_in_the_transaction_are_not_cached(db):
+    service = DoctorService()
+    _add_department(db, "Cardiology")
+    doctor = _create_doctor(service)
+
+    with db.transaction():
+        doctor.name = "Dr Two"
+        service.update_doctor(doctor)
+        assert service.get_doctor_by_id(doctor.doctor_id).name == "Dr Two"
+        # The in-transaction read neither used nor replaced the cached row
+        assert service._get_cache("doctors").get(doctor.doctor_id).name == "Dr One"
+        db.set_rollback_only()
+
+    assert service.get_doctor_by_id(doctor.doctor_id).name == "Dr One"
+
+def test_invalidation_waits_for_the_commit(db):
+    service = DoctorService()
+    _add_department(db, "Cardiology")
+    doctor = _create_doctor(service)
+    assert service.get_doctor_by_id(doctor.doctor_id).name == "Dr One"
+
+    with db.transaction():
+        doctor.name = "Dr Two"
+        assert service.update_doctor(doctor)
+        # Another reader before the commit would re-cache the old row
+        assert service._get_cache("doctors").get(doctor.doctor_id).name == "Dr One"
+
+    assert service.get_doctor_by_id(doctor.doctor_id).name == "Dr Two"
+
+def test_rolled_back_write_keeps_the_cached_entry(db):
+    service = DoctorService()
+    _add_department(db, "Cardiology")
+    doctor = _create_doctor(service)
+    service.get_doctor_by_id(doctor.doctor_id)
+
+    with db.transaction():
+        doctor.name = "Dr Two"
+        service.update_doctor(doctor)
+        db.set_rollback_only()
+
+    assert service._get_cache("doctors").get(doctor.doctor_id).name == "Dr One"
+    assert service.get_doctor_by_id(doctor.doctor_id).name == "Dr One"
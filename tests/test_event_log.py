@@ -0,0 +1,41 @@
+import pytest
+from hospital_management_system.patterns.observer import SystemLogger
+from hospital_management_system.utils.event_log import EventLog, tail
+
+@pytest.fixture
+def event_log(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"), flush_interval=60)
+    yield log
+    log.close()
+
+def _events(event_log):
+    event_log.flush()
+    return [(entry['event'], entry['data']) for entry in tail(event_log.path, 10)]
+
+def test_record_keeps_the_data_as_it_was(event_log):
+    data = {'appointment_id': "APT0001", 'status': "SCHEDULED"}
+    event_log.record("APPOINTMENT_SCHEDULED", data)
+    data['status'] = "CANCELLED"
+
+    assert _events(event_log) == [
+        ("APPOINTMENT_SCHEDULED", {'appointment_id': "APT0001", 'status': "SCHEDULED"})]
+
+def test_logger_records_once_the_transaction_commits(db, event_log):
+    logger = SystemLogger(event_log)
+    with db.transaction():
+        logger.update("APPOINTMENT_SCHEDULED", {'appointment_id': "APT0001"})
+        assert _events(event_log) == []
+
+    assert _events(event_log) == [("APPOINTMENT_SCHEDULED", {'appointment_id': "APT0001"})]
+
+def test_logger_drops_events_of_a_rolled_back_transaction(db, event_log):
+    logger = SystemLogger(event_log)
+    with db.transaction():
+        logger.update("APPOINTMENT_SCHEDULED", {'appointment_id': "APT0001"})
+        db.set_rollback_only()
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            logger.update("APPOINTMENT_CANCELLED", {'appointment_id': "APT0002"})
+            raise RuntimeError("boom")
+
+    assert _events(event_log) == []
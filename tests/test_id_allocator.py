@@ -0,0 +1,28 @@
+from hospital_management_system.services.id_allocator import IdAllocator
+
+def test_ids_are_seeded_from_existing_rows(db):
+    db.execute_query("INSERT INTO patients (patient_id, name) VALUES ('PAT0041', 'Ann')")
+    assert IdAllocator().next_ids("PAT", "patients", 2) == ["PAT0042", "PAT0043"]
+
+def test_reserves_with_the_only_pooled_connection_checked_out(db):
+    db.configure_pool(pool_size=1, checkout_timeout=0.5)
+    with db.transaction():
+        patient_id = IdAllocator().next_id("PAT", "patients")
+        db.execute_query("INSERT INTO patients (patient_id, name) VALUES (%s, 'Ann')",
+                         (patient_id,))
+
+    assert patient_id == "PAT0001"
+    assert db.get_pool_stats()['timeouts'] == 0
+
+def test_numbers_are_not_reused_after_the_caller_rolls_back(db):
+    allocator = IdAllocator()
+    with db.transaction():
+        first = allocator.next_id("APT", "appointments")
+        db.set_rollback_only()
+
+    # A second process (fresh allocator) must start after the first's block
+    IdAllocator._instance._pool.close_all()
+    IdAllocator._instance = None
+    second = IdAllocator().next_id("APT", "appointments")
+    assert first == "APT0001"
+    assert int(second[3:]) > allocator.block_size
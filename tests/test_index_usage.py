@@ -0,0 +1,91 @@
+"""EXPLAIN the hot service queries against a real MySQL server.
+
+Builds a scratch database from schema.sql plus every migration, fills it
+with enough rows for the optimizer to prefer an index over a scan, and
+checks each query in migrate.INDEX_CHECKS resolves with the index it was
+written for. Skipped when no MySQL server accepts DB_CONFIG's credentials.
+"""
+import os
+import random
+from datetime import date, datetime, timedelta
+import mysql.connector
+import pytest
+from mysql.connector import Error
+from hospital_management_system.config import DB_CONFIG
+from hospital_management_system.database.migrate import (
+    INDEX_CHECKS, apply_migrations, verify_indexes)
+
+TEST_DATABASE = f"{DB_CONFIG['database']}_index_test"
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'database', 'schema.sql')
+
+def _load_schema(cursor):
+    with open(SCHEMA_PATH, 'r') as file:
+        commands = file.read().split(';')
+    for command in commands:
+        command = command.strip()
+        # The scratch database replaces the one schema.sql creates and selects
+        if command and not command.upper().startswith(('CREATE DATABASE', 'USE ')):
+            cursor.execute(command)
+
+def _seed(cursor):
+    rng = random.Random(7)
+    start = datetime(2023, 1, 1)
+    cursor.executemany(
+        "INSERT INTO patients (patient_id, name) VALUES (%s, %s)",
+        [(f"PAT{n:04}", f"Patient {n}") for n in range(1, 201)])
+    cursor.executemany(
+        "INSERT INTO staff (staff_id, name, role, department_id) VALUES (%s, %s, 'Doctor', 1)",
+        [(f"STF{n:04}", f"Doctor {n}") for n in range(1, 21)])
+    cursor.executemany(
+        "INSERT INTO doctors (doctor_id, staff_id) VALUES (%s, %s)",
+        [(f"DOC{n:04}", f"STF{n:04}") for n in range(1, 21)])
+    cursor.executemany(
+        "INSERT INTO appointments (appointment_id, patient_id, doctor_id, "
+        "appointment_date, status) VALUES (%s, %s, %s, %s, %s)",
+        [(f"APT{n:05}", f"PAT{rng.randint(1, 200):04}", f"DOC{rng.randint(1, 20):04}",
+          start + timedelta(minutes=rng.randrange(730 * 24 * 60)),
+          rng.choice(('scheduled', 'completed', 'cancelled', 'rescheduled')))
+         for n in range(1, 5001)])
+    cursor.executemany(
+        "INSERT INTO medical_records (record_id, patient_id, doctor_id, visit_date) "
+        "VALUES (%s, %s, %s, %s)",
+        [(f"MR{n:05}", f"PAT{rng.randint(1, 200):04}", f"DOC{rng.randint(1, 20):04}",
+          date(2023, 1, 1) + timedelta(days=rng.randrange(730)))
+         for n in range(1, 2001)])
+
+@pytest.fixture(scope="module")
+def connection():
+    settings = {key: value for key, value in DB_CONFIG.items() if key != 'database'}
+    try:
+        connection = mysql.connector.connect(connection_timeout=3, **settings)
+    except Error as e:
+        pytest.skip(f"No MySQL server available: {e}")
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"DROP DATABASE IF EXISTS {TEST_DATABASE}")
+        cursor.execute(f"CREATE DATABASE {TEST_DATABASE}")
+        cursor.execute(f"USE {TEST_DATABASE}")
+        _load_schema(cursor)
+        connection.commit()
+        apply_migrations(connection)
+        _seed(cursor)
+        connection.commit()
+        for table in ('appointments', 'medical_records'):
+            cursor.execute(f"ANALYZE TABLE {table}")
+            cursor.fetchall()
+        yield connection
+    finally:
+        cursor.execute(f"DROP DATABASE IF EXISTS {TEST_DATABASE}")
+        cursor.close()
+        connection.close()
+
+@pytest.fixture(scope="module")
+def plans(connection):
+    return {name: (expected, key, possible)
+            for name, expected, key, possible in verify_indexes(connection)}
+
+@pytest.mark.parametrize("name", [check[0] for check in INDEX_CHECKS])
+def test_hot_query_uses_its_index(plans, name):
+    expected, key, possible = plans[name]
+    assert key == expected, f"{name} uses {key or 'no index'} (candidates {possible})"
@@ -0,0 +1,142 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+import pytest
+from hospital_management_system.benchmarks.smtp_channel import SMTPStandIn
+from hospital_management_system.patterns.notification_coalescer import (
+    DIGEST_EVENT, CoalescingNotifier)
+from hospital_management_system.patterns.observer import Observer
+from hospital_management_system.services.email_channel import (
+    SMTPConnectionPool, SMTPEmailNotifier)
+from hospital_management_system.services.notification_outbox import OutboxDrainer
+
+@pytest.fixture
+def drainer(db):
+    OutboxDrainer._instance = None
+    drainer = OutboxDrainer()
+    yield drainer
+    drainer.stop()
+    OutboxDrainer._instance = None
+
+def _add_row(db, recipient, created_at, event_type="APPOINTMENT_SCHEDULED",
+             appointment_id=None, channel="email"):
+    payload = {"email": recipient, "appointment_id": appointment_id,
+               "date_time": "2024-01-01 09:00", "doctor_name": "Perera"}
+    db.execute_query(
+        "INSERT INTO notification_outbox (event_type, channel, recipient, payload, "
+        "created_at) VALUES (%s, %s, %s, %s, %s)",
+        (event_type, channel, recipient, json.dumps(payload), created_at))
+
+class _Recorder(Observer):
+    def __init__(self):
+        self.batches = []
+
+    def update(self, event_type: str, data: dict):
+        self.update_batch([(event_type, data)])
+
+    def update_batch(self, events):
+        self.batches.append(list(events))
+
+def _rows(db):
+    return {row['id']: row for row in db.execute_query(
+        "SELECT id, status, attempts, last_error FROM notification_outbox")}
+
+def test_only_undelivered_rows_are_retried(db, drainer):
+    server = SMTPStandIn(latency=0, replies={"b@example.com": ["451 Try again later"] * 3})
+    notifier = SMTPEmailNotifier(SMTPConnectionPool("127.0.0.1", server.port),
+                                 max_retries=2, retry_delay=0.001)
+    drainer.channels = {'email': CoalescingNotifier(notifier, 'email')}
+    old = datetime.now() - timedelta(minutes=5)
+    for recipient in ("a@example.com", "b@example.com", "c@example.com"):
+        _add_row(db, recipient, old)
+
+    try:
+        assert drainer.drain_once() == 3
+        rows = _rows(db)
+        assert [rows[i]['status'] for i in (1, 2, 3)] == ['sent', 'pending', 'sent']
+        assert rows[2]['attempts'] == 1 and rows[2]['last_error']
+
+        # Due again: only the failed row goes out a second time
+        db.execute_query("UPDATE notification_outbox SET lease_until = NULL")
+        assert drainer.drain_once() == 1
+        assert _rows(db)[2]['status'] == 'sent'
+        assert server.received_by == {"a@example.com": 1, "b@example.com": 1,
+                                      "c@example.com": 1}
+    finally:
+        notifier.close()
+        server.shutdown()
+        server.server_close()
+
+def test_burst_over_several_polls_goes_out_as_one_digest(db, drainer):
+    recorder = _Recorder()
+    drainer.channels = {'email': CoalescingNotifier(recorder, 'email')}
+    drainer.coalesce_window = 60
+    drainer.batch_size = 1
+    now = datetime.now()
+
+    # The burst trickles in between polls; nothing is due while it is young
+    for age, appointment_id in ((50, "APT0001"), (30, "APT0002"), (10, "APT0003")):
+        _add_row(db, "a@example.com", now - timedelta(seconds=age),
+                 appointment_id=appointment_id)
+        assert drainer.drain_once() == 0
+    _add_row(db, "b@example.com", now - timedelta(seconds=5), appointment_id="APT0004")
+
+    # Once the oldest row is past the window the whole burst is claimed,
+    # rows newer than the window included; batch_size counts recipients
+    drainer.coalesce_window = 40
+    assert drainer.drain_once() == 1
+    assert len(recorder.batches) == 1
+    [(event_type, data)] = recorder.batches[0]
+    assert event_type == DIGEST_EVENT and data['email'] == "a@example.com"
+    assert [event[1]['appointment_id'] for event in data['events']] == [
+        "APT0001", "APT0002", "APT0003"]
+    assert [row['status'] for row in _rows(db).values()] == [
+        'sent', 'sent', 'sent', 'pending']
+
+class _Gate(_Recorder):
+    """Records batches, holding each one until the gate opens"""
+    def __init__(self):
+        super().__init__()
+        self.opened = threading.Event()
+
+    def update_batch(self, events):
+        self.opened.wait(5)
+        super().update_batch(events)
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_backed_up_channel_stops_being_claimed(db, drainer):
+    email, sms = _Gate(), _Recorder()
+    drainer.channels = {'email': email, 'sms': sms}
+    drainer.batch_size = 1
+    drainer.max_pending_batches = 1
+    drainer.channel_workers = 1
+    drainer.poll_interval = 0.01
+    drainer.coalesce_window = 0
+    old = datetime.now() - timedelta(minutes=5)
+    for recipient in ("a@example.com", "b@example.com", "c@example.com"):
+        _add_row(db, recipient, old)
+    _add_row(db, "+94770000000", old, channel="sms")
+
+    drainer.start()
+    try:
+        # One email batch is with the worker and one queued; SMS still flows
+        _wait_for(lambda: sms.batches and _rows(db)[2]['attempts'] == 1)
+        time.sleep(0.1)
+        rows = _rows(db)
+        assert [rows[i]['status'] for i in (1, 2, 3, 4)] == [
+            'pending', 'pending', 'pending', 'sent']
+        assert rows[3]['attempts'] == 0
+
+        email.opened.set()
+        drainer.flush()
+        assert all(row['status'] == 'sent' for row in _rows(db).values())
+        assert len(email.batches) == 3
+    finally:
+        email.opened.set()
+        drainer.stop()
@@ -0,0 +1,52 @@
+import json
+import pytest
+from hospital_management_system.services.organization_service import OrganizationService
+
+@pytest.fixture
+def organization(db, admin):
+    """Two branches whose keys overlap their departments' keys"""
+    db.execute_many("INSERT INTO branches (branch_id, name, location) VALUES (%s, %s, %s)",
+                    [(1, "Colombo", "Colombo 07"), (2, "Kandy", "Kandy")])
+    db.execute_many("INSERT INTO departments (department_id, branch_id, name) VALUES (%s, %s, %s)",
+                    [(1, 2, "Cardiology"), (2, 1, "Radiology")])
+    db.execute_many("INSERT INTO staff (staff_id, name, role, department_id, salary) "
+                    "VALUES (%s, %s, %s, %s, %s)",
+                    [("STF0001", "Silva", "Nurse", 1, 1000),
+                     ("STF0002", "Perera", "Technician", 2, 2000)])
+    OrganizationService._root = None
+    OrganizationService._branches = {}
+    yield OrganizationService()
+    OrganizationService._root = None
+    OrganizationService._branches = {}
+
+def _ids(node):
+    yield node.id
+    for child in getattr(node, 'get_children', list)():
+        yield from _ids(child)
+
+def test_branch_and_department_ids_do_not_collide(organization):
+    root = organization.get_organization()
+    ids = list(_ids(root))
+
+    assert len(ids) == len(set(ids))
+    assert [branch.id for branch in root.get_children()] == ["BR1", "BR2"]
+    assert organization.get_branch(2).get_child(0).id == "DEP1"
+
+def test_export_filters_by_branch_key(organization, tmp_path):
+    path = str(tmp_path / "report.json")
+    organization.export_report(path, branch_ids=[2])
+
+    with open(path) as file:
+        report = json.load(file)
+    assert [branch['id'] for branch in report['children']] == ["BR2"]
+    assert report['total_cost'] == 1000
+
+def test_refresh_branch_keeps_its_place(organization, db):
+    root = organization.get_organization()
+    db.execute_query("UPDATE staff SET salary = 1500 WHERE staff_id = 'STF0002'")
+
+    refreshed = organization.refresh_branch(1)
+
+    assert root.get_children() == [refreshed, organization.get_branch(2)]
+    assert [branch.id for branch in root.get_children()] == ["BR1", "BR2"]
+    assert root.get_cost() == 2500
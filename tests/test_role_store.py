@@ -0,0 +1,46 @@
+import pytest
+from mysql.connector import Error
+from hospital_management_system.auth.rbac import (
+    Permission, ROLE_PERMISSIONS, User, UserRole, install_role_permissions)
+from hospital_management_system.auth.role_store import RoleDefinitionLoader
+
+@pytest.fixture
+def loader(db):
+    RoleDefinitionLoader._instance = None
+    yield RoleDefinitionLoader()
+    RoleDefinitionLoader._instance = None
+    install_role_permissions({})
+
+@pytest.fixture
+def role_table(db):
+    db.execute_query("CREATE TABLE rbac_role_permissions (role VARCHAR(20) NOT NULL, "
+                     "permission VARCHAR(50) NOT NULL, PRIMARY KEY (role, permission))")
+    db.execute_many("INSERT INTO rbac_role_permissions (role, permission) VALUES (%s, %s)",
+                    [("Patient", "view_appointments"), ("Doctor", "view_patients")])
+
+def permissions(role):
+    user = User.for_login("someone", role)
+    return {permission for permission in Permission if user.has_permission(permission)}
+
+def test_table_replaces_the_defaults(loader, role_table):
+    assert loader.reload()
+
+    assert permissions(UserRole.PATIENT) == {Permission.VIEW_APPOINTMENTS}
+    assert permissions(UserRole.DOCTOR) == {Permission.VIEW_PATIENTS}
+    assert permissions(UserRole.ADMIN) == set(Permission)
+    assert not loader.reload()
+
+def test_role_revoked_to_nothing_stays_revoked(loader, role_table, db):
+    loader.reload()
+    db.execute_query("DELETE FROM rbac_role_permissions WHERE role = 'Doctor'")
+
+    assert loader.reload()
+    assert permissions(UserRole.DOCTOR) == set()
+    assert permissions(UserRole.PATIENT) == {Permission.VIEW_APPOINTMENTS}
+
+def test_missing_table_keeps_the_current_masks(loader):
+    with pytest.raises(Error):
+        loader.reload()
+
+    assert permissions(UserRole.DOCTOR) == ROLE_PERMISSIONS[UserRole.DOCTOR]
+    assert loader.reloads == 0
@@ -0,0 +1,72 @@
+from datetime import date, datetime
+import pytest
+from hospital_management_system.auth.rbac import User, UserRole, as_user
+from hospital_management_system.auth.row_scope import row_scope
+from hospital_management_system.services.appointment_service import AppointmentService
+from hospital_management_system.services.medical_record_service import MedicalRecordService
+from hospital_management_system.services.patient_service import PatientService
+
+@pytest.fixture
+def clinic(db):
+    """DOC0001 sees PAT0001 by appointment and PAT0003 by record; DOC0002 sees PAT0002"""
+    db.execute_many("INSERT INTO patients (patient_id, name) VALUES (%s, %s)",
+                    [("PAT0001", "Ann"), ("PAT0002", "Ben"), ("PAT0003", "Cat")])
+    db.execute_many("INSERT INTO staff (staff_id, name, role) VALUES (%s, %s, 'Doctor')",
+                    [("STF0001", "Perera"), ("STF0002", "Silva")])
+    db.execute_many("INSERT INTO doctors (doctor_id, staff_id, consultation_fee) "
+                    "VALUES (%s, %s, 2500)",
+                    [("DOC0001", "STF0001"), ("DOC0002", "STF0002")])
+    db.execute_many("INSERT INTO appointments (appointment_id, patient_id, doctor_id, "
+                    "appointment_date, status) VALUES (%s, %s, %s, %s, 'scheduled')",
+                    [("APT0001", "PAT0001", "DOC0001", datetime(2030, 1, 1, 9)),
+                     ("APT0002", "PAT0002", "DOC0002", datetime(2030, 1, 1, 10))])
+    db.execute_many("INSERT INTO medical_records (record_id, patient_id, doctor_id, "
+                    "visit_date, diagnosis, prescription) VALUES (%s, %s, %s, %s, 'Flu', '')",
+                    [("MR0001", "PAT0003", "DOC0001", date(2029, 6, 1)),
+                     ("MR0002", "PAT0002", "DOC0002", date(2029, 6, 2))])
+
+def _appointment_ids():
+    service = AppointmentService()
+    return sorted(a.appointment_id for a in service.get_appointments()), \
+        sorted(a.appointment_id for a in service.get_recent_appointments(10))
+
+def _patient_ids():
+    return sorted(p.patient_id for p in PatientService().get_all_patients())
+
+def _record_ids():
+    return sorted(r.record_id for r in MedicalRecordService().search_records())
+
+def test_patient_sees_only_their_own_rows(clinic):
+    with as_user(User.for_login("ann", UserRole.PATIENT, "PAT0001")):
+        assert _appointment_ids() == (["APT0001"], ["APT0001"])
+        assert AppointmentService().get_appointment_by_id("APT0002") is None
+        assert _patient_ids() == ["PAT0001"]
+        assert PatientService().get_patient_by_id("PAT0002") is None
+        assert _record_ids() == []
+
+def test_doctor_sees_only_their_own_rows(clinic):
+    with as_user(User.for_login("perera", UserRole.DOCTOR, "DOC0001")):
+        assert _appointment_ids() == (["APT0001"], ["APT0001"])
+        assert _record_ids() == ["MR0001"]
+        assert MedicalRecordService().get_record_by_id("MR0002") is None
+        # Patients reached through an appointment or a record, nobody else
+        assert _patient_ids() == ["PAT0001", "PAT0003"]
+        assert PatientService().get_patient_by_id("PAT0002") is None
+
+def test_admin_sees_everything(clinic, admin):
+    assert _appointment_ids() == (["APT0001", "APT0002"], ["APT0001", "APT0002"])
+    assert _record_ids() == ["MR0001", "MR0002"]
+    assert _patient_ids() == ["PAT0001", "PAT0002", "PAT0003"]
+
+@pytest.mark.parametrize("role", [UserRole.PATIENT, UserRole.DOCTOR])
+def test_scoped_user_without_reference_id_sees_nothing(clinic, role):
+    user = User.for_login("unlinked", role)
+    assert row_scope("appointments", user=user) == ("1=0", [])
+    with as_user(user):
+        assert _appointment_ids() == ([], [])
+        assert _patient_ids() == []
+        assert _record_ids() == []
+
+def test_scoped_reads_need_a_bound_user(clinic):
+    with pytest.raises(PermissionError):
+        PatientService().get_patient_by_id("PAT0001")
@@ -0,0 +1,56 @@
+from hospital_management_system.services.doctor_service import DoctorService
+from hospital_management_system.services.patient_service import PatientService
+from hospital_management_system.services.search import (
+    boolean_query, escape_like, match_condition, relevance_expression)
+
+def test_boolean_query_requires_every_indexed_word_as_a_prefix():
+    assert boolean_query("jo smith") == "+smith*"
+    assert boolean_query("Mary Anne-Smith") == "+Mary* +Anne* +Smith*"
+    assert boolean_query('"cardio" +(heart)') == "+cardio* +heart*"
+    assert boolean_query("jo al") is None
+    assert boolean_query("") is None
+
+def test_match_condition_uses_the_index():
+    condition, params = match_condition(("name", "email"), "mary smith")
+    assert condition == "(MATCH(name, email) AGAINST (%s IN BOOLEAN MODE))"
+    assert params == ["+mary* +smith*"]
+
+def test_match_condition_keeps_short_words_as_a_like_filter():
+    condition, params = match_condition(("name", "email"), "Jo Smith")
+    assert condition == ("(MATCH(name, email) AGAINST (%s IN BOOLEAN MODE)"
+                         " AND (name LIKE %s OR email LIKE %s))")
+    assert params == ["+Smith*", "%Jo%", "%Jo%"]
+
+def test_match_condition_falls_back_to_a_prefix_like():
+    condition, params = match_condition(("name", "email"), " Jo ")
+    assert condition == "(name LIKE %s OR email LIKE %s)"
+    assert params == ["Jo%", "Jo%"]
+
+def test_like_wildcards_in_the_term_are_escaped():
+    assert escape_like("50%_off\\") == "50\\%\\_off\\\\"
+    assert match_condition(("name",), "%")[1] == ["\\%%"]
+    assert match_condition(("name",), "smith a_")[1] == ["+smith*", "%a\\_%"]
+
+def test_relevance_is_zero_without_indexed_words():
+    assert relevance_expression(("name",), "jo") == ("0", [])
+    assert relevance_expression(("name",), "smith") == (
+        "MATCH(name) AGAINST (%s IN BOOLEAN MODE)", ["+smith*"])
+
+def test_search_patients_with_short_term(db, admin):
+    db.execute_many("INSERT INTO patients (patient_id, name, email) VALUES (%s, %s, %s)",
+                    [("PAT0001", "Jo Perera", "jo@example.com"),
+                     ("PAT0002", "Ann Silva", "ann@example.com")])
+
+    assert [p.patient_id for p in PatientService().search_patients("Jo")] == ["PAT0001"]
+
+def test_search_doctors_merges_name_and_specialization_hits(db):
+    db.execute_many("INSERT INTO staff (staff_id, name, role) VALUES (%s, %s, 'Doctor')",
+                    [("STF0001", "Carter"), ("STF0002", "Silva"), ("STF0003", "Perera")])
+    db.execute_many("INSERT INTO doctors (doctor_id, staff_id, specialization, "
+                    "consultation_fee) VALUES (%s, %s, %s, 2500)",
+                    [("DOC0001", "STF0001", "Cardiology"), ("DOC0002", "STF0002", "Cardiology"),
+                     ("DOC0003", "STF0003", "Oncology")])
+
+    # DOC0001 matches on both name and specialization but is listed once
+    doctors = DoctorService().search_doctors("Ca")
+    assert [doctor.doctor_id for doctor in doctors] == ["DOC0001", "DOC0002"]
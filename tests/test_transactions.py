@@ -0,0 +1,63 @@
+import pytest
+from mysql.connector import Error
+from hospital_management_system.services.appointment_service import AppointmentService
+
+def _patient_ids(db):
+    return [row['patient_id'] for row in db.execute_query("SELECT patient_id FROM patients")]
+
+def _add_patient(db, patient_id):
+    db.execute_query("INSERT INTO patients (patient_id, name) VALUES (%s, %s)",
+                     (patient_id, "Ann"))
+
+def test_commit_runs_on_commit_callbacks(db):
+    committed = []
+    with db.transaction():
+        _add_patient(db, "PAT0001")
+        db.on_commit(lambda: committed.append(True))
+        assert committed == []
+
+    assert _patient_ids(db) == ["PAT0001"]
+    assert committed == [True]
+
+def test_exception_rolls_back(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            _add_patient(db, "PAT0001")
+            raise RuntimeError("boom")
+
+    assert _patient_ids(db) == []
+
+def test_rollback_only_in_outermost_block_is_silent(db):
+    committed = []
+    with db.transaction():
+        _add_patient(db, "PAT0001")
+        db.on_commit(lambda: committed.append(True))
+        db.set_rollback_only()
+
+    assert _patient_ids(db) == []
+    assert committed == []
+
+def test_rollback_only_in_nested_block_fails_the_outer_one(db):
+    with pytest.raises(Error):
+        with db.transaction():
+            _add_patient(db, "PAT0001")
+            with db.transaction():
+                _add_patient(db, "PAT0002")
+                db.set_rollback_only()
+
+    assert _patient_ids(db) == []
+
+def test_set_rollback_only_outside_transaction_raises(db):
+    with pytest.raises(Error):
+        db.set_rollback_only()
+
+def test_early_return_from_service_does_not_commit_enclosing_work(db, admin):
+    service = AppointmentService()
+    assert service.cancel_appointment("APT9999") is False
+
+    with pytest.raises(Error):
+        with db.transaction():
+            _add_patient(db, "PAT0001")
+            service.reschedule_appointment("APT9999", None)
+
+    assert _patient_ids(db) == []
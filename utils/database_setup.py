@@ -1,5 +1,6 @@
 import mysql.connector
 from mysql.connector import Error
+from ..database.migrate import apply_migrations
 
 def create_database():
     try:
@@ -97,6 +98,19 @@ def create_database():
                 )
                 """,
                 """
+                CREATE TABLE IF NOT EXISTS id_sequences (
+                    prefix VARCHAR(10) PRIMARY KEY,
+                    next_value BIGINT NOT NULL
+                )
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS rbac_auth (
+                    username VARCHAR(50) PRIMARY KEY,
+                    password CHAR(12) NOT NULL,
+                    role VARCHAR(20) NOT NULL CHECK (role IN ('Admin', 'Doctor', 'Patient'))
+                )
+                """,
+                """
                 CREATE TABLE IF NOT EXISTS resources (
                     resource_id VARCHAR(10) PRIMARY KEY,
                     branch_id INT,
@@ -126,6 +140,9 @@ def create_database():
             except Error as e:
                 if e.errno != 1062:  # Ignore duplicate entry errors
                     print(f"Error inserting default branches: {e}")
+
+            # Later tables, columns and indexes come from the migrations only
+            apply_migrations(connection)
             
             print("Database and tables created successfully!")
             